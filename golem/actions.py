@@ -1,5 +1,6 @@
 """Golem actions"""
 import code
+import functools
 import importlib
 import logging
 import os
@@ -16,6 +17,7 @@ import requests
 from golem import browser, execution, helpers
 from golem.core import utils
 from golem.test_runner import test_logger
+from golem.report import screenshot_pipeline, screenshot_store
 from golem.report import utils as report_utils
 
 
@@ -78,6 +80,7 @@ def _capture_screenshot(image_name):
     Screenshot format, size and quality can be modified using the
       'screenshots' setting key.
     Pillow must be installed in order to modify the screenshot before saving.
+    The screenshot is saved in the background by the screenshot pipeline.
     'screenshots' setting can have the following attributes:
       - format: must be 'PNG' or 'JPEG'
       - quality: must be an int in 1..95 range.
@@ -85,27 +88,44 @@ def _capture_screenshot(image_name):
       - width and height: must be int greater than 0
       - resize: must be an int greater than 0.
           Str in the format '55' or '55%' is also allowed.
+
+    When the 'screenshot_dedup' setting is 'exact' or 'perceptual' the
+    screenshot is added to the screenshot store of the execution and
+    the reference to the stored screenshot is returned.
     """
     if not execution.test_reportdir:
         execution.logger.debug('cannot take screenshot, report directory does not exist')
         return None
 
-    if not execution.settings['screenshots']:
-        screenshot_filename = f'{image_name}.png'
-        screenshot_path = os.path.join(execution.test_reportdir, screenshot_filename)
-        get_browser().get_screenshot_as_file(screenshot_path)
-    else:
-        screenshot_settings = execution.settings['screenshots']
+    screenshot_settings = execution.settings['screenshots']
+    options = None
+    if screenshot_settings:
         format = screenshot_settings.get('format', 'PNG').upper()
         if format == 'JPG':
             format = 'JPEG'
-        quality = screenshot_settings.get('quality', None)
-        width = screenshot_settings.get('width', None)
-        height = screenshot_settings.get('height', None)
-        resize = screenshot_settings.get('resize', None)
+        options = {
+            'format': format,
+            'quality': screenshot_settings.get('quality', None),
+            'width': screenshot_settings.get('width', None),
+            'height': screenshot_settings.get('height', None),
+            'resize': screenshot_settings.get('resize', None)
+        }
+
+    dedup = execution.settings['screenshot_dedup']
+    if dedup in screenshot_store.DEDUP_OPTIONS and execution.execution_reportdir:
+        threshold = execution.settings['screenshot_dedup_threshold']
+        return report_utils.store_screenshot(execution.execution_reportdir, options,
+                                             dedup, threshold)
+    elif not options:
+        screenshot_filename = f'{image_name}.png'
+        screenshot_path = os.path.join(execution.test_reportdir, screenshot_filename)
+        png = get_browser().get_screenshot_as_png()
+        on_error = functools.partial(screenshot_pipeline.replace_in_steps, screenshot_filename)
+        screenshot_pipeline.submit(screenshot_pipeline.write_file, png, screenshot_path,
+                                   on_error=on_error)
+    else:
         screenshot_filename = report_utils.save_screenshot(execution.test_reportdir,
-                                                           image_name, format, quality,
-                                                           width, height, resize)
+                                                           image_name, **options)
     return screenshot_filename
 
 
@@ -1,6 +1,10 @@
 """Functions to interact with a webdriver browser object."""
+import json
+import threading
+import time
 import traceback
 from contextlib import contextmanager
+from multiprocessing import util
 
 from selenium import webdriver
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
@@ -20,6 +24,22 @@ class InvalidBrowserIdError(Exception):
     pass
 
 
+# Drivers kept open between tests when the `reuse_browser`
+# setting is true, one per browser definition
+_parked_drivers = {}
+
+# Started when the `browser_pool_size` setting is defined
+_browser_pool = None
+
+# True when the process runs a single test set and exits
+# (e.g.: multiprocessing.Pool with maxtasksperchild=1), there
+# are no next tests to start browsers for
+single_test_process = False
+
+# Closes the idle browsers when the process exits
+_exit_finalizer = None
+
+
 def element(*args, **kwargs):
     """Shortcut to golem.browser.get_browser().find()"""
     webelement = get_browser().find(*args, **kwargs)
@@ -67,39 +87,6 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
     :Returns:
       the opened browser
     """
-    @contextmanager
-    def validate_exec_path(browser_name, exec_path_setting, settings):
-        executable_path = settings[exec_path_setting]
-        if executable_path:
-            matched_executable_path = utils.match_latest_executable_path(executable_path,
-                                                                         execution.testdir)
-            if matched_executable_path:
-                try:
-                    yield matched_executable_path
-                except:
-                    msg = f"Could not start {browser_name} driver using the path '{executable_path}'\n" \
-                          f"verify that the {exec_path_setting} setting points to a valid webdriver executable."
-                    execution.logger.error(msg)
-                    execution.logger.info(traceback.format_exc())
-                    raise Exception(msg)
-            else:
-                msg = f'No executable file found using path {executable_path}'
-                execution.logger.error(msg)
-                raise Exception(msg)
-        else:
-            msg = f'{exec_path_setting} setting is not defined'
-            execution.logger.error(msg)
-            raise Exception(msg)
-
-    @contextmanager
-    def validate_remote_url(remote_url):
-        if remote_url:
-            yield remote_url
-        else:
-            msg = 'remote_url setting is required'
-            execution.logger.error(msg)
-            raise Exception(msg)
-
     project = Project(execution.project_name)
     browser_definition = execution.browser_definition
     settings = execution.settings
@@ -109,7 +96,6 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
         capabilities = browser_definition['capabilities']
     if remote_url is None:
         remote_url = settings['remote_url']
-    is_custom = False
 
     if not browser_id:
         if len(execution.browsers) == 0:
@@ -119,14 +105,82 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
     if browser_id in execution.browsers:
         raise InvalidBrowserIdError(f"browser id '{browser_id}' is already in use")
 
+    reuse_key = _reuse_key(browser_name, capabilities, remote_url)
+    driver = None
+    if settings.get('reuse_browser') and reuse_key in _parked_drivers:
+        driver = _parked_drivers.pop(reuse_key)
+        if _is_healthy(driver):
+            execution.logger.debug('Reusing browser')
+        else:
+            execution.logger.debug('the reused browser is not responding, starting a new one')
+            _quit_driver(driver)
+            driver = None
+    elif browser_pool_size(settings):
+        pool = get_browser_pool(browser_pool_size(settings))
+        driver = pool.acquire(reuse_key)
+        # start the browsers for the next tests
+        # execution values are captured now, the browsers are started
+        # in background threads that can outlive this test
+        pool.fill(reuse_key, (browser_name, capabilities, remote_url, settings, project,
+                              execution.testdir, execution.logger))
+    if driver is None:
+        driver = _start_driver(browser_name, capabilities, remote_url, settings, project,
+                               execution.testdir, execution.logger)
+
+    execution.browsers[browser_id] = driver
+    # Set the new browser as the active browser
+    execution.browser = driver
+    return execution.browser
+
+
+@contextmanager
+def _validate_exec_path(browser_name, exec_path_setting, settings, testdir, logger):
+    executable_path = settings[exec_path_setting]
+    if executable_path:
+        matched_executable_path = utils.match_latest_executable_path(executable_path,
+                                                                     testdir)
+        if matched_executable_path:
+            try:
+                yield matched_executable_path
+            except:
+                msg = f"Could not start {browser_name} driver using the path '{executable_path}'\n" \
+                      f"verify that the {exec_path_setting} setting points to a valid webdriver executable."
+                logger.error(msg)
+                logger.info(traceback.format_exc())
+                raise Exception(msg)
+        else:
+            msg = f'No executable file found using path {executable_path}'
+            logger.error(msg)
+            raise Exception(msg)
+    else:
+        msg = f'{exec_path_setting} setting is not defined'
+        logger.error(msg)
+        raise Exception(msg)
+
+
+@contextmanager
+def _validate_remote_url(remote_url, logger):
+    if remote_url:
+        yield remote_url
+    else:
+        msg = 'remote_url setting is required'
+        logger.error(msg)
+        raise Exception(msg)
+
+
+def _start_driver(browser_name, capabilities, remote_url, settings, project, testdir, logger):
+    """Start a new driver"""
+    is_custom = False
+
     # remote
     if capabilities:
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             driver = GolemRemoteDriver(command_executor=remote_url,
                                        desired_capabilities=capabilities)
     # Chrome
     elif browser_name == 'chrome':
-        with validate_exec_path('chrome', 'chromedriver_path', settings) as ex_path:
+        with _validate_exec_path('chrome', 'chromedriver_path', settings, testdir,
+                                 logger) as ex_path:
             chrome_options = webdriver.ChromeOptions()
             if settings['start_maximized']:
                 chrome_options.add_argument('start-maximized')
@@ -134,7 +188,8 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
                                        chrome_options=chrome_options)
     # Chrome headless
     elif browser_name == 'chrome-headless':
-        with validate_exec_path('chrome', 'chromedriver_path', settings) as ex_path:
+        with _validate_exec_path('chrome', 'chromedriver_path', settings, testdir,
+                                 logger) as ex_path:
             chrome_options = webdriver.ChromeOptions()
             chrome_options.add_argument('headless')
             chrome_options.add_argument('--window-size=1600,1600')
@@ -142,12 +197,12 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
                                        chrome_options=chrome_options)
     # Chrome remote
     elif browser_name == 'chrome-remote':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             driver = GolemRemoteDriver(command_executor=remote_url,
                                        desired_capabilities=DesiredCapabilities.CHROME)
     # Chrome remote headless
     elif browser_name == 'chrome-remote-headless':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             chrome_options = webdriver.ChromeOptions()
             chrome_options.add_argument('headless')
             desired_capabilities = chrome_options.to_capabilities()
@@ -155,31 +210,33 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
                                        desired_capabilities=desired_capabilities)
     # Edge
     elif browser_name == 'edge':
-        with validate_exec_path('edge', 'edgedriver_path', settings) as ex_path:
+        with _validate_exec_path('edge', 'edgedriver_path', settings, testdir, logger) as ex_path:
             driver = GolemEdgeDriver(executable_path=ex_path)
     # Edge remote
     elif browser_name == 'edge-remote':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             driver = GolemRemoteDriver(command_executor=remote_url,
                                        desired_capabilities=DesiredCapabilities.EDGE)
     # Firefox
     elif browser_name == 'firefox':
-        with validate_exec_path('firefox', 'geckodriver_path', settings) as ex_path:
+        with _validate_exec_path('firefox', 'geckodriver_path', settings, testdir,
+                                 logger) as ex_path:
             driver = GolemGeckoDriver(executable_path=ex_path)
     # Firefox headless
     elif browser_name == 'firefox-headless':
-        with validate_exec_path('firefox', 'geckodriver_path', settings) as ex_path:
+        with _validate_exec_path('firefox', 'geckodriver_path', settings, testdir,
+                                 logger) as ex_path:
             firefox_options = webdriver.FirefoxOptions()
             firefox_options.headless = True
             driver = GolemGeckoDriver(executable_path=ex_path, firefox_options=firefox_options)
     # Firefox remote
     elif browser_name == 'firefox-remote':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             driver = GolemRemoteDriver(command_executor=remote_url,
                                        desired_capabilities=DesiredCapabilities.FIREFOX)
     # Firefox remote headless
     elif browser_name == 'firefox-remote-headless':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             firefox_options = webdriver.FirefoxOptions()
             firefox_options.headless = True
             desired_capabilities = firefox_options.to_capabilities()
@@ -187,23 +244,24 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
                                        desired_capabilities=desired_capabilities)
     # IE
     elif browser_name == 'ie':
-        with validate_exec_path('internet explorer', 'iedriver_path', settings) as ex_path:
+        with _validate_exec_path('internet explorer', 'iedriver_path', settings, testdir,
+                                 logger) as ex_path:
             driver = GolemIeDriver(executable_path=ex_path)
     # IE remote
     elif browser_name == 'ie-remote':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             driver = GolemRemoteDriver(command_executor=remote_url,
                                        desired_capabilities=DesiredCapabilities.INTERNETEXPLORER)
     # Opera
     elif browser_name == 'opera':
-        with validate_exec_path('opera', 'operadriver_path', settings) as ex_path:
+        with _validate_exec_path('opera', 'operadriver_path', settings, testdir, logger) as ex_path:
             opera_options = webdriver.ChromeOptions()
             if 'opera_binary_path' in settings:
                 opera_options.binary_location = settings['opera_binary_path']
             driver = GolemOperaDriver(executable_path=ex_path, options=opera_options)
     # Opera remote
     elif browser_name == 'opera-remote':
-        with validate_remote_url(remote_url) as remote_url:
+        with _validate_remote_url(remote_url, logger) as remote_url:
             driver = GolemRemoteDriver(command_executor=remote_url,
                                        desired_capabilities=DesiredCapabilities.OPERA)
     elif browser_name in project.custom_browsers():
@@ -212,7 +270,7 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
         custom_browser_func = getattr(module, browser_name)
         driver = custom_browser_func(settings)
     else:
-        raise Exception(f"Error: {browser_definition['name']} is not a valid driver")
+        raise Exception(f'Error: {browser_name} is not a valid driver')
 
     if settings['start_maximized'] and not is_custom:
         # currently there is no way to maximize chrome window on OSX (chromedriver 2.43), adding workaround
@@ -220,13 +278,11 @@ def open_browser(browser_name=None, capabilities=None, remote_url=None, browser_
         # https://bugs.chromium.org/p/chromedriver/issues/detail?id=2522
         # TODO: assess if this work-around is still needed when chromedriver 2.44 is released
         is_mac = 'mac' in driver.capabilities.get('platform', '').lower()
-        if not ('chrome' in browser_definition['name'] and is_mac):
+        if not ('chrome' in browser_name and is_mac):
             driver.maximize_window()
 
-    execution.browsers[browser_id] = driver
-    # Set the new browser as the active browser
-    execution.browser = driver
-    return execution.browser
+    driver.golem_reuse_key = _reuse_key(browser_name, capabilities, remote_url)
+    return driver
 
 
 def get_browser() -> GolemRemoteDriver:
@@ -252,3 +308,256 @@ def activate_browser(browser_id):
     else:
         execution.browser = execution.browsers[browser_id]
     return execution.browser
+
+
+def _reuse_key(browser_name, capabilities, remote_url):
+    """Drivers can be reused by tests that open a browser with the same definition"""
+    return browser_name, json.dumps(capabilities, sort_keys=True), remote_url
+
+
+def reset_browser(driver):
+    """Reset a browser to a clean state so it can be used by another test.
+
+    Extra windows are closed and the storage and cookies are cleared.
+    localStorage and sessionStorage can only be cleared for the origin
+    of the current page. Cookies are cleared for every domain in
+    Chrome, in other browsers only for the domain of the current page.
+    Finally the browser navigates to about:blank.
+    """
+    try:
+        driver.switch_to.alert.dismiss()
+    except Exception:
+        pass
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    try:
+        driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+    except Exception:
+        # storage is not accessible in pages like about:blank
+        pass
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except Exception:
+        driver.delete_all_cookies()
+    driver.get('about:blank')
+
+
+def park_browsers():
+    """Keep the browsers opened by the current test for the next test.
+
+    One browser per browser definition is kept, the rest are closed.
+    A browser that cannot be reset is closed.
+    """
+    for driver in execution.browsers.values():
+        reuse_key = getattr(driver, 'golem_reuse_key', None)
+        if reuse_key is not None and reuse_key not in _parked_drivers:
+            try:
+                reset_browser(driver)
+                _parked_drivers[reuse_key] = driver
+                continue
+            except Exception:
+                execution.logger.debug('could not reset the browser, closing it',
+                                       exc_info=True)
+        try:
+            driver.quit()
+        except Exception:
+            execution.logger.error('there was an error closing the driver', exc_info=True)
+    if _parked_drivers:
+        _register_exit_finalizer()
+
+
+def quit_parked_browsers():
+    """Quit every browser kept open for reuse"""
+    while _parked_drivers:
+        _, driver = _parked_drivers.popitem()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _is_healthy(driver):
+    """Is the driver session still usable"""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+class BrowserPool:
+    """Start browsers in background threads ahead of demand.
+
+    Up to `size` browsers per browser definition are kept started or
+    starting. A browser is handed out only if it passes a health check.
+
+    `metrics` holds the amount of browsers acquired and how long
+    the tests waited for them:
+      ready:          a started browser was available
+      waited:         the test waited for a starting browser
+      missed:         no browser was available, the test started one
+      total_wait_time, max_wait_time: in seconds
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._ready = {}
+        self._starting = {}
+        self._threads = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self.metrics = {
+            'ready': 0,
+            'waited': 0,
+            'missed': 0,
+            'failed_starts': 0,
+            'failed_health_checks': 0,
+            'total_wait_time': 0,
+            'max_wait_time': 0
+        }
+
+    def _start(self, key, start_args):
+        try:
+            driver = _start_driver(*start_args)
+        except Exception:
+            driver = None
+        with self._condition:
+            self._starting[key] -= 1
+            if driver is None:
+                self.metrics['failed_starts'] += 1
+            elif not self._closed:
+                self._ready.setdefault(key, []).append(driver)
+            self._condition.notify_all()
+        if driver is not None and self._closed:
+            _quit_driver(driver)
+
+    def fill(self, key, start_args):
+        """Start browsers in the background until there are `size`
+        browsers started or starting for this browser definition.
+        `start_args` are the arguments of _start_driver.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._threads = [t for t in self._threads if t.is_alive()]
+            available = len(self._ready.get(key, [])) + self._starting.get(key, 0)
+            for _ in range(self.size - available):
+                self._starting[key] = self._starting.get(key, 0) + 1
+                thread = threading.Thread(target=self._start, args=(key, start_args),
+                                          daemon=True)
+                self._threads.append(thread)
+                thread.start()
+
+    def acquire(self, key):
+        """Get a started browser for this browser definition.
+        Waits when there are browsers starting.
+        Returns None when there are no browsers started or starting.
+        """
+        start_time = time.time()
+        driver = None
+        waited = False
+        while driver is None:
+            candidate = None
+            with self._condition:
+                ready = self._ready.get(key)
+                if ready:
+                    candidate = ready.pop(0)
+                elif self._closed or not self._starting.get(key):
+                    break
+                else:
+                    waited = True
+                    self._condition.wait()
+                    continue
+            # the health check and quit talk to the browser,
+            # the other threads are not blocked meanwhile
+            if _is_healthy(candidate):
+                driver = candidate
+            else:
+                _quit_driver(candidate)
+                with self._condition:
+                    self.metrics['failed_health_checks'] += 1
+        wait_time = time.time() - start_time
+        with self._condition:
+            if driver is None:
+                self.metrics['missed'] += 1
+            elif waited:
+                self.metrics['waited'] += 1
+            else:
+                self.metrics['ready'] += 1
+            self.metrics['total_wait_time'] += wait_time
+            self.metrics['max_wait_time'] = max(self.metrics['max_wait_time'], wait_time)
+        if execution.logger and driver is not None:
+            execution.logger.debug(f'Browser from pool, waited {round(wait_time, 2)} seconds')
+        return driver
+
+    def close(self, timeout=30):
+        """Quit the started browsers and wait for the starting ones"""
+        with self._condition:
+            self._closed = True
+            drivers = [d for ready in self._ready.values() for d in ready]
+            self._ready = {}
+            threads = list(self._threads)
+            self._condition.notify_all()
+        for driver in drivers:
+            _quit_driver(driver)
+        for thread in threads:
+            thread.join(timeout)
+
+
+def get_browser_pool(size):
+    """Get the browser pool of this process, it is created if needed"""
+    global _browser_pool
+    if _browser_pool is None or _browser_pool._closed:
+        _browser_pool = BrowserPool(size)
+        _register_exit_finalizer()
+    return _browser_pool
+
+
+def browser_pool_size(settings):
+    """The size of the browser pool, 0 when it is disabled.
+    The pool is not used by a process that runs a single test set.
+    """
+    if single_test_process:
+        return 0
+    return settings.get('browser_pool_size') or 0
+
+
+def format_pool_metrics(metrics):
+    acquired = metrics['ready'] + metrics['waited'] + metrics['missed']
+    average_wait = metrics['total_wait_time'] / acquired if acquired else 0
+    return (f'Browser pool: {acquired} browsers requested, {metrics["ready"]} ready, '
+            f'{metrics["waited"]} waited, {metrics["missed"]} missed; '
+            f'wait time avg {round(average_wait, 2)}s, '
+            f'max {round(metrics["max_wait_time"], 2)}s; '
+            f'{metrics["failed_starts"]} failed starts, '
+            f'{metrics["failed_health_checks"]} failed health checks')
+
+
+def close_idle_browsers():
+    """Quit the browsers kept open for reuse and close the browser pool.
+    The metrics of the browser pool are printed.
+    """
+    global _browser_pool
+    quit_parked_browsers()
+    if _browser_pool is not None:
+        _browser_pool.close()
+        metrics = _browser_pool.metrics
+        if metrics['ready'] + metrics['waited'] + metrics['missed']:
+            print(format_pool_metrics(metrics))
+        _browser_pool = None
+
+
+def _register_exit_finalizer():
+    global _exit_finalizer
+    if _exit_finalizer is None:
+        _exit_finalizer = util.Finalize(None, close_idle_browsers, exitpriority=10)
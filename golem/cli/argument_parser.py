@@ -1,5 +1,7 @@
 import argparse
 
+from golem.execution_runner.scheduler import SCHEDULE_STRATEGIES
+
 
 def get_parser():
     parser = argparse.ArgumentParser(prog='golem', add_help=False)
@@ -9,7 +11,7 @@ def get_parser():
     subparsers = parser.add_subparsers(dest='command')
 
     # run
-    report_choices = ['junit', 'html', 'html-no-images', 'json']
+    report_choices = ['junit', 'html', 'html-no-images', 'html-dir', 'json']
     parser_run = subparsers.add_parser('run', add_help=False)
     parser_run.add_argument('project', nargs='?', default='')
     parser_run.add_argument('test_query', nargs='?', default='')
@@ -25,6 +27,12 @@ def get_parser():
     parser_run.add_argument('--report-name', nargs='?', type=str)
     parser_run.add_argument('--timestamp', nargs='?', type=str)
     parser_run.add_argument('-l', '--cli-log-level')
+    parser_run.add_argument('--schedule', choices=SCHEDULE_STRATEGIES, type=str)
+    parser_run.add_argument('--coordinator', type=str)
+    parser_run.add_argument('--shard-index', type=int)
+    parser_run.add_argument('--shard-count', type=int)
+    parser_run.add_argument('--max-failures', type=int)
+    parser_run.add_argument('--fail-fast', action='store_true', default=False)
     parser_run.add_argument('-h', '--help', action='store_true')
 
     # gui
@@ -51,6 +59,29 @@ def get_parser():
     parser_createsuite.add_argument('suite')
     parser_createsuite.add_argument('-h', '--help', action='store_true')
 
+    # reindexreports
+    parser_reindexreports = subparsers.add_parser('reindexreports', add_help=False)
+    parser_reindexreports.add_argument('project', nargs='?', default='')
+    parser_reindexreports.add_argument('-h', '--help', action='store_true')
+
+    # mergereports
+    parser_mergereports = subparsers.add_parser('mergereports', aliases=['merge-reports'],
+                                                add_help=False)
+    parser_mergereports.add_argument('project')
+    parser_mergereports.add_argument('execution')
+    parser_mergereports.add_argument('executions', nargs='+')
+    parser_mergereports.add_argument('-r', '--report', nargs='+', choices=report_choices,
+                                     default=[], type=str)
+    parser_mergereports.add_argument('--report-folder', nargs='?', type=str)
+    parser_mergereports.add_argument('--report-name', nargs='?', type=str)
+    parser_mergereports.add_argument('--timestamp', nargs='?', type=str)
+    parser_mergereports.add_argument('-h', '--help', action='store_true')
+
+    # agent
+    parser_agent = subparsers.add_parser('agent', add_help=False)
+    parser_agent.add_argument('coordinator')
+    parser_agent.add_argument('-h', '--help', action='store_true')
+
     # createsuperuser
     subparsers.add_parser('createuser', add_help=False)
 
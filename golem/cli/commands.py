@@ -13,10 +13,15 @@ from golem.core import test_directory
 from golem.core import utils
 from golem.core.project import Project, create_project
 from golem.core.settings_manager import get_global_settings
+from golem.execution_runner import distributed
 from golem.execution_runner import interactive as interactive_module
-from golem.execution_runner.execution_runner import ExecutionRunner
+from golem.execution_runner.execution_runner import ExecutionRunner, generate_reports
+from golem.execution_runner.execution_totals import ERROR_RESULTS
 from golem.gui.user_management import Users
 from golem.gui import gui_start
+from golem.report import cli_report
+from golem.report import execution_report as exec_report
+from golem.report import report_index
 from . import messages
 
 
@@ -46,7 +51,9 @@ def command_dispatcher(args, testdir):
         if args.command == 'run':
             run_command(args.project, args.test_query, args.browsers, args.processes, args.environments,
                         args.interactive, args.timestamp, args.report, args.report_folder, args.report_name,
-                        args.tags, args.cli_log_level, args.test_functions)
+                        args.tags, args.cli_log_level, args.test_functions, args.schedule,
+                        args.coordinator, args.shard_index, args.shard_count,
+                        args.max_failures, args.fail_fast)
         elif args.command == 'gui':
             gui_command(args.host, args.port, args.debug)
         elif args.command == 'createproject':
@@ -59,6 +66,13 @@ def command_dispatcher(args, testdir):
             createuser_command()
         elif args.command == 'createsuperuser':
             createsuperuser_command(args.username, args.email, args.password, args.noinput)
+        elif args.command == 'reindexreports':
+            reindexreports_command(args.project)
+        elif args.command in ['mergereports', 'merge-reports']:
+            mergereports_command(args.project, args.execution, args.executions, args.report,
+                                 args.report_folder, args.report_name, args.timestamp)
+        elif args.command == 'agent':
+            agent_command(args.coordinator)
 
 
 def display_help(help, command):
@@ -74,20 +88,40 @@ def display_help(help, command):
         print(messages.CREATESUITE_USAGE_MSG)
     elif help == 'createsuperuser' or command == 'createsuperuser':
         print(messages.CREATESUPERUSER_USAGE_MSG)
+    elif help == 'reindexreports' or command == 'reindexreports':
+        print(messages.REINDEXREPORTS_USAGE_MSG)
+    elif help in ['mergereports', 'merge-reports'] or command in ['mergereports', 'merge-reports']:
+        print(messages.MERGEREPORTS_USAGE_MSG)
+    elif help == 'agent' or command == 'agent':
+        print(messages.AGENT_USAGE_MSG)
     else:
         print(messages.USAGE_MSG)
 
 
 def run_command(project='', test_query='', browsers=None, processes=1, environments=None, interactive=False,
                 timestamp=None, reports=None, report_folder=None, report_name=None, tags=None,
-                cli_log_level=None, test_functions=None):
+                cli_log_level=None, test_functions=None, schedule=None, coordinator=None,
+                shard_index=None, shard_count=None, max_failures=None, fail_fast=False):
+
+    if (shard_index is None) != (shard_count is None):
+        sys.exit('golem run: error: --shard-index and --shard-count must be used together')
+    if shard_count is not None and not 0 <= shard_index < shard_count:
+        sys.exit(f'golem run: error: --shard-index must be between 0 and {shard_count - 1}')
+    if max_failures is not None and max_failures < 1:
+        sys.exit('golem run: error: --max-failures must be greater than 0')
+    if coordinator and not os.environ.get(distributed.TOKEN_ENV_VAR):
+        sys.exit(f'golem run: error: the {distributed.TOKEN_ENV_VAR} environment variable '
+                 'is required by --coordinator')
+    if fail_fast:
+        max_failures = 1
 
     if project:
         if test_directory.project_exists(project):
             execution_runner = ExecutionRunner(project, browsers, processes, environments,
                                                interactive, timestamp, reports,
                                                report_folder, report_name,
-                                               tags, test_functions)
+                                               tags, test_functions, schedule, coordinator,
+                                               shard_index, shard_count, max_failures)
 
             session.settings = settings_manager.get_project_settings(project)
             # add --interactive value to settings to make
@@ -165,6 +199,63 @@ def createsuite_command(project, suite_name):
         sys.exit('golem createsuite: error: {}'.format(' '.join(errors)))
 
 
+def reindexreports_command(project=''):
+    if project:
+        if not test_directory.project_exists(project):
+            msg = f'golem reindexreports: error: a project with name {project} does not exist'
+            sys.exit(msg)
+        projects = [project]
+    else:
+        projects = test_directory.get_projects()
+    for project in projects:
+        indexed = report_index.rebuild_index(project)
+        print(f'{project}: {indexed} executions indexed')
+
+
+def mergereports_command(project, execution, executions, reports=None, report_folder=None,
+                         report_name=None, timestamp=None):
+    if not test_directory.project_exists(project):
+        sys.exit(f'golem mergereports: error: a project with name {project} does not exist')
+    session.settings = settings_manager.get_project_settings(project)
+    execution_directories = []
+    for value in executions:
+        # a path to an execution report directory or a
+        # timestamp of the same execution in this project
+        path = value
+        if not os.path.isdir(path):
+            path = exec_report.execution_report_path(project, execution, value)
+        if not os.path.isdir(path):
+            sys.exit(f'golem mergereports: error: the execution report {value} does not exist')
+        execution_directories.append(path)
+    timestamp = timestamp or utils.get_timestamp()
+    execution_directory = exec_report.execution_report_path(project, execution, timestamp)
+    if exec_report.has_execution_finished(execution_directory):
+        sys.exit(f'golem mergereports: error: the execution {execution} {timestamp} already exists')
+    try:
+        data = exec_report.merge_executions(execution_directories, execution_directory)
+    except ValueError as e:
+        sys.exit(f'golem mergereports: error: {e}')
+    cli_report.report_to_cli(data)
+    cli_report.print_totals(data)
+    generate_reports(project, execution, timestamp, data, reports or [], report_folder,
+                     report_name)
+    if any(result in ERROR_RESULTS for result in data['totals_by_result']):
+        sys.exit(1)
+
+
+def agent_command(coordinator):
+    if not os.environ.get(distributed.TOKEN_ENV_VAR):
+        sys.exit(f'golem agent: error: the {distributed.TOKEN_ENV_VAR} environment variable '
+                 'is required')
+    agent = distributed.Agent(coordinator, session.testdir)
+    print(f'Agent {agent.name} connected to {agent.url}')
+    try:
+        agent.run()
+    except OSError as e:
+        sys.exit(f'golem agent: error: could not connect to the coordinator {agent.url}: {e}')
+    print(f'Execution finished, {agent.completed} test sets run by this agent')
+
+
 # TODO deprecated
 def createuser_command():
     sys.exit('Error: createuser command is deprecated. Use createsuperuser instead.')
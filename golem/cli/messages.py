@@ -9,6 +9,9 @@ Commands:
   createtest             Create a new test in a project
   createsuite            Create a new suite in a project
   createsuperuser        Create a new super user.
+  reindexreports         Rebuild the reports index of a project
+  mergereports           Merge the reports of the shards of an execution
+  agent                  Run the tests of a coordinator execution
 
 General Options:
   --golem-dir                 Path to Golem root directory
@@ -21,6 +24,9 @@ Usage: golem run <project> <test|suite|directory> [-b|--browsers]
                  [-p|--processes] [-e|--environments] [-t|--tags]
                  [-i|--interactive] [-r|--report] [--report-folder]
                  [--report-name] [-l|--cli-log-level] [--timestamp]
+                 [--schedule] [--coordinator]
+                 [--shard-index] [--shard-count]
+                 [--max-failures] [--fail-fast]
 
   Run tests, suites or directories
   
@@ -64,7 +70,8 @@ Usage: golem run <project> <test|suite|directory> [-b|--browsers]
                          can be used, enclosed in double quotes.
     -i, --interactive    run in interactive mode
     -r, --report         select reports to generate. Options are:
-                         'junit', 'html', 'html-no-images', and 'json'.
+                         'junit', 'html', 'html-no-images', 'html-dir',
+                         and 'json'.
                          The JSON report is generated by default in the
                          default location.
     --report-folder      absolute path of location to save report. Default is
@@ -74,7 +81,28 @@ Usage: golem run <project> <test|suite|directory> [-b|--browsers]
     -l, --cli-log-level  command line log level. Default is INFO
     --timestamp          used by the execution. Default is 
                          auto-generated with the format:
-                         'year.month.day.hour.minutes.seconds.milliseconds'"""
+                         'year.month.day.hour.minutes.seconds.milliseconds'
+    --schedule           order in which the tests are run. Options are:
+                         'file' (default), tests are run in the order
+                         they are defined; 'longest-first', tests with
+                         the longest duration in previous executions
+                         are run first.
+    --coordinator        run the tests in the agents started with
+                         'golem agent'. The address to listen, e.g.:
+                         0.0.0.0:8123. Default port is 8123.
+                         Requires the GOLEM_COORDINATOR_TOKEN
+                         environment variable.
+    --shard-index        run only a part of the tests, the shard
+    --shard-count        index (from 0 to shard-count - 1) of the
+                         given number of shards. Tests are split
+                         by the duration of previous executions.
+                         Use 'golem mergereports' to combine the
+                         reports of the shards.
+    --max-failures       stop the execution after this amount of
+                         failed tests. The running tests finish,
+                         the rest are reported as 'not run'.
+    --fail-fast          stop the execution after the first failed
+                         test, same as --max-failures 1"""
 
 GUI_USAGE_MSG = """
 Usage: golem gui [-p|--port]
@@ -130,6 +158,56 @@ Usage: golem createsuperuser [-u|--username -e|email -p|--password
                         must be provided.
 """
 
+REINDEXREPORTS_USAGE_MSG = """
+Usage: golem reindexreports [project]
+
+  Rebuild the reports index of a project from the existing
+  reports. The index is used by the report views of the GUI.
+
+  positional arguments:
+    project             an existing project name. When not
+                        provided every project is reindexed."""
+
+MERGEREPORTS_USAGE_MSG = """
+Usage: golem mergereports <project> <execution> <executions...>
+                          [-r|--report] [--report-folder]
+                          [--report-name] [--timestamp]
+
+  Merge the reports of several executions, e.g.: the shards run with
+  --shard-index and --shard-count, into a new execution report.
+
+  Usage example:
+    golem mergereports project suite_name shard0/ shard1/ -r junit html
+
+  positional arguments:
+    project             an existing project name
+    execution           the name of the merged execution, e.g.: the
+                        suite name
+    executions          the report directories of the executions,
+                        or timestamps of the execution in the project
+
+  optional arguments:
+    -r, --report        a list of reports to generate.
+                        Options are: junit, html, html-no-images,
+                        html-dir and json
+    --report-folder     a folder to save the reports
+    --report-name       the name of the report files
+    --timestamp         the timestamp of the merged execution"""
+
+AGENT_USAGE_MSG = """
+Usage: golem agent <coordinator>
+
+  Run the test sets of an execution started with
+  'golem run <project> <test|suite|directory> --coordinator <host:port>'.
+  Run it in a copy of the same test directory, on any host.
+  Several agents can be started in the same host.
+  The agent exits when the execution is finished.
+  The GOLEM_COORDINATOR_TOKEN environment variable must have
+  the same value as in the coordinator.
+
+  positional arguments:
+    coordinator         address of the coordinator, e.g.: 10.0.0.5:8123"""
+
 ADMIN_USAGE_MSG = """
 Usage: golem-admin
 
@@ -0,0 +1,178 @@
+"""In-memory index of the Python files of a directory tree.
+
+Used for the tests, pages and suites folders of a project. Listing a
+big tree with listdir and isdir on every call is slow, specially
+over a network file system. The index keeps the entries of each
+directory and validates them with a single stat of the directory:
+adding, removing or renaming an entry changes the modification time
+of its directory. Only the directories that changed are listed again.
+
+A directory modified less than RACY_SECONDS before it was listed
+could be modified again without changing its modification time
+(file systems with coarse timestamps); it is listed again the next
+time the index is used.
+"""
+import os
+import threading
+import time
+
+
+RACY_SECONDS = 2
+
+IGNORED_DIRS = ['__pycache__']
+IGNORED_FILES = ['__init__.py', '.DS_Store']
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path):
+    """Get the index of a directory, shared by every caller"""
+    path = os.path.normpath(path)
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = FileIndex(path)
+        return _indexes[path]
+
+
+def invalidate(path=None):
+    """Discard the indexes of `path` and its parent directories,
+    or every index when path is None
+    """
+    with _indexes_lock:
+        if path is None:
+            _indexes.clear()
+            return
+        path = os.path.normpath(path)
+        for index_path in list(_indexes):
+            if path == index_path or path.startswith(index_path + os.sep) \
+                    or index_path.startswith(path + os.sep):
+                del _indexes[index_path]
+
+
+class _Directory:
+
+    def __init__(self, mtime, directories, files):
+        self.mtime = mtime
+        # names, in the order returned by the file system
+        self.directories = directories
+        # names without the .py extension
+        self.files = files
+
+
+class FileIndex:
+
+    def __init__(self, path):
+        self.path = path
+        # _Directory by relative path ('' is the root)
+        self._directories = {}
+        self._lock = threading.Lock()
+
+    def _full_path(self, relpath):
+        return os.path.join(self.path, relpath) if relpath else self.path
+
+    def _list(self, relpath):
+        """List a directory and the subdirectories that are not listed"""
+        full_path = self._full_path(relpath)
+        try:
+            mtime = os.stat(full_path).st_mtime
+            entries = list(os.scandir(full_path))
+        except OSError:
+            return
+        if time.time() - mtime < RACY_SECONDS:
+            mtime = None
+        directories = []
+        files = []
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name not in IGNORED_DIRS:
+                    directories.append(entry.name)
+            elif entry.name.endswith('.py') and entry.name not in IGNORED_FILES:
+                files.append(entry.name[:-3])
+        self._directories[relpath] = _Directory(mtime, directories, files)
+        for directory in directories:
+            sub_relpath = os.path.join(relpath, directory) if relpath else directory
+            if sub_relpath not in self._directories:
+                self._list(sub_relpath)
+
+    def _remove(self, relpath):
+        directory = self._directories.pop(relpath, None)
+        if directory:
+            for name in directory.directories:
+                self._remove(os.path.join(relpath, name) if relpath else name)
+
+    def refresh(self):
+        """Update the directories that changed since they were listed"""
+        if '' not in self._directories:
+            self._list('')
+            return
+        for relpath in list(self._directories):
+            directory = self._directories.get(relpath)
+            if directory is None:
+                # removed while refreshing a parent
+                continue
+            try:
+                mtime = os.stat(self._full_path(relpath)).st_mtime
+            except OSError:
+                mtime = None
+            if mtime is None:
+                self._remove(relpath)
+            elif directory.mtime is None or mtime != directory.mtime:
+                self._list(relpath)
+                listed = self._directories.get(relpath)
+                current = listed.directories if listed else []
+                for name in directory.directories:
+                    if name not in current:
+                        self._remove(os.path.join(relpath, name) if relpath else name)
+
+    def _walk(self, relpath):
+        directory = self._directories.get(relpath)
+        if directory is None:
+            return
+        yield relpath, directory
+        for name in directory.directories:
+            yield from self._walk(os.path.join(relpath, name) if relpath else name)
+
+    def files(self, directory=''):
+        """The dot paths of the files inside `directory`,
+        a relative path from the root of the index.
+        The dot paths are relative to the root of the index.
+        """
+        with self._lock:
+            self.refresh()
+            relpath = os.path.normpath(directory) if directory else ''
+            files = []
+            for dir_relpath, dir_ in self._walk(relpath):
+                dot_path = '.'.join(dir_relpath.split(os.sep)) if dir_relpath else ''
+                files.extend(f'{dot_path}.{name}' if dot_path else name for name in dir_.files)
+            return files
+
+    def tree(self):
+        """The structure of the directory, as returned by
+        file_manager.generate_file_structure_dict
+        """
+        with self._lock:
+            self.refresh()
+            return self._tree('')
+
+    def _tree(self, relpath):
+        directory = self._directories.get(relpath)
+        dot_path = '.'.join(relpath.split(os.sep)) if relpath else ''
+        element = {
+            'type': 'directory',
+            'name': os.path.basename(relpath or self.path),
+            'dot_path': dot_path,
+            'sub_elements': []
+        }
+        if directory is None:
+            return element
+        for name in directory.directories:
+            element['sub_elements'].append(self._tree(os.path.join(relpath, name) if relpath else name))
+        for name in sorted(directory.files):
+            element['sub_elements'].append({
+                'type': 'file',
+                'name': name,
+                'dot_path': f'{dot_path}.{name}' if dot_path else name,
+                'sub_elements': []
+            })
+        return element
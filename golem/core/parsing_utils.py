@@ -1,12 +1,129 @@
 import ast
+import copy
+import os
+
+
+# parsed files by path: (file signature, ast.Module node)
+_ast_cache = {}
+# literal module variables by path: (file signature, (values, unresolved))
+_metadata_cache = {}
+
+
+def file_signature(path):
+    """Identify the current content of a file without reading it.
+    Changes when the file is modified or replaced.
+    """
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size, stat.st_ino
+
+
+def cache_by_file(cache, path, load):
+    """Get the value cached for a file in `cache`, a dict.
+    `load()` is called when the file changed since it was cached.
+    """
+    try:
+        signature = file_signature(path)
+    except OSError:
+        return load()
+    cached = cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    value = load()
+    cache[path] = (signature, value)
+    return value
 
 
 def ast_parse_file(filename):
     """Parse a Python file using ast.
-    Returns a ast.Module node
+    Returns a ast.Module node.
+    The node is cached until the file changes, it must not be modified.
+    """
+    def parse():
+        with open(filename, "rt", encoding='utf-8') as file:
+            return ast.parse(file.read(), filename=filename)
+    return cache_by_file(_ast_cache, filename, parse)
+
+
+def _assigned_names(target):
+    if isinstance(target, ast.Name):
+        return [target.id]
+    if isinstance(target, (ast.Tuple, ast.List)):
+        return [name for elt in target.elts for name in _assigned_names(elt)]
+    if isinstance(target, ast.Starred):
+        return _assigned_names(target.value)
+    return []
+
+
+def _module_literals(ast_node):
+    values = {}
+    unresolved = set()
+    for node in ast.walk(ast_node):
+        if isinstance(node, ast.ImportFrom) and any(a.name == '*' for a in node.names):
+            # any name could be defined by the star import
+            return {}, None
+        if isinstance(node, ast.Global):
+            unresolved.update(node.names)
+    for node in ast_node.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            try:
+                values[name] = ast.literal_eval(node.value)
+                continue
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                names = [name]
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names = [node.name]
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = [(a.asname or a.name).split('.')[0] for a in node.names]
+        elif isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [name for t in targets for name in _assigned_names(t)]
+        else:
+            # if, for, with, try, etc. may bind any name
+            names = [name.id for name in ast.walk(node)
+                     if isinstance(name, ast.Name) and isinstance(name.ctx, ast.Store)]
+            names += [n for sub in ast.walk(node) if isinstance(sub, (ast.Import, ast.ImportFrom))
+                      for n in [(a.asname or a.name).split('.')[0] for a in sub.names]]
+        for name in names:
+            values.pop(name, None)
+            unresolved.add(name)
+    for name in unresolved:
+        values.pop(name, None)
+    return values, unresolved
+
+
+def module_literals(path):
+    """Read the module variables defined as Python literals
+    without executing the module.
+    e.g.: "tags = ['smoke']" -> {'tags': ['smoke']}
+
+    Returns a (values, unresolved) tuple, `unresolved` is the set of
+    names that are defined in another way (e.g.: "tags = get_tags()")
+    or None when any name could be (e.g.: "from x import *").
+    Names not in `values` nor in `unresolved` are not defined.
+    The result is cached until the file changes.
+    """
+    def extract():
+        try:
+            return _module_literals(ast_parse_file(path))
+        except (OSError, SyntaxError, ValueError):
+            return {}, None
+    values, unresolved = cache_by_file(_metadata_cache, path, extract)
+    return copy.deepcopy(values), unresolved
+
+
+def module_variable(path, name, load_module, default=None):
+    """Get a module variable, reading it from the source code when
+    it is a literal. Otherwise `load_module()` is called to get
+    the module and the variable is read from it.
     """
-    with open(filename, "rt", encoding='utf-8') as file:
-        return ast.parse(file.read(), filename=filename)
+    values, unresolved = module_literals(path)
+    if name in values:
+        return values[name]
+    if unresolved is not None and name not in unresolved:
+        return default
+    return getattr(load_module(), name, default)
 
 
 def top_level_functions(ast_node):
@@ -1,6 +1,7 @@
 import os
 import traceback
 
+from golem.core import file_index
 from golem.core import file_manager
 from golem.core import parsing_utils
 from golem.core import session
@@ -32,7 +33,9 @@ def delete_project(project_name):
     """Delete an entire project.
     DANGER
     """
-    return file_manager.delete_directory(Project(project_name).path)
+    path = Project(project_name).path
+    file_index.invalidate(path)
+    return file_manager.delete_directory(path)
 
 
 class ProjectFileTypes:
@@ -52,9 +55,11 @@ class Project:
     def path(self):
         return os.path.join(session.testdir, 'projects', self.name)
 
+    def _file_index(self, file_type):
+        return file_index.get_index(self.element_directory_path(file_type))
+
     def _file_tree(self, file_type):
-        path = self.element_directory_path(file_type)
-        return file_manager.generate_file_structure_dict(path)
+        return self._file_index(file_type).tree()
 
     @property
     def test_tree(self):
@@ -72,13 +77,7 @@ class Project:
         """List of files of `file_type`.
         Directory must be a relative path from the project element base folder
         """
-        base_path = self.element_directory_path(file_type)
-        path = os.path.join(base_path, directory)
-        elements = file_manager.get_files_dot_path(path, extension='.py')
-        if directory:
-            dotpath = '.'.join(os.path.normpath(directory).split(os.sep))
-            elements = ['.'.join([dotpath, x]) for x in elements]
-        return elements
+        return self._file_index(file_type).files(directory)
 
     def tests(self, directory=''):
         """List all tests in project or all tests in a subdirectory"""
@@ -76,6 +76,7 @@ REDUCED_SETTINGS_FILE_CONTENT = (
 DEFAULTS = [
     ('search_timeout', 0),
     ('wait_displayed', False),
+    ('element_lookup_strategy', 'poll'),
     ('screenshot_on_error', True),
     ('screenshot_on_step', False),
     ('screenshot_on_end', False),
@@ -94,7 +95,16 @@ DEFAULTS = [
     ('cli_log_level', 'INFO'),
     ('log_all_events', True),
     ('start_maximized', True),
-    ('screenshots', {})
+    ('screenshots', {}),
+    ('screenshot_threads', 2),
+    ('screenshot_dedup', None),
+    ('screenshot_dedup_threshold', 5),
+    ('junit_log_lines', None),
+    ('persistent_workers', False),
+    ('worker_max_tests', None),
+    ('worker_max_memory', None),
+    ('reuse_browser', False),
+    ('browser_pool_size', 0)
 ]
 
 
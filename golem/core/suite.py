@@ -141,6 +141,11 @@ class Suite(BaseProjectElement):
     def tags(self):
         return getattr(self.get_module(), 'tags', [])
 
+    @property
+    def reuse_browser(self):
+        """Overrides the reuse_browser setting when defined"""
+        return getattr(self.get_module(), 'reuse_browser', None)
+
     @property
     def tests(self):
         """Return a list with all the test cases in the suite"""
@@ -157,11 +162,7 @@ class Suite(BaseProjectElement):
             for test in module.tests:
                 if test.endswith('.*'):
                     this_dir = test[:-2]
-                    path = os.path.join(self.project.test_directory_path,
-                                        os.sep.join(this_dir.split('.')))
-                    this_dir_tests = file_manager.get_files_dot_path(path, extension='.py')
-                    this_dir_tests = [f'{this_dir}.{x}' for x in this_dir_tests]
-                    tests = tests + this_dir_tests
+                    tests = tests + self.project.tests(os.sep.join(this_dir.split('.')))
                 else:
                     tests.append(test)
         return tests
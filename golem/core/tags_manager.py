@@ -1,66 +1,95 @@
 import ast
+import functools
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from golem.core import file_manager
+from golem.core import parsing_utils
 from golem.core import session
+from golem.core import utils
+from golem.core.project import Project
 from golem.core.test import Test
 
 
+# The tags of the tests are read in a pool of processes
+# when more than this number of tests must be read
+PARALLEL_READ_THRESHOLD = 200
+
+PROGRESS_STEP = 500
+
+
 class InvalidTagExpression(Exception):
     pass
 
 
-class TagExpressionConstructor:
-    """Construct a boolean expression string for querying tags.
-    The expression string can only contain:
-      - and       (ast.BoolOp, ast.And)
-      - or        (ast.BoolOp, ast.Or)
-      - not       (ast.UnaryOp, ast.Not)
-      - strings   (ast.Str)
-      - names     (ast.Name)
-      - numbers   (ast.Num)
-    Any other ast node type will throw InvalidTagExpression
+def _tag_value(expr):
+    if isinstance(expr, ast.Name):
+        return expr.id
+    if isinstance(expr, ast.Constant):
+        return str(expr.value) if type(expr.value) in (str, int, float) else None
+    # Python < 3.8 parses strings and numbers as ast.Str and ast.Num
+    if isinstance(expr, getattr(ast, 'Str', ())):
+        return expr.s
+    if isinstance(expr, getattr(ast, 'Num', ())):
+        return str(expr.n)
+    return None
+
+
+def _compile(expr):
+    """Compile an ast node of a tag expression into a function
+    that receives an inverted index ({tag: set of tests}) and
+    the set of all the tests and returns the tests that match.
+    """
+    if isinstance(expr, ast.Expr):
+        return _compile(expr.value)
+    elif isinstance(expr, ast.BoolOp):
+        operands = [_compile(v) for v in expr.values]
+        if isinstance(expr.op, ast.Or):
+            return lambda index, tests: set().union(*(o(index, tests) for o in operands))
+        return lambda index, tests: set(tests).intersection(*(o(index, tests) for o in operands))
+    elif isinstance(expr, ast.UnaryOp) and isinstance(expr.op, ast.Not):
+        operand = _compile(expr.operand)
+        return lambda index, tests: tests - operand(index, tests)
+    tag = _tag_value(expr)
+    if tag is None:
+        msg = ('unknown expression {}, the only valid operators for tag expressions '
+               'are: \'and\', \'or\' & \'not\''.format(type(expr)))
+        raise InvalidTagExpression(msg)
+    return lambda index, tests: index.get(tag, set()) & tests
+
+
+@functools.lru_cache(maxsize=128)
+def compile_tag_expression(expression):
+    """Compile a tag expression once.
+    Returns a function that receives an inverted index
+    ({tag: set of tests}) and the set of tests to filter
+    and returns the set of tests that match the expression.
 
     Example:
-      >> expression = "'foo' and (bar or not 'b a z')"
-      >> tags = []
-      >> TagExpressionConstructor(expression, tags).run()
-      "('foo' in []) and (('bar' in []) or (not 'b a z' in []))"
+      >> query = compile_tag_expression("foo and not 'b a z'")
+      >> query({'foo': {'t1', 't2'}, 'b a z': {'t2'}}, {'t1', 't2', 't3'})
+      {'t1'}
     """
-    def __init__(self, expression, tags):
-        self.parsed = ast.parse(expression)
-        self.tags = tags
-
-    def run(self):
-        return self._evaluate(self.parsed.body[0])
-
-    def _evaluate(self, expr):
-        if isinstance(expr, ast.Expr):
-            return self._evaluate(expr.value)
-        elif isinstance(expr, ast.BoolOp):
-            if isinstance(expr.op, ast.Or):
-                evaluated = ['({})'.format(self._evaluate(v)) for v in expr.values]
-                return ' or '.join(evaluated)
-            elif isinstance(expr.op, ast.And):
-                evaluated = ['({})'.format(self._evaluate(v)) for v in expr.values]
-                return ' and '.join(evaluated)
-        elif isinstance(expr, ast.UnaryOp):
-            if isinstance(expr.op, ast.Not):
-                return 'not {}'.format(self._evaluate(expr.operand))
-        elif isinstance(expr, ast.Num):
-            return '"{}" in {}'.format(str(expr.n), self.tags)
-        elif isinstance(expr, ast.Str):
-            return '"{}" in {}'.format(expr.s, self.tags)
-        elif isinstance(expr, ast.Name):
-            return '"{}" in {}'.format(expr.id, self.tags)
-        else:
-            msg = ('unknown expression {}, the only valid operators for tag expressions '
-                   'are: \'and\', \'or\' & \'not\''.format(type(expr)))
-            raise InvalidTagExpression(msg)
-
-
-def filter_tests_by_tags(project, tests, tags):
+    return _compile(ast.parse(expression).body[0])
+
+
+def build_tag_index(tests_tags):
+    """Build an inverted index of tags: {tag: set of tests}"""
+    index = {}
+    for test, tags in tests_tags.items():
+        # tags = 'foo' is a single tag
+        if isinstance(tags, str):
+            tags = [tags]
+        elif not isinstance(tags, (list, tuple, set)):
+            continue
+        for tag in tags:
+            if isinstance(tag, str):
+                index.setdefault(tag, set()).add(test)
+    return index
+
+
+def filter_tests_by_tags(project, tests, tags, progress=None):
     """Filter a list of tests by a list of tags.
 
     Tags are concatenated with `and` operator.
@@ -70,7 +99,8 @@ def filter_tests_by_tags(project, tests, tags):
     Example:
       tags=["'foo' and ('bar' or not 'baz')"]
 
-    Using an invalid tag expression will cause InvalidTagExpression
+    Using an invalid tag expression will cause InvalidTagExpression.
+    `progress` is passed to get_tests_tags
     """
 
     def _construct_tag_expr(tags):
@@ -83,75 +113,151 @@ def filter_tests_by_tags(project, tests, tags):
                 cleaned.append(f'"{tag}"')
         return ' and '.join(cleaned)
 
-    def _test_matches_tag_query(query, tags):
-        result = TagExpressionConstructor(query, tags).run()
-        return eval(result)
-
-    result = []
     tag_expr = _construct_tag_expr(tags)
-    tests_tags = get_tests_tags(project, tests)
-    if tag_expr:
-        for test in tests:
-            if _test_matches_tag_query(tag_expr, tests_tags[test]):
-                result.append(test)
-    return result
+    if not tag_expr:
+        return []
+    query = compile_tag_expression(tag_expr)
+    tests_tags = get_tests_tags(project, tests, progress)
+    index = build_tag_index({test: tests_tags[test] for test in tests})
+    matched = query(index, set(tests))
+    return [test for test in tests if test in matched]
 
 
 def get_test_tags(project, full_test_case_name):
-    result = []
-    test_module = Test(project, full_test_case_name).module
-    if hasattr(test_module, 'tags'):
-        result = getattr(test_module, 'tags')
-    return result
+    return Test(project, full_test_case_name).tags
 
 
-def get_tests_tags(project, tests):
+def _read_tags(path):
+    """Read the tags of a test file. Literal tags are read
+    from the source, otherwise the module is imported.
+    """
+    def load_module():
+        module, _ = utils.import_module_cached(path)
+        return module
+    return parsing_utils.module_variable(path, 'tags', load_module, [])
+
+
+class _NotLiteral(Exception):
+    pass
+
+
+def _read_literal_tags(path):
+    """Read the tags of a test file without importing it.
+    Returns a (resolved, tags) tuple, resolved is False when the
+    tags are not a literal and the module must be imported.
+    """
+    def not_literal():
+        raise _NotLiteral
+    try:
+        return True, parsing_utils.module_variable(path, 'tags', not_literal, [])
+    except _NotLiteral:
+        return False, None
+
+
+def _read_tests_tags(paths, progress=None):
+    """Read the tags of a list of test files.
+    When there are more than PARALLEL_READ_THRESHOLD files the literal
+    tags are read in a pool of processes and `progress(done, total)` is
+    called every PROGRESS_STEP files. Modules are only imported in this
+    process, the processes of the pool might not be able to import
+    them (e.g.: the testdir is not in sys.path with the spawn start
+    method).
+    """
+    total = len(paths)
+    if total <= PARALLEL_READ_THRESHOLD:
+        return [_read_tags(path) for path in paths]
+    chunksize = max(1, min(PROGRESS_STEP, total // (4 * (os.cpu_count() or 1))))
+    results = []
+
+    def add_result(path, resolved, tags):
+        results.append(tags if resolved else _read_tags(path))
+        if progress and len(results) % PROGRESS_STEP == 0:
+            progress(len(results), total)
+
+    try:
+        with ProcessPoolExecutor() as executor:
+            literal_tags = executor.map(_read_literal_tags, paths, chunksize=chunksize)
+            for path, (resolved, tags) in zip(paths, literal_tags):
+                add_result(path, resolved, tags)
+    except (OSError, BrokenProcessPool):
+        # processes are not available, read the remaining files serially
+        for path in paths[len(results):]:
+            add_result(path, True, _read_tags(path))
+    if progress and total % PROGRESS_STEP:
+        progress(total, total)
+    return results
+
+
+# the .tags cache of each project, by path: (file signature, cache)
+_cache_files = {}
+
+
+def _read_tags_cache(cache_file_path):
+    try:
+        signature = parsing_utils.file_signature(cache_file_path)
+    except OSError:
+        return {}
+    cached = _cache_files.get(cache_file_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with open(cache_file_path, encoding='utf-8') as f:
+        cache_tags_file_content = f.read()
+    try:
+        cache_tags = json.loads(cache_tags_file_content)
+    except json.JSONDecodeError:
+        # There is a JSON error in the file.
+        os.remove(cache_file_path)
+        return {}
+    _cache_files[cache_file_path] = (signature, cache_tags)
+    return cache_tags
+
+
+def _write_tags_cache(cache_file_path, cache_tags):
+    temp_path = f'{cache_file_path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache_tags, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, cache_file_path)
+    _cache_files[cache_file_path] = (parsing_utils.file_signature(cache_file_path), cache_tags)
+
+
+def get_tests_tags(project, tests, progress=None):
     """Get the tags of a list of tests
 
     Caches the results.
     Updates the cache when last modification time of file differs
-    from cache timestamp.
+    from cache timestamp. The cache file is written only when
+    it changed.
+
+    When the tags of many tests must be read (e.g.: the cache is
+    empty) they are read in parallel, see _read_tests_tags.
     """
     cache_file_path = os.path.join(session.testdir, 'projects', project, '.tags')
-    cache_tags = {}
-    if os.path.isfile(cache_file_path):
-        with open(cache_file_path, encoding='utf-8') as f:
-            cache_tags_file_content = f.read()
-        try:
-            cache_tags = json.loads(cache_tags_file_content)
-        except json.JSONDecodeError:
-            # There is a JSON error in the file.
-            # Remove the file and call itself.
-            os.remove(cache_file_path)
-            return get_tests_tags(project, tests)
-
+    cache_tags = _read_tags_cache(cache_file_path)
+    stale = []
     for test in tests:
-        t = Test(project, test)
-        last_modified_time = os.path.getmtime(t.path)
-        if test in cache_tags:
-            cache_timestamp = cache_tags[test]['timestamp']
-            if last_modified_time != cache_timestamp:
-                # re-read tags
-                cache_tags[test] = {
-                    'tags': get_test_tags(project, test),
-                    'timestamp': last_modified_time
-                }
-        else:
+        path = Test(project, test).path
+        last_modified_time = os.path.getmtime(path)
+        if test not in cache_tags or cache_tags[test]['timestamp'] != last_modified_time:
+            stale.append((test, path, last_modified_time))
+    dirty = len(stale) > 0
+    if dirty:
+        # the cached dict is shared, modify a copy
+        cache_tags = dict(cache_tags)
+        stale_tags = _read_tests_tags([path for _, path, _ in stale], progress)
+        for (test, _, last_modified_time), tags in zip(stale, stale_tags):
             cache_tags[test] = {
-                'tags': get_test_tags(project, test),
+                'tags': tags,
                 'timestamp': last_modified_time
             }
-    with open(cache_file_path, 'w', encoding='utf-8') as f:
-        json.dump(cache_tags, f, indent=2, ensure_ascii=False)
+    if dirty or not os.path.isfile(cache_file_path):
+        _write_tags_cache(cache_file_path, cache_tags)
     tags = {test: cache_tags[test]['tags'] for test in cache_tags}
     return tags
 
 
 def get_all_project_tests_tags(project):
     """Get all the tags of each test in a project"""
-    tests_folder_path = os.path.join(session.testdir, 'projects', project, 'tests')
-    tests = file_manager.get_files_dot_path(tests_folder_path, extension='.py')
-    return get_tests_tags(project, tests)
+    return get_tests_tags(project, Project(project).tests())
 
 
 def get_project_unique_tags(project):
@@ -276,17 +276,24 @@ class Test(BaseProjectElement):
             self._module = self.module
         return self._module
 
+    def get_variable(self, name, default=None):
+        """Get a module level variable of the test.
+        Literal values are read from the source without
+        executing the test module.
+        """
+        return parsing_utils.module_variable(self.path, name, self.get_module, default)
+
     @property
     def description(self):
-        return getattr(self.get_module(), 'description', '')
+        return self.get_variable('description', '')
 
     @property
     def tags(self):
-        return getattr(self.get_module(), 'tags', [])
+        return self.get_variable('tags', [])
 
     @property
     def pages(self):
-        page_list = getattr(self.get_module(), 'pages', [])
+        page_list = self.get_variable('pages', [])
         imported_pages = test_parser.parse_imported_pages(self.code)
         return page_list + imported_pages
 
@@ -342,7 +349,7 @@ class Test(BaseProjectElement):
 
     @property
     def skip(self):
-        return getattr(self.get_module(), 'skip', False)
+        return self.get_variable('skip', False)
 
     @property
     def components(self):
@@ -9,6 +9,7 @@ import json
 import os
 import traceback
 
+from golem.core import parsing_utils
 from golem.core import test as test_module
 from golem.core import utils
 
@@ -114,9 +115,8 @@ def validate_internal_data(internal_data_str):
 def get_internal_test_data_as_string(project, full_test_case_name):
     """Get test data defined inside the test itself."""
     data_str = ''
-    tm = test_module.Test(project, full_test_case_name).module
-    if hasattr(tm, 'data'):
-        data_variable = getattr(tm, 'data')
+    data_variable = test_module.Test(project, full_test_case_name).get_variable('data')
+    if data_variable is not None:
         data_str = format_internal_data_var(data_variable)
     return data_str
 
@@ -152,9 +152,8 @@ def get_internal_test_data(project, test_name):
     data var is ignored unless it's a dictionary or a
     list of dictionaries
     """
-    test = test_module.Test(project, test_name)
-    if hasattr(test.module, 'data'):
-        data_var = getattr(test.module, 'data')
+    data_var = test_module.Test(project, test_name).get_variable('data')
+    if data_var is not None:
         if type(data_var) is dict:
             return [data_var]
         if type(data_var) is list:
@@ -172,6 +171,119 @@ def get_test_data(project, test_name):
     }
 
 
+class DataSet:
+    """A reference to a data set of a test, the data is read by `load`.
+
+    The execution list holds references instead of the data, so the
+    rows of big data files are not kept in memory nor sent to the
+    worker processes. Each test set reads its own row:
+      csv:   the row at position `position` (f.tell) of the csv file
+      json:  the element `position` of the json file
+      value: `data`, data defined inside the test
+    """
+
+    def __init__(self, source, path=None, position=None, fieldnames=None, data=None,
+                 values=None):
+        self.source = source
+        self.path = path
+        self.position = position
+        self.fieldnames = fieldnames
+        self.data = data
+        self.values = values or {}
+
+    def with_values(self, **values):
+        """A copy of the data set with additional values, e.g.: env"""
+        return DataSet(self.source, self.path, self.position, self.fieldnames, self.data,
+                       dict(self.values, **values))
+
+    def without_values(self, *names):
+        """A copy of the data set without some additional values"""
+        values = {k: v for k, v in self.values.items() if k not in names}
+        return DataSet(self.source, self.path, self.position, self.fieldnames, self.data,
+                       values)
+
+    def load(self):
+        if self.source == 'csv':
+            data = _read_csv_row(self.path, self.position, self.fieldnames)
+        elif self.source == 'json':
+            json_data = parsing_utils.cache_by_file(_json_cache, self.path,
+                                                    lambda: _read_json_file(self.path))
+            data = dict(json_data if type(json_data) is dict else json_data[self.position])
+        else:
+            data = dict(self.data)
+        data.update(self.values)
+        return data
+
+    def __repr__(self):
+        return (f'DataSet({self.source!r}, path={self.path!r}, position={self.position!r}, '
+                f'data={self.data!r}, values={self.values!r})')
+
+
+# parsed json data files by path, read by the process that runs the test
+_json_cache = {}
+
+
+def _read_json_file(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _csv_lines(f, position):
+    """The lines of a csv file opened in text mode with universal
+    newlines, like get_csv_test_data. position[0] is updated with
+    the position (f.tell) of the next line.
+    """
+    while True:
+        line = f.readline()
+        if not line:
+            return
+        position[0] = f.tell()
+        yield line
+
+
+def _csv_row_offsets(path):
+    """Read a csv file keeping only the position of each row.
+    Returns a (offsets, fieldnames) tuple.
+    """
+    offsets = []
+    with open(path, encoding='utf-8') as f:
+        position = [f.tell()]
+        reader = csv.DictReader(_csv_lines(f, position))
+        fieldnames = reader.fieldnames
+        offset = position[0]
+        for _ in reader:
+            offsets.append(offset)
+            offset = position[0]
+    return offsets, fieldnames
+
+
+def _read_csv_row(path, offset, fieldnames):
+    position = [offset]
+    with open(path, encoding='utf-8') as f:
+        f.seek(offset)
+        reader = csv.DictReader(_csv_lines(f, position), fieldnames=fieldnames)
+        return dict(next(reader))
+
+
+def get_test_data_sets(project, test_name):
+    """Get references to the data sets of a test for the execution,
+    see DataSet. Same sources as get_parsed_test_data.
+    """
+    csv_path = csv_file_path(project, test_name)
+    if os.path.isfile(csv_path):
+        offsets, fieldnames = _csv_row_offsets(csv_path)
+        if offsets:
+            return [DataSet('csv', csv_path, offset, fieldnames) for offset in offsets]
+    json_data = get_json_test_data(project, test_name)
+    if json_data:
+        json_path = json_file_path(project, test_name)
+        return [DataSet('json', json_path, i) for i in range(len(json_data))]
+    internal_data = get_internal_test_data(project, test_name)
+    if internal_data:
+        return [DataSet('value', data=data) for data in internal_data]
+    return [DataSet('value', data={})]
+
+
 def get_parsed_test_data(project, test_name):
     """Get test data for test execution.
     If more than one data source exist only one will be used.
@@ -113,6 +113,22 @@ def import_module(path):
     return mod, error
 
 
+# imported modules by path: (file signature, (module, error))
+_module_cache = {}
+
+
+def import_module_cached(path):
+    """Import a Python module from a given path.
+    The module is executed again only when the file changes,
+    every caller gets the same module object; it must not be
+    modified. Changes to the modules it imports are not detected,
+    use import_module to report import errors or to get a new module.
+    """
+    from golem.core import parsing_utils
+
+    return parsing_utils.cache_by_file(_module_cache, path, lambda: import_module(path))
+
+
 def module_local_public_functions(module):
     """Get a list of function names defined in a module.
     Ignores functions that start with `_` and functions
@@ -0,0 +1,546 @@
+"""Run the test sets of an execution in several machines.
+
+The coordinator (`golem run ... --coordinator <host:port>`) serves the
+execution list over HTTP. Agents (`golem agent <host:port>`), started
+in the same test directory on any host, lease test sets one at a time,
+run them with run_test and upload the test set report directory. The
+coordinator extracts it into the report directory of the execution,
+the same layout of a local execution.
+
+Every request sends the token shared by the coordinator and the agents
+(the GOLEM_COORDINATOR_TOKEN environment variable) in the Authorization
+header, requests without it are rejected with 401.
+
+Protocol, every body is JSON except the uploaded zip:
+  GET  /run                  the values shared by every test set
+  POST /lease                204: nothing to lease now, retry later
+                             (the name of the agent in the body)
+                             410: the execution has finished
+                             200: {"lease": id, "task": {...}}
+  POST /heartbeat/<lease>    extend the lease, 410 if it expired
+  POST /complete/<lease>     upload a zip of the test set reports
+
+A lease expires when the agent does not send a heartbeat in
+`lease_timeout` seconds (e.g.: the agent or its host died); the test
+set is leased again, up to `max_attempts` times.
+
+The settings and secrets of the project are sent to the agents,
+the coordinator should only listen on a trusted network.
+"""
+import hmac
+import io
+import json
+import multiprocessing
+import ntpath
+import os
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+import uuid
+import zipfile
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from golem import browser
+from golem.core import session
+from golem.execution_runner.execution_totals import ExecutionTotals
+from golem.execution_runner.multiprocess_executor import RunConstants
+from golem.report import test_report
+from golem.test_runner.test_runner import run_test
+
+
+DEFAULT_PORT = 8123
+
+LEASE_TIMEOUT = 60
+
+MAX_ATTEMPTS = 3
+
+# Seconds the coordinator waits, after the execution finished,
+# for the agents to learn that it finished
+FINISH_TIMEOUT = 10
+
+AGENT_FILE = 'agent.json'
+
+TOKEN_ENV_VAR = 'GOLEM_COORDINATOR_TOKEN'
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer requires Python 3.7
+    daemon_threads = True
+
+
+def parse_address(address):
+    """Parse 'host:port', 'host' or 'http://host:port'"""
+    address = address.split('://')[-1].rstrip('/')
+    host, _, port = address.partition(':')
+    return host or '127.0.0.1', int(port) if port else DEFAULT_PORT
+
+
+class Coordinator:
+    """Serve the test sets of an execution to the agents.
+
+    `run_constants` and `tasks` are built by multiprocess_executor.
+    The reports of the finished test functions are sent to `results`
+    (the queue of a ResultsCollector) and added to `totals`
+    (ExecutionTotals).
+    `callback` is called with the number of finished test sets.
+    When `stop` returns True the test sets that were not leased
+    are not run, the leased ones are allowed to finish.
+    The agents must send `token`, a random one is used when
+    it is not provided.
+    """
+
+    def __init__(self, address, run_constants, tasks, reportdir, results=None, totals=None,
+                 callback=None, lease_timeout=LEASE_TIMEOUT, max_attempts=MAX_ATTEMPTS,
+                 stop=None, token=None):
+        self.host, self.port = parse_address(address)
+        self.token = token or uuid.uuid4().hex
+        self.run_constants = run_constants
+        self.tasks = dict(enumerate(tasks))
+        self.reportdir = reportdir
+        self.results = results
+        self.totals = totals
+        self.callback = callback
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.stop_requested = stop
+        self._queue = deque(self.tasks)
+        # lease id -> (task id, expiration time)
+        self._leases = {}
+        # lease id -> task id, an agent may upload the reports of a
+        # test set after its lease expired, until it is leased again
+        self._expired_leases = {}
+        self._attempts = {}
+        # test sets whose reports are being extracted
+        self._completing = set()
+        self._finished = set()
+        # agents that leased test sets and
+        # agents that were told the execution finished
+        self._agents = set()
+        self._finished_agents = set()
+        self._lock = threading.Condition()
+        self._server = None
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.server_port}'
+
+    @property
+    def server_port(self):
+        return self._server.server_address[1] if self._server else self.port
+
+    def start(self):
+        """Start listening in a background thread"""
+        self._server = _ThreadingHTTPServer((self.host, self.port), _handler(self))
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def wait(self):
+        """Wait until every test set is finished or lost"""
+        with self._lock:
+            while len(self._finished) < len(self.tasks):
+                self._requeue_expired_leases()
+                self._drop_queued_if_stopped()
+                self._lock.wait(timeout=min(1, self.lease_timeout))
+
+    def wait_for_agents(self, timeout=FINISH_TIMEOUT):
+        """Wait until every agent was told that the execution finished"""
+        deadline = time.time() + timeout
+        with self._lock:
+            while not self._agents <= self._finished_agents and time.time() < deadline:
+                self._lock.wait(timeout=max(0, deadline - time.time()))
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def serve(self):
+        self.start()
+        print(f'Coordinator listening on {self.url}, waiting for agents')
+        try:
+            self.wait()
+            self.wait_for_agents()
+        finally:
+            self.stop()
+
+    def is_authorized(self, authorization):
+        """Is the value of the Authorization header of a request valid"""
+        expected = f'Bearer {self.token}'
+        return hmac.compare_digest((authorization or '').encode(), expected.encode())
+
+    def _drop_expired_leases(self, task_id):
+        for lease_id, expired_task_id in list(self._expired_leases.items()):
+            if expired_task_id == task_id:
+                del self._expired_leases[lease_id]
+
+    def _finish(self, task_id):
+        self._drop_expired_leases(task_id)
+        self._finished.add(task_id)
+        self._lock.notify_all()
+        if self.callback:
+            self.callback(len(self._finished))
+
+    def _requeue_expired_leases(self):
+        now = time.time()
+        for lease_id, (task_id, expiration) in list(self._leases.items()):
+            if expiration > now:
+                continue
+            del self._leases[lease_id]
+            self._expired_leases[lease_id] = task_id
+            if task_id in self._finished or task_id in self._completing:
+                continue
+            task = self.tasks[task_id]
+            if self._attempts[task_id] < self.max_attempts:
+                print(f'WARNING: the lease of test set {task.name} {task.set_name} expired, '
+                      'it will be run again')
+                self._queue.appendleft(task_id)
+            else:
+                print(f'ERROR: test set {task.name} {task.set_name} was lost after '
+                      f'{self.max_attempts} attempts')
+                if self.totals is not None:
+                    self.totals.has_failed = True
+                self._finish(task_id)
+
+    def _drop_queued_if_stopped(self):
+        """Do not run the queued test sets if the execution was stopped"""
+        if self._queue and self.stop_requested and self.stop_requested():
+            while self._queue:
+                self._finished.add(self._queue.popleft())
+            self._lock.notify_all()
+
+    def run_info(self):
+        run = self.run_constants
+        return {
+            'project': run.project,
+            'settings': run.settings,
+            'secrets': run.secrets,
+            'test_functions': run.test_functions,
+            'tags': run.tags,
+            'is_suite': run.is_suite,
+            'browsers': run.browsers,
+            'envs': run.envs,
+            'lease_timeout': self.lease_timeout
+        }
+
+    def lease(self, agent=None):
+        """Returns (status, lease)"""
+        with self._lock:
+            self._requeue_expired_leases()
+            self._drop_queued_if_stopped()
+            if agent:
+                self._agents.add(agent)
+            if len(self._finished) == len(self.tasks):
+                if agent:
+                    self._finished_agents.add(agent)
+                    self._lock.notify_all()
+                return 410, None
+            while self._queue:
+                task_id = self._queue.popleft()
+                if task_id not in self._finished and task_id not in self._completing:
+                    break
+            else:
+                return 204, None
+            # the reports of a previous lease are not accepted anymore
+            self._drop_expired_leases(task_id)
+            lease_id = uuid.uuid4().hex
+            self._leases[lease_id] = (task_id, time.time() + self.lease_timeout)
+            self._attempts[task_id] = self._attempts.get(task_id, 0) + 1
+            task = self.tasks[task_id]
+        data_set = task.data_set.load() if hasattr(task.data_set, 'load') else task.data_set
+        return 200, {
+            'lease': lease_id,
+            'task': {
+                'name': task.name,
+                'data_set': data_set,
+                'browser': task.browser,
+                'env': task.env,
+                'set_name': task.set_name
+            }
+        }
+
+    def heartbeat(self, lease_id):
+        with self._lock:
+            if lease_id not in self._leases:
+                return 410
+            task_id, _ = self._leases[lease_id]
+            self._leases[lease_id] = (task_id, time.time() + self.lease_timeout)
+            return 200
+
+    def complete(self, lease_id, content):
+        """Add the reports uploaded by an agent.
+        The reports of an expired lease are accepted as long
+        as the test set has not finished yet.
+        """
+        with self._lock:
+            if lease_id in self._leases:
+                task_id, _ = self._leases.pop(lease_id)
+            else:
+                task_id = self._expired_leases.pop(lease_id, None)
+            if task_id is None or task_id in self._finished or task_id in self._completing:
+                return 410
+            self._completing.add(task_id)
+        try:
+            agent_info = self._extract(content)
+        except Exception:
+            print(f'ERROR: invalid reports uploaded for lease {lease_id}')
+            print(traceback.format_exc())
+            with self._lock:
+                self._completing.discard(task_id)
+                self._queue.appendleft(task_id)
+            return 400
+        if self.totals is not None:
+            self.totals.add_results(agent_info.get('totals', {}))
+            if agent_info.get('has_failed'):
+                self.totals.has_failed = True
+        with self._lock:
+            self._completing.discard(task_id)
+            self._finish(task_id)
+        return 200
+
+    def _extract_path(self, name):
+        """The path where a file of an uploaded zip is extracted.
+        Returns None when it is not a relative path inside the
+        report directory, in any platform.
+        """
+        if '\\' in name or name.startswith('/') or ntpath.splitdrive(name)[0]:
+            return None
+        parts = name.split('/')
+        if '..' in parts:
+            return None
+        reportdir = os.path.abspath(self.reportdir)
+        path = os.path.normpath(os.path.join(reportdir, *parts))
+        if path == reportdir or os.path.commonpath([reportdir, path]) != reportdir:
+            return None
+        return path
+
+    def _extract(self, content):
+        agent_info = {}
+        test_file_dirs = set()
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            for name in archive.namelist():
+                if name.endswith('/'):
+                    continue
+                path = self._extract_path(name)
+                if path is None:
+                    print(f'WARNING: invalid path in uploaded reports: {name}')
+                    continue
+                parts = name.split('/')
+                data = archive.read(name)
+                if name == AGENT_FILE:
+                    agent_info = json.loads(data.decode('utf-8'))
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                if len(parts) == 2 and parts[1] == 'report.jsonl':
+                    test_file_dirs.add(parts[0])
+        if self.results is not None:
+            for test_file_dir in test_file_dirs:
+                reports = test_report.read_test_file_report(
+                    os.path.join(self.reportdir, test_file_dir)) or []
+                for report in reports:
+                    self.results.put(report)
+        return agent_info
+
+
+def coordinator_executor(address, project, execution_list, execution_totals, test_functions,
+                         reportdir, tags=None, is_suite=False, callback=None,
+                         execution_results=None, stop=None):
+    """Run a list of tests in the agents connected to a coordinator.
+    Same arguments as multiprocess_executor, `reportdir` is the
+    report directory of the execution.
+    """
+    secrets = execution_list[0].secrets if execution_list else None
+    run_constants = RunConstants(session.testdir, project, session.settings, secrets,
+                                 test_functions, tags, is_suite)
+    tasks = [run_constants.task_descriptor(test) for test in execution_list]
+    coordinator = Coordinator(address, run_constants, tasks, reportdir,
+                              results=execution_results, totals=execution_totals,
+                              callback=callback, stop=stop, token=os.environ.get(TOKEN_ENV_VAR))
+    coordinator.serve()
+
+
+def _handler(coordinator):
+
+    class CoordinatorRequestHandler(BaseHTTPRequestHandler):
+
+        def _send(self, status, body=None):
+            content = b''
+            if body is not None:
+                content = json.dumps(body, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def _body(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return self.rfile.read(length)
+
+        def _is_authorized(self):
+            if coordinator.is_authorized(self.headers.get('Authorization')):
+                return True
+            self._send(401)
+            return False
+
+        def do_GET(self):
+            if not self._is_authorized():
+                return
+            if self.path == '/run':
+                self._send(200, coordinator.run_info())
+            else:
+                self._send(404)
+
+        def do_POST(self):
+            body = self._body()
+            if not self._is_authorized():
+                return
+            if self.path == '/lease':
+                status, lease = coordinator.lease(body.decode('utf-8', 'replace'))
+                self._send(status, lease)
+            elif self.path.startswith('/heartbeat/'):
+                self._send(coordinator.heartbeat(self.path[len('/heartbeat/'):]))
+            elif self.path.startswith('/complete/'):
+                self._send(coordinator.complete(self.path[len('/complete/'):], body))
+            else:
+                self._send(404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return CoordinatorRequestHandler
+
+
+class _ReportsList(list):
+    """Collects the reports sent by the test runner"""
+
+    def put(self, report):
+        self.append(report)
+
+
+def _run_task(testdir, run, task, reportdir):
+    """Run a test set in a child process of the agent"""
+    browser.single_test_process = True
+    totals = ExecutionTotals()
+    data_set = dict(task['data_set'])
+    if task['env'] in run['envs']:
+        data_set['env'] = run['envs'][task['env']]
+    try:
+        run_test(testdir, run['project'], task['name'], data_set, run['secrets'],
+                 run['browsers'][task['browser']], task['env'], run['settings'], reportdir,
+                 task['set_name'], run['test_functions'], execution_totals=totals,
+                 tags=run['tags'], from_suite=run['is_suite'],
+                 execution_results=_ReportsList())
+    finally:
+        with open(os.path.join(reportdir, AGENT_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'totals': totals.by_result(), 'has_failed': totals.has_failed}, f)
+
+
+class Agent:
+    """Lease test sets from a coordinator and run them.
+
+    Each test set runs in a new process, a test set that crashes
+    the process does not stop the agent. Requests to the
+    coordinator are retried for `retry_timeout` seconds.
+    `token` is the token of the coordinator, by default the
+    GOLEM_COORDINATOR_TOKEN environment variable.
+    """
+
+    def __init__(self, address, testdir, poll_interval=1, retry_timeout=60, token=None):
+        host, port = parse_address(address)
+        self.url = f'http://{host}:{port}'
+        self.testdir = testdir
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV_VAR, '')
+        self.poll_interval = poll_interval
+        self.retry_timeout = retry_timeout
+        self.name = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+        self.completed = 0
+
+    def _request(self, method, path, body=None, content_type='application/json'):
+        """Returns (status, json body)"""
+        deadline = time.time() + self.retry_timeout
+        while True:
+            request = urllib.request.Request(self.url + path, data=body, method=method)
+            request.add_header('Authorization', f'Bearer {self.token}')
+            if body is not None:
+                request.add_header('Content-Type', content_type)
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    content = response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                return e.code, None
+            except (urllib.error.URLError, OSError):
+                if time.time() > deadline:
+                    raise
+                time.sleep(self.poll_interval)
+                continue
+            return status, json.loads(content) if content else None
+
+    def run(self):
+        """Run test sets until the execution is finished"""
+        status, run = self._request('GET', '/run')
+        if status == 401:
+            raise PermissionError(f'the coordinator rejected the token, the {TOKEN_ENV_VAR} '
+                                  'environment variable must have the same value '
+                                  'in the coordinator and the agents')
+        while True:
+            status, lease = self._request('POST', '/lease', body=self.name.encode('utf-8'),
+                                          content_type='text/plain')
+            if status == 410:
+                break
+            if status != 200:
+                time.sleep(self.poll_interval)
+                continue
+            self._run_lease(run, lease)
+
+    def _run_lease(self, run, lease):
+        reportdir = tempfile.mkdtemp(prefix='golem-agent-')
+        stop_heartbeat = threading.Event()
+        heartbeat_thread = threading.Thread(target=self._heartbeat,
+                                            args=(lease['lease'], run['lease_timeout'],
+                                                  stop_heartbeat),
+                                            daemon=True)
+        heartbeat_thread.start()
+        try:
+            process = multiprocessing.Process(target=_run_task,
+                                              args=(self.testdir, run, lease['task'], reportdir))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                task = lease['task']
+                print(f'ERROR: the process running test set {task["name"]} {task["set_name"]} '
+                      f'exited with code {process.exitcode}')
+            self._request('POST', f'/complete/{lease["lease"]}', body=_zip_directory(reportdir),
+                          content_type='application/zip')
+            self.completed += 1
+        finally:
+            stop_heartbeat.set()
+            shutil.rmtree(reportdir, ignore_errors=True)
+
+    def _heartbeat(self, lease_id, lease_timeout, stop):
+        while not stop.wait(lease_timeout / 4):
+            try:
+                self._request('POST', f'/heartbeat/{lease_id}', body=b'')
+            except (urllib.error.URLError, OSError):
+                pass
+
+
+def _zip_directory(path):
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                relpath = os.path.relpath(full_path, path)
+                archive.write(full_path, '/'.join(relpath.split(os.sep)))
+    return content.getvalue()
@@ -1,11 +1,14 @@
-import multiprocessing
+import json
 import os
 import sys
+import threading
 import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from types import SimpleNamespace
 
+from golem import browser as browser_module
 from golem.core import session
 from golem.core import utils
 from golem.core import test_data
@@ -18,12 +21,17 @@ from golem.core.test import Test
 from golem.core.project import Project
 from golem.gui import gui_utils
 from golem.execution_runner.multiprocess_executor import multiprocess_executor
+from golem.execution_runner.distributed import coordinator_executor
+from golem.execution_runner import scheduler
+from golem.execution_runner.execution_totals import ExecutionTotals
+from golem.execution_runner.results_collector import ResultsCollector
 
 from golem.test_runner.test_runner import run_test
 from golem.report import execution_report as exec_report
 from golem.report import junit_report
 from golem.report import html_report
 from golem.report import cli_report
+from golem.report.report_data import ReportData
 from golem.report import test_report
 
 
@@ -65,10 +73,14 @@ def initialize_reports_for_test_files(project_name, test_sets):
     This enables live reporting.
     test_sets are all the combinations of test files, environments,
     browsers and test sets.
-    TODO this could be run in the background meanwhile the execution
-    continues to reduce startup time
+    The execution runner calls it in a background thread while the
+    tests run, a pending report never replaces the report of a test
+    that already finished.
+
+    Returns the list of pending reports of every test function.
     """
     test_functions_cache = {}
+    pending_reports = []
 
     for s in test_sets:
         test_file_reportdir = test_report.create_test_file_report_dir(s.reportdir,
@@ -85,9 +97,71 @@ def initialize_reports_for_test_files(project_name, test_sets):
         # If the test functions are not available this test file report
         # will not be initialized
         if s.name in test_functions_cache:
-            test_report.initialize_test_file_report(s.name, test_functions_cache[s.name],
-                                                    s.set_name, test_file_reportdir, s.env,
-                                                    s.browser['name'])
+            reports = test_report.initialize_test_file_report(
+                s.name, test_functions_cache[s.name], s.set_name, test_file_reportdir,
+                s.env, s.browser['name'])
+            pending_reports.extend(reports)
+    return pending_reports
+
+
+def report_writers(project, execution, timestamp, execution_data, reports,
+                   report_folder=None, report_name=None):
+    """The functions that generate the requested reports of a
+    finished execution. Returns a list of (report, function, args, kwargs)
+    """
+    # the report.json, logs and screenshots are read once for every report
+    report_data = ReportData(project, execution, timestamp, execution_data)
+    json_report_folder = report_folder or exec_report.execution_report_path(project, execution,
+                                                                            timestamp)
+    json_report_name = report_name
+    report_name = report_name or 'report'
+    writers = []
+    if 'junit' in reports:
+        writers.append(('junit', junit_report.write_junit_report,
+                        (project, execution, timestamp, report_folder, report_name),
+                        {'report_data': report_data}))
+    if 'json' in reports and (report_folder or json_report_name):
+        writers.append(('json', exec_report.save_execution_json_report,
+                        (execution_data, json_report_folder, report_name), {}))
+    if 'html' in reports:
+        writers.append(('html', html_report.generate_html_report,
+                        (project, execution, timestamp, report_folder, report_name),
+                        {'report_data': report_data}))
+    if 'html-no-images' in reports:
+        no_images_report_name = report_name
+        if 'html' in reports:
+            no_images_report_name = report_name + '-no-images'
+        writers.append(('html-no-images', html_report.generate_html_report,
+                        (project, execution, timestamp, report_folder, no_images_report_name),
+                        {'no_images': True, 'report_data': report_data}))
+    if 'html-dir' in reports:
+        writers.append(('html-dir', html_report.generate_html_report_directory,
+                        (project, execution, timestamp, report_folder, report_name),
+                        {'report_data': report_data}))
+    return writers
+
+
+def generate_reports(project, execution, timestamp, execution_data, reports,
+                     report_folder=None, report_name=None):
+    """Generate the requested reports concurrently
+    and print the time taken by each one
+    """
+    def generate(report, function, args, kwargs):
+        start_time = time.time()
+        try:
+            function(*args, **kwargs)
+        except Exception:
+            print(f'ERROR: could not generate {report} report')
+            print(traceback.format_exc())
+        return report, round(time.time() - start_time, 2)
+
+    writers = report_writers(project, execution, timestamp, execution_data, reports,
+                             report_folder, report_name)
+    if not writers:
+        return
+    with ThreadPoolExecutor(max_workers=len(writers)) as executor:
+        timings = list(executor.map(lambda writer: generate(*writer), writers))
+    cli_report.print_report_timings(timings)
 
 
 class ExecutionRunner:
@@ -101,7 +175,8 @@ class ExecutionRunner:
 
     def __init__(self, project_name, browsers=None, processes=1, environments=None,
                  interactive=False, timestamp=None, reports=None, report_folder=None,
-                 report_name=None, tags=None, test_functions=None):
+                 report_name=None, tags=None, test_functions=None, schedule=None,
+                 coordinator=None, shard_index=None, shard_count=None, max_failures=None):
         if reports is None:
             reports = []
         if tags is None:
@@ -122,22 +197,24 @@ class ExecutionRunner:
         self.execution_name = None
         self.selected_browsers = None
         self.start_time = None
+        self._pending_reports_thread = None
         self.test_functions = test_functions
+        self.schedule = schedule
+        # the address to listen for agents, see distributed
+        self.coordinator = coordinator
+        # run only a part of the execution, see scheduler.shard
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        # stop the execution after this amount of failed tests
+        self.max_failures = max_failures
+        self._finished_sets = 0
         self.suite = SimpleNamespace(processes=None, browsers=None, envs=None,
-                                     before=None, after=None, tags=None)
-        has_failed_tests = self._create_execution_has_failed_tests_flag()
+                                     before=None, after=None, tags=None,
+                                     reuse_browser=None)
         self.execution = SimpleNamespace(processes=1, browsers=[], envs=[],
                                          tests=[], reportdir=None, tags=[],
-                                         has_failed_tests=has_failed_tests)
-
-    @staticmethod
-    def _create_execution_has_failed_tests_flag():
-        """Multiprocessing safe flag to track if any test has failed or
-        errored during the execution
-
-        Returns a multiprocessing.managers.ValueProxy
-        """
-        return multiprocessing.Manager().Value('error', False)
+                                         totals=ExecutionTotals(),
+                                         results=ResultsCollector())
 
     def _select_environments(self, project_envs):
         """Define the environments to use for the test.
@@ -184,7 +261,8 @@ class ExecutionRunner:
         secrets = secrets_manager.get_secrets(self.project.name)
 
         for test in self.tests:
-            data_sets = test_data.get_parsed_test_data(self.project.name, test)
+            # references to the data sets, each test set reads its own data
+            data_sets = test_data.get_test_data_sets(self.project.name, test)
 
             if len(data_sets) > 1 or len(envs) > 1 or len(self.execution.browsers) > 1:
                 # If the test file contain multiple data sets, envs or browsers
@@ -196,11 +274,11 @@ class ExecutionRunner:
 
             for data_set in data_sets:
                 for env in envs:
-                    data_set_env = dict(data_set)
+                    data_set_env = data_set
                     if env in envs_data:
                         # add env_data to data_set
-                        data_set_env['env'] = envs_data[env]
-                        data_set_env['env']['name'] = env
+                        envs_data[env]['name'] = env
+                        data_set_env = data_set.with_values(env=envs_data[env])
                     for browser in self.execution.browsers:
 
                         if multiple_data_sets:
@@ -215,6 +293,23 @@ class ExecutionRunner:
                         execution_list.append(testdef)
         return execution_list
 
+    def _select_shard(self):
+        """Keep the test sets of the execution list that belong to
+        the shard, balanced by the duration of previous executions
+        """
+        set_number = len(self.execution.tests)
+        durations = scheduler.get_test_durations(self.project.name, self.execution_name,
+                                                 include_shards=False)
+        self.execution.tests = scheduler.shard(self.execution.tests, durations,
+                                               self.shard_index, self.shard_count)
+        shard_tests = {test.name for test in self.execution.tests}
+        self.tests = [test for test in self.tests if test in shard_tests]
+        shard_path = os.path.join(self.execution.reportdir, scheduler.SHARD_FILE)
+        with open(shard_path, 'w', encoding='utf-8') as f:
+            json.dump({'index': self.shard_index, 'count': self.shard_count}, f)
+        print(f'Shard {self.shard_index} of {self.shard_count} (0 to {self.shard_count - 1}): '
+              f'{len(self.execution.tests)} of {set_number} test sets')
+
     def _print_number_of_tests_found(self):
         """Print number of tests and test sets to console"""
         test_number = len(self.tests)
@@ -225,14 +320,34 @@ class ExecutionRunner:
                 msg = f'{msg} ({set_number} sets)'
             print(msg)
 
+    def _print_progress(self, finished_sets):
+        """Print the number of finished test sets and the
+        totals by result so far. Only when there is more than one set.
+        """
+        if len(self.execution.tests) > 1:
+            cli_report.print_progress(finished_sets, len(self.execution.tests),
+                                      self.execution.totals.by_result())
+
+    def _test_set_finished(self, finished_sets):
+        self._finished_sets = finished_sets
+        self._print_progress(finished_sets)
+
+    def _max_failures_reached(self):
+        """Should the remaining test sets be skipped,
+        see the `max_failures` argument
+        """
+        return bool(self.max_failures) and \
+            self.execution.totals.failures >= self.max_failures
+
     def _filter_tests_by_tags(self):
         tests = []
         try:
             tests = tags_manager.filter_tests_by_tags(self.project.name, self.tests,
-                                                      self.execution.tags)
+                                                      self.execution.tags,
+                                                      progress=cli_report.print_tags_progress)
         except tags_manager.InvalidTagExpression as e:
             print(f'{e.__class__.__name__}: {e}')
-            self.execution.has_failed_tests.value = True
+            self.execution.totals.has_failed = True
         else:
             if len(tests) == 0:
                 print("No tests found with tag(s): {}".format(', '.join(self.execution.tags)))
@@ -284,6 +399,7 @@ class ExecutionRunner:
         self.suite.browsers = suite_obj.browsers
         self.suite.envs = suite_obj.environments
         self.suite.tags = suite_obj.tags
+        self.suite.reuse_browser = suite_obj.reuse_browser
         module = suite_obj.get_module()
         self.suite.before = getattr(module, 'before', None)
         self.suite.after = getattr(module, 'after', None)
@@ -327,6 +443,10 @@ class ExecutionRunner:
         if self.execution.tags:
             self.tests = self._filter_tests_by_tags()
 
+        # the suite `reuse_browser` variable overrides the setting
+        if self.suite.reuse_browser is not None:
+            session.settings['reuse_browser'] = self.suite.reuse_browser
+
         if not self.tests:
             self._finalize()
         else:
@@ -377,7 +497,7 @@ class ExecutionRunner:
             if invalid_envs:
                 print('ERROR: the following environments do not exist for project '
                       f'{self.project.name}: {", ".join(invalid_envs)}')
-                self.execution.has_failed_tests.value = True
+                self.execution.totals.has_failed = True
                 self._finalize()
                 return
 
@@ -389,21 +509,45 @@ class ExecutionRunner:
             # The result is a list that contains all the requested combinations
             self.execution.tests = self._define_execution_list()
 
-            # Initialize reports with status 'pending'
-            initialize_reports_for_test_files(self.project.name, self.execution.tests)
+            # Keep only the test sets of this shard
+            if self.shard_count:
+                self._select_shard()
+
+            # Order the execution list, by default the tests
+            # are run in the order they were defined
+            self.execution.tests = scheduler.schedule(self.execution.tests, self.project.name,
+                                                      self.execution_name, self.schedule)
+
+            # Initialize reports with status 'pending',
+            # in the background while the tests start
+            self._pending_reports_thread = threading.Thread(
+                target=self._initialize_pending_reports, daemon=True)
+            self._pending_reports_thread.start()
 
             self._print_number_of_tests_found()
 
             try:
                 self._execute()
             except KeyboardInterrupt:
-                self.execution.has_failed_tests.value = True
+                self.execution.totals.has_failed = True
                 self._finalize()
 
+    def _initialize_pending_reports(self):
+        try:
+            pending_reports = initialize_reports_for_test_files(self.project.name,
+                                                                self.execution.tests)
+            self.execution.results.add_pending(pending_reports)
+        except Exception:
+            print('ERROR: there was an error initializing the reports')
+            print(traceback.format_exc())
+
     def _execute(self):
         self.start_time = time.time()
         suite_error = False
 
+        # receive the report of each test function as it finishes
+        self.execution.results.start()
+
         # run suite `before` function
         if self.suite.before:
             try:
@@ -416,18 +560,41 @@ class ExecutionRunner:
             if self.interactive and self.execution.processes != 1:
                 print('WARNING: to run in debug mode, processes must equal one')
 
-            if self.execution.processes == 1:
+            if self.coordinator:
+                # run tests in the agents connected to the coordinator
+                coordinator_executor(self.coordinator, self.project.name, self.execution.tests,
+                                     self.execution.totals, self.test_functions,
+                                     self.execution.reportdir, self.execution.tags,
+                                     self.is_suite, callback=self._test_set_finished,
+                                     execution_results=self.execution.results.queue,
+                                     stop=self._max_failures_reached)
+            elif self.execution.processes == 1:
                 # run tests serially
-                for test in self.execution.tests:
+                for i, test in enumerate(self.execution.tests):
+                    if self._max_failures_reached():
+                        break
                     run_test(session.testdir, self.project.name, test.name, test.data_set, test.secrets,
                              test.browser, test.env, session.settings, test.reportdir, test.set_name,
-                             self.test_functions, self.execution.has_failed_tests,
-                             self.execution.tags, self.is_suite)
+                             self.test_functions, self.execution.totals,
+                             self.execution.tags, self.is_suite,
+                             self.execution.results.queue)
+                    self._test_set_finished(i + 1)
+                # close the browsers kept open by the `reuse_browser`
+                # and `browser_pool_size` settings
+                browser_module.close_idle_browsers()
             else:
                 # run tests using multiprocessing
                 multiprocess_executor(self.project.name, self.execution.tests,
-                                      self.execution.has_failed_tests, self.test_functions,
-                                      self.execution.processes, self.execution.tags, self.is_suite)
+                                      self.execution.totals, self.test_functions,
+                                      self.execution.processes, self.execution.tags, self.is_suite,
+                                      callback=self._test_set_finished,
+                                      execution_results=self.execution.results.queue,
+                                      stop=self._max_failures_reached)
+
+            not_run = len(self.execution.tests) - self._finished_sets
+            if not_run and self._max_failures_reached():
+                print(f'Execution stopped after {self.execution.totals.failures} failed tests, '
+                      f'{not_run} test sets were not run')
 
         # run suite `after` function
         if self.suite.after:
@@ -442,38 +609,27 @@ class ExecutionRunner:
     def _finalize(self):
         elapsed_time = self._get_elapsed_time(self.start_time)
 
-        # generate report.json
+        # every test has finished, wait for the remaining results
+        if self._pending_reports_thread is not None:
+            self._pending_reports_thread.join()
+        self.execution.results.stop()
+
+        # generate report.json from the collected results
         self.report = exec_report.generate_execution_report(self.execution.reportdir,
                                                             elapsed_time,
                                                             self.execution.browsers,
                                                             self.execution.processes,
                                                             self.execution.envs,
                                                             self.execution.tags,
-                                                            session.settings['remote_url'])
+                                                            session.settings['remote_url'],
+                                                            self.execution.results.reports)
 
         cli_report.report_to_cli(self.report)
         cli_report.print_totals(self.report)
 
-        # generate requested reports
-        report_name = self.report_name or 'report'
-        report_folder = self.report_folder or self.execution.reportdir
-        if 'junit' in self.reports:
-            junit_report.generate_junit_report(self.project.name, self.execution_name,
-                                               self.timestamp, self.report_folder,
-                                               report_name)
-        if 'json' in self.reports and (self.report_folder or self.report_name):
-            exec_report.save_execution_json_report(self.report, report_folder, report_name)
-        if 'html' in self.reports:
-            html_report.generate_html_report(self.project.name, self.suite_name,
-                                             self.timestamp, self.report_folder,
-                                             report_name)
-        if 'html-no-images' in self.reports:
-            if 'html' in self.reports:
-                report_name = report_name + '-no-images'
-            html_report.generate_html_report(self.project.name, self.suite_name, self.timestamp,
-                                             self.report_folder, report_name,
-                                             no_images=True)
+        generate_reports(self.project.name, self.execution_name, self.timestamp, self.report,
+                         self.reports, self.report_folder, self.report_name)
 
         # exit to the console with exit status code 1 in case a test fails
-        if self.execution.has_failed_tests.value:
+        if self.execution.totals.has_failed:
             sys.exit(1)
@@ -0,0 +1,66 @@
+import multiprocessing
+
+from golem.test_runner.conf import ResultsEnum
+
+
+RESULTS = [ResultsEnum.SUCCESS, ResultsEnum.FAILURE, ResultsEnum.ERROR,
+           ResultsEnum.CODE_ERROR, ResultsEnum.SKIPPED, ResultsEnum.STOPPED,
+           ResultsEnum.NOT_RUN, ResultsEnum.PENDING, ResultsEnum.RUNNING]
+
+ERROR_RESULTS = [ResultsEnum.CODE_ERROR, ResultsEnum.ERROR, ResultsEnum.FAILURE]
+
+
+class ExecutionTotals:
+    """Totals by result of the test functions of an execution
+    and a flag to track if any test has failed or errored.
+
+    Values are kept in shared memory so they can be updated by
+    every process of the execution. Like every shared ctypes
+    object, it must be passed to the child processes when they
+    are created (e.g.: Pool initargs) and not as a task argument.
+    """
+
+    def __init__(self):
+        self._counts = multiprocessing.Array('i', len(RESULTS))
+        # a single byte write is atomic, the flag does not need a lock
+        self._has_failed = multiprocessing.Value('b', False, lock=False)
+
+    @property
+    def has_failed(self):
+        return bool(self._has_failed.value)
+
+    @has_failed.setter
+    def has_failed(self, value):
+        self._has_failed.value = bool(value)
+
+    def add_result(self, result):
+        """Add the result of a test function"""
+        if result in RESULTS:
+            index = RESULTS.index(result)
+            with self._counts.get_lock():
+                self._counts[index] += 1
+        if result in ERROR_RESULTS:
+            self._has_failed.value = True
+
+    def add_results(self, by_result):
+        """Add the totals by result of another execution process,
+        e.g.: {'success': 2, 'failure': 1}
+        """
+        for result, count in by_result.items():
+            for _ in range(count):
+                self.add_result(result)
+
+    @property
+    def failures(self):
+        """The amount of test functions with an error result"""
+        counts = self._counts[:]
+        return sum(counts[RESULTS.index(result)] for result in ERROR_RESULTS)
+
+    @property
+    def total(self):
+        return sum(self._counts[:])
+
+    def by_result(self):
+        """Returns a dict of result -> amount, results with zero tests are omitted"""
+        counts = self._counts[:]
+        return {result: count for result, count in zip(RESULTS, counts) if count}
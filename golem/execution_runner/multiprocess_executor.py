@@ -1,35 +1,167 @@
 """The multiprocess_executor method runs all the test cases
 provided in parallel using multiprocessing.
 """
+import threading
 from multiprocessing import Pool
-from multiprocessing.pool import ApplyResult
 
+from golem import browser
 from golem.core import session
+from golem.core.test_data import DataSet
+from golem.execution_runner.worker_pool import PersistentWorkerPool
 from golem.test_runner.test_runner import run_test
 
 
-def multiprocess_executor(project, execution_list, has_failed_tests, test_functions, processes=1,
-                          tags=None, is_suite=False):
-    """Runs a list of tests in parallel using multiprocessing"""
-    pool = Pool(processes=processes, maxtasksperchild=1)
-    results = []
-    for test in execution_list:
-        args = (session.testdir,
-                project,
-                test.name,
-                test.data_set,
-                test.secrets,
-                test.browser,
-                test.env,
-                session.settings,
-                test.reportdir,
-                test.set_name,
-                test_functions,
-                has_failed_tests,
-                tags,
-                is_suite)
-        apply_async = pool.apply_async(run_test, args=args)
-        results.append(apply_async)
-    map(ApplyResult.wait, results)
-    pool.close()
-    pool.join()
+# The execution totals and the results queue can only be passed
+# to a worker when it is started, see _init_worker.
+# The values that are the same for every test set of the execution
+# (settings, secrets, environments data, browsers, tags, etc.) are
+# sent once to each worker too, see RunConstants. Each test set is
+# sent as a small TaskDescriptor.
+_execution_totals = None
+_execution_results = None
+_run_constants = None
+
+
+class RunConstants:
+
+    def __init__(self, testdir, project, settings, secrets, test_functions, tags, is_suite):
+        self.testdir = testdir
+        self.project = project
+        self.settings = settings
+        self.secrets = secrets
+        self.test_functions = test_functions
+        self.tags = tags
+        self.is_suite = is_suite
+        self.browsers = []
+        self.reportdirs = []
+        # environment data by env name
+        self.envs = {}
+
+    def _index(self, values, value):
+        # browsers and report dirs are few, a linear search is fine
+        for i, v in enumerate(values):
+            if v == value:
+                return i
+        values.append(value)
+        return len(values) - 1
+
+    def task_descriptor(self, test):
+        """The descriptor of a test set of the execution list.
+        The data of its environment is kept here and removed
+        from the data set.
+        """
+        data_set = test.data_set
+        if isinstance(data_set, DataSet) and 'env' in data_set.values:
+            self.envs[test.env] = data_set.values['env']
+            data_set = data_set.without_values('env')
+        return TaskDescriptor(test.name, data_set, self._index(self.browsers, test.browser),
+                              test.env, self._index(self.reportdirs, test.reportdir),
+                              test.set_name)
+
+
+class TaskDescriptor:
+
+    __slots__ = ('name', 'data_set', 'browser', 'env', 'reportdir', 'set_name')
+
+    def __init__(self, name, data_set, browser, env, reportdir, set_name):
+        self.name = name
+        self.data_set = data_set
+        # index of RunConstants.browsers
+        self.browser = browser
+        self.env = env
+        # index of RunConstants.reportdirs
+        self.reportdir = reportdir
+        self.set_name = set_name
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+def _init_worker(execution_totals, execution_results, run_constants=None):
+    global _execution_totals, _execution_results, _run_constants
+    _execution_totals = execution_totals
+    _execution_results = execution_results
+    _run_constants = run_constants
+
+
+def _init_single_test_worker(*initargs):
+    _init_worker(*initargs)
+    browser.single_test_process = True
+
+
+def _run_test(task):
+    run = _run_constants
+    data_set = task.data_set
+    if task.env in run.envs:
+        data_set = data_set.with_values(env=run.envs[task.env])
+    run_test(run.testdir, run.project, task.name, data_set, run.secrets,
+             run.browsers[task.browser], task.env, run.settings,
+             run.reportdirs[task.reportdir], task.set_name, run.test_functions,
+             execution_totals=_execution_totals, tags=run.tags, from_suite=run.is_suite,
+             execution_results=_execution_results)
+
+
+def multiprocess_executor(project, execution_list, execution_totals, test_functions, processes=1,
+                          tags=None, is_suite=False, callback=None, execution_results=None,
+                          stop=None):
+    """Runs a list of tests in parallel using multiprocessing.
+
+    By default each test set runs in a new process.
+    When the `persistent_workers` setting is true the test sets
+    are run by long-lived workers instead, see worker_pool.
+
+    `callback` is called with the number of finished test sets
+    each time a test set is finished.
+    `execution_results` is the queue where the test runners send
+    the report of each test function.
+    `stop` is called before each test set is started, when it
+    returns True the remaining test sets are not run. The running
+    test sets finish normally and close their browsers.
+    """
+    # every test set of the execution list has the same secrets
+    secrets = execution_list[0].secrets if execution_list else None
+    run_constants = RunConstants(session.testdir, project, session.settings, secrets,
+                                 test_functions, tags, is_suite)
+    tasks = [run_constants.task_descriptor(test) for test in execution_list]
+
+    initargs = (execution_totals, execution_results, run_constants)
+    finished = []
+
+    def task_done(_):
+        finished.append(True)
+        if callback:
+            callback(len(finished))
+
+    if session.settings.get('persistent_workers'):
+        pool = PersistentWorkerPool(processes, _run_test,
+                                    initializer=_init_worker, initargs=initargs,
+                                    max_tests=session.settings.get('worker_max_tests'),
+                                    max_memory=session.settings.get('worker_max_memory'))
+        pool.run(((i, (task,)) for i, task in enumerate(tasks)), callback=task_done, stop=stop)
+    else:
+        pool = Pool(processes=processes, maxtasksperchild=1,
+                    initializer=_init_single_test_worker, initargs=initargs)
+        # test sets are sent to the pool as the processes become
+        # idle, so the execution can be stopped at any point
+        idle_processes = threading.Semaphore(processes)
+
+        def pool_task_done(result):
+            idle_processes.release()
+            task_done(result)
+
+        results = []
+        for task in tasks:
+            idle_processes.acquire()
+            if stop and stop():
+                break
+            apply_async = pool.apply_async(_run_test, args=(task,), callback=pool_task_done,
+                                           error_callback=pool_task_done)
+            results.append(apply_async)
+        for result in results:
+            result.wait()
+        pool.close()
+        pool.join()
@@ -0,0 +1,69 @@
+"""Collect the results of the test functions of an execution.
+
+Test runners push the report of each test function to a queue as
+soon as it is finished, from the parent process or from a worker.
+A thread of the parent process keeps the reports in memory, that
+way the execution report is generated without reading the report
+of each test file from disk.
+"""
+import multiprocessing
+import threading
+
+
+class ResultsCollector:
+
+    def __init__(self):
+        self.queue = multiprocessing.Queue()
+        self._reports = {}
+        # position of each test function, from the pending reports
+        self._order = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @staticmethod
+    def _key(report):
+        return report['test_file'], report['set_name'], report['test']
+
+    def add(self, report):
+        """Add or replace the report of a test function"""
+        with self._lock:
+            self._reports[self._key(report)] = report
+
+    def add_pending(self, reports):
+        """Add the reports of test functions that have not run yet.
+        These define the order of the tests in the execution report,
+        even when they are added after some tests have finished.
+        """
+        with self._lock:
+            for report in reports:
+                key = self._key(report)
+                self._reports.setdefault(key, report)
+                self._order.setdefault(key, len(self._order))
+
+    def _listen(self):
+        while True:
+            report = self.queue.get()
+            if report is None:
+                break
+            self.add(report)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._listen, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Wait for the reports already sent and stop listening.
+        Every process pushing to the queue should have finished.
+        """
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def reports(self):
+        with self._lock:
+            keys = list(self._reports)
+            last = len(self._order)
+            keys.sort(key=lambda key: self._order.get(key, last))
+            return [self._reports[key] for key in keys]
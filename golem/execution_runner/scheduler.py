@@ -0,0 +1,126 @@
+"""Define the order in which the test sets of an execution are run.
+
+Strategies:
+  'file':          test sets are run in the order they are defined
+                   (test files, data sets, environments and browsers).
+  'longest-first': test sets with the longest expected duration are
+                   run first. The expected duration is taken from the
+                   previous reports of the same execution. Test sets
+                   are dispatched to the processes as they become idle,
+                   so this is the longest-processing-time-first rule.
+
+Sharding splits an execution across several runs (e.g.: the jobs of a
+CI matrix), see `shard`. Every shard must be defined with the same
+tests and the same report history to get complementary partitions.
+The reports of the shards are not used to split later shards, a shard
+that finished first would change the partition of the others.
+"""
+import json
+import os
+
+from golem.core.project import Project
+
+
+SCHEDULE_STRATEGIES = ['file', 'longest-first']
+
+DEFAULT_STRATEGY = 'file'
+
+# Written in the report directory of a shard of an execution
+SHARD_FILE = 'shard.json'
+
+
+def get_test_durations(project, execution, limit=10, include_shards=True):
+    """Get the expected duration of each test file of an execution.
+
+    The duration of a test set is the sum of the elapsed time of
+    its test functions. The expected duration of a test file is the
+    average duration of its test sets in the last `limit` finished
+    executions. When `include_shards` is False the executions
+    that were a shard of an execution are ignored.
+
+    Returns a dict of test file name -> seconds.
+    """
+    execution_path = os.path.join(Project(project).report_directory_path, execution)
+    if not os.path.isdir(execution_path):
+        return {}
+    timestamps = sorted(next(os.walk(execution_path))[1], reverse=True)
+
+    durations = {}
+    finished = 0
+    for timestamp in timestamps:
+        if finished >= limit:
+            break
+        report_path = os.path.join(execution_path, timestamp, 'report.json')
+        if not os.path.isfile(report_path):
+            continue
+        if not include_shards and \
+                os.path.isfile(os.path.join(execution_path, timestamp, SHARD_FILE)):
+            continue
+        try:
+            with open(report_path, encoding='utf-8') as f:
+                report = json.load(f)
+        except ValueError:
+            continue
+        finished += 1
+        set_durations = {}
+        for test in report.get('tests', []):
+            if not isinstance(test.get('elapsed_time'), (int, float)):
+                continue
+            key = (test['test_file'], test['set_name'])
+            set_durations[key] = set_durations.get(key, 0) + test['elapsed_time']
+        for (test_file, _), duration in set_durations.items():
+            durations.setdefault(test_file, []).append(duration)
+
+    return {test_file: sum(values) / len(values) for test_file, values in durations.items()}
+
+
+def longest_first(execution_list, durations):
+    """Sort the execution list by expected duration, longest first.
+
+    Tests without history are expected to take the average
+    duration of the known tests. Ties keep the original order.
+    """
+    if durations:
+        fallback = sum(durations.values()) / len(durations)
+    else:
+        fallback = 0
+    return sorted(execution_list, key=lambda t: durations.get(t.name, fallback), reverse=True)
+
+
+def shard(execution_list, durations, shard_index, shard_count):
+    """The test sets of the execution list that belong to a shard.
+
+    The test sets of a test file are kept in the same shard, so the
+    reports of a test file are written by a single shard. Test files
+    are assigned, longest first, to the shard with the least expected
+    duration so far. Test files are sorted by name first, the result
+    does not depend on the order of the execution list.
+    Tests without history are expected to take the average duration
+    of the known tests, or 1 second each when there is no history.
+    """
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f'invalid shard index {shard_index}, it must be '
+                         f'between 0 and {shard_count - 1}')
+    fallback = sum(durations.values()) / len(durations) if durations else 1
+    weights = {}
+    for test in execution_list:
+        weights[test.name] = weights.get(test.name, 0) + durations.get(test.name, fallback)
+    loads = [0] * shard_count
+    shards = {}
+    for name in sorted(weights, key=lambda name: (-weights[name], name)):
+        index = loads.index(min(loads))
+        loads[index] += weights[name]
+        shards[name] = index
+    return [test for test in execution_list if shards[test.name] == shard_index]
+
+
+def schedule(execution_list, project, execution, strategy=None):
+    """Order the execution list using the given strategy"""
+    strategy = strategy or DEFAULT_STRATEGY
+    if strategy not in SCHEDULE_STRATEGIES:
+        raise ValueError(f'invalid schedule strategy {strategy}, options are: '
+                         f'{", ".join(SCHEDULE_STRATEGIES)}')
+    if strategy == 'longest-first':
+        durations = get_test_durations(project, execution)
+        return longest_first(execution_list, durations)
+    return execution_list
@@ -0,0 +1,222 @@
+"""A pool of long-lived worker processes.
+
+multiprocessing.Pool with maxtasksperchild=1 starts a fresh process
+for every test set. The workers of this pool import golem once and
+run test sets one after another. The state left behind by each test
+set (the golem.execution module, modules imported from the test
+directory and sys.path) is reset before the next one starts.
+
+Workers are recycled after running `max_tests` test sets or when
+their resident memory grows more than `max_memory` megabytes.
+"""
+import importlib
+import multiprocessing
+import os
+import queue
+import sys
+import traceback
+
+from golem import execution
+from golem.core import session
+
+
+def get_rss_mb():
+    """Resident set size of the current process in megabytes.
+    Returns None when it cannot be determined in this platform.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is the peak rss, bytes in Mac OS and kilobytes in Linux
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss / 1024 / 1024
+    return max_rss / 1024
+
+
+def _is_test_directory_module(module):
+    """Is the module defined inside the golem test directory"""
+    module_file = getattr(module, '__file__', None)
+    if module_file and session.testdir:
+        return os.path.abspath(module_file).startswith(os.path.abspath(session.testdir))
+    return False
+
+
+def reset_worker_state(base_modules, base_sys_path):
+    """Reset the process state left behind by a test set.
+
+    - golem.execution module values are restored to their defaults
+    - modules imported from the test directory (pages, extend, etc.)
+      are removed from sys.modules so the next test imports them again
+    - sys.path is restored
+    """
+    importlib.reload(execution)
+    for name in list(sys.modules):
+        if name in base_modules:
+            continue
+        module = sys.modules[name]
+        if name == 'projects' or name.startswith('projects.') or \
+                _is_test_directory_module(module):
+            del sys.modules[name]
+    sys.path[:] = base_sys_path
+
+
+def _worker(worker_id, task_queue, result_queue, func, initializer, initargs,
+            max_tests, max_memory):
+    if initializer is not None:
+        initializer(*initargs)
+    base_modules = set(sys.modules)
+    base_sys_path = list(sys.path)
+    base_rss = get_rss_mb()
+    completed = 0
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, args = task
+        try:
+            func(*args)
+        except Exception:
+            print(f'ERROR: worker {worker_id} failed running task {task_id}')
+            print(traceback.format_exc())
+        reset_worker_state(base_modules, base_sys_path)
+        completed += 1
+
+        recycle = False
+        if max_tests and completed >= max_tests:
+            recycle = True
+        elif max_memory and base_rss is not None:
+            rss = get_rss_mb()
+            if rss is not None and rss - base_rss > max_memory:
+                recycle = True
+        result_queue.put((worker_id, task_id, recycle))
+        if recycle:
+            break
+
+
+class PersistentWorkerPool:
+    """Run a function over a list of tasks using long-lived worker processes.
+
+    Each task is assigned to an idle worker by the parent process,
+    that way the parent always knows which task a worker is running
+    and a task lost by a crashed worker is reported.
+    """
+
+    def __init__(self, processes, func, initializer=None, initargs=(),
+                 max_tests=None, max_memory=None):
+        self.processes = processes
+        self.func = func
+        self.initializer = initializer
+        self.initargs = initargs
+        self.max_tests = max_tests
+        self.max_memory = max_memory
+        self._result_queue = multiprocessing.Queue()
+        self._workers = {}
+        self._running = {}
+        self._next_worker_id = 0
+
+    def _start_worker(self):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        task_queue = multiprocessing.Queue()
+        args = (worker_id, task_queue, self._result_queue, self.func, self.initializer,
+                self.initargs, self.max_tests, self.max_memory)
+        process = multiprocessing.Process(target=_worker, args=args, daemon=True)
+        process.start()
+        self._workers[worker_id] = (process, task_queue)
+        return worker_id
+
+    def _stop_worker(self, worker_id):
+        process, task_queue = self._workers.pop(worker_id)
+        if process.is_alive():
+            task_queue.put(None)
+        process.join()
+
+    def _dispatch(self, tasks, worker_id=None, stop=None):
+        """Send the next task to a worker.
+        A new worker is started when worker_id is None.
+        Returns False when there are no tasks left or `stop`
+        returns True.
+        """
+        task = None if stop and stop() else next(tasks, None)
+        if task is None:
+            if worker_id is not None:
+                self._stop_worker(worker_id)
+            return False
+        if worker_id is None:
+            worker_id = self._start_worker()
+        self._running[worker_id] = task[0]
+        self._workers[worker_id][1].put(task)
+        return True
+
+    def _remove_worker(self, worker_id):
+        process, _ = self._workers.pop(worker_id)
+        process.join()
+
+    def _finish_task(self, result, tasks, callback, stop):
+        worker_id, task_id, recycle = result
+        del self._running[worker_id]
+        if callback:
+            callback(task_id)
+        if recycle:
+            self._remove_worker(worker_id)
+            self._dispatch(tasks, stop=stop)
+        else:
+            self._dispatch(tasks, worker_id, stop=stop)
+
+    def _check_dead_workers(self, tasks, callback, stop):
+        """The task of a worker that exited unexpectedly is reported
+        as finished and a new worker is started for the next task
+        """
+        dead_workers = [w for w in self._running if not self._workers[w][0].is_alive()]
+        if not dead_workers:
+            return
+        # a worker can exit after sending its result, e.g.: when it is recycled
+        while True:
+            try:
+                result = self._result_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._finish_task(result, tasks, callback, stop)
+        for worker_id in dead_workers:
+            if worker_id not in self._running or self._workers[worker_id][0].is_alive():
+                continue
+            task_id = self._running.pop(worker_id)
+            print(f'ERROR: worker {worker_id} exited unexpectedly '
+                  f'while running task {task_id}')
+            self._remove_worker(worker_id)
+            if callback:
+                callback(task_id)
+            self._dispatch(tasks, stop=stop)
+
+    def run(self, tasks, callback=None, stop=None):
+        """Run every task.
+
+        `tasks` is an iterable of (task_id, args) tuples.
+        `callback` is called in the parent process with the task_id
+        each time a task is finished.
+        `stop` is called before a task is dispatched, when it returns
+        True the remaining tasks are not run. The running tasks
+        are allowed to finish.
+        """
+        tasks = iter(tasks)
+        for _ in range(self.processes):
+            if not self._dispatch(tasks, stop=stop):
+                break
+        while self._running:
+            try:
+                result = self._result_queue.get(timeout=1)
+            except queue.Empty:
+                pass
+            else:
+                self._finish_task(result, tasks, callback, stop)
+            self._check_dead_workers(tasks, callback, stop)
+        for worker_id in list(self._workers):
+            self._stop_worker(worker_id)
@@ -281,11 +281,11 @@ def project_health():
     _verify_permissions(Permissions.REPORTS_ONLY, project)
     project_data = report.get_last_execution_timestamps(projects=[project],
                                                         execution=None, limit=1)
+    summaries = report.get_execution_summaries(project, project_data[project])
     health_data = {}
     for execution, timestamps in project_data[project].items():
         if timestamps:
-            execution_data = exec_report.get_execution_data(project=project, execution=execution,
-                                                            timestamp=timestamps[0])
+            execution_data = summaries[(execution, timestamps[0])]
             health_data[execution] = {
                 'execution': timestamps[0],
                 'total': execution_data['total_tests'],
@@ -496,15 +496,14 @@ def report_get_reports():
     result = []
 
     for proj, executions in last_timestamps.items():
-        for exec_, timestamps in executions.items():
-            for timestamp in timestamps:
-                execution_data = exec_report.get_execution_data(project=proj, execution=exec_, timestamp=timestamp)
-                result.append({
-                    'project': proj,
-                    'execution': exec_,
-                    'timestamp': timestamp,
-                    'report': execution_data
-                })
+        summaries = report.get_execution_summaries(proj, executions)
+        for (exec_, timestamp), execution_data in summaries.items():
+            result.append({
+                'project': proj,
+                'execution': exec_,
+                'timestamp': timestamp,
+                'report': execution_data
+            })
 
     # re-sort
     result = sorted(result, key=lambda x: x['timestamp'], reverse=True)
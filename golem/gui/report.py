@@ -1,5 +1,6 @@
 """Golem GUI Report blueprint"""
 import json
+import os
 
 from flask import jsonify, render_template, Response, send_from_directory
 from flask.blueprints import Blueprint
@@ -187,5 +188,6 @@ def report_test_json(project, execution, timestamp, test_file, set_name=''):
 def screenshot_file(project, execution, timestamp, test_file, set_name, test, scr):
     if set_name == 'default':
         set_name = ''
-    path = test_report.screenshot_dir(project, execution, timestamp, test_file, test, set_name)
-    return send_from_directory(path, scr)
+    path = test_report.screenshot_path(project, execution, timestamp, test_file, test,
+                                       set_name, scr)
+    return send_from_directory(os.path.dirname(path), os.path.basename(path))
@@ -380,13 +380,15 @@ const DetailTable = new function(){
                     }
                     if(step.screenshot){
                         let guid = Main.Utils.guid();
+                        // the report directory links the screenshots
+                        let screenshotSrc = global.testChunks ? step.screenshot : `data:image/png;base64,${step.screenshot}`;
                         let screenshotIcon = `
                             <span class="icon cursor-pointer" aria-hidden="true" data-toggle="collapse" data-target="#${guid}" aria-expanded="false" aria-controls="${guid}">
                                 <svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" aria-hidden="true"><rect x="3" y="3" width="18" height="18" rx="2" ry="2"></rect><circle cx="8.5" cy="8.5" r="1.5"></circle><polyline points="21 15 16 10 5 21"></polyline></svg>
                                 </span>
                             <div class="collapse text-center" id="${guid}">
                                 <img class="step-screenshot cursor-pointer" style="width: 100%"
-                                    src="data:image/png;base64,${step.screenshot}" onclick="Main.ReportUtils.expandImg(event);">
+                                    src="${screenshotSrc}" onclick="Main.ReportUtils.expandImg(event);">
                             </div>`;
                         stepContent.append(' ' + screenshotIcon)
                     }
@@ -396,7 +398,9 @@ const DetailTable = new function(){
             }
 	    }
 
-	    if(global.static) {
+	    if(global.static && global.testChunks) {
+	        DetailTable.loadTestChunk(testId, _loadTest)
+	    } else if(global.static) {
 	        _loadTest(global.detailTestData[testId])
 	    } else {
 	        xhr.get('/api/report/test', {
@@ -415,6 +419,25 @@ const DetailTable = new function(){
         }
 	}
 
+	this.testChunkCallbacks = {};
+
+	// Load the detail of a test of a report directory.
+	// Each test chunk is a script that calls DetailTable.testChunkLoaded,
+	// scripts can be loaded from the file system.
+	this.loadTestChunk = function(testId, callback){
+	    if(testId in DetailTable.testChunkCallbacks) {
+	        return
+	    }
+	    DetailTable.testChunkCallbacks[testId] = callback;
+	    let script = document.createElement('script');
+	    script.src = global.testChunks[testId];
+	    document.head.appendChild(script);
+	}
+
+	this.testChunkLoaded = function(testId, report){
+	    DetailTable.testChunkCallbacks[testId](report);
+	}
+
 	this.updateColumnHeaderFilterOptions = function(){
 	    let columns = {
 	        'module': [],
@@ -79,3 +79,27 @@ def print_totals(report):
         output = f"Total: {report['total_tests']} tests,{result_string[:-1]} {in_elapsed_time}"
         print()
         print(output)
+
+
+def print_progress(finished_sets, total_sets, totals_by_result):
+    """Print a running counter of the execution,
+    e.g.: 'Progress: 3/10 sets, 5 success, 1 failure'
+    """
+    output = f'Progress: {finished_sets}/{total_sets} sets'
+    for result, number in totals_by_result.items():
+        output += f', {number} {result}'
+    print(output)
+
+
+def print_tags_progress(done, total):
+    """e.g.: 'Reading tags: 500/8000 tests'"""
+    print(f'Reading tags: {done}/{total} tests')
+
+
+def print_report_timings(timings):
+    """Print the time taken to generate each report,
+    e.g.: 'Reports: junit 0.12s, html 1.5s'
+    `timings` is a list of (report, seconds) tuples
+    """
+    output = ', '.join(f'{report} {seconds}s' for report, seconds in timings)
+    print(f'Reports: {output}')
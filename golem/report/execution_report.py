@@ -2,9 +2,13 @@ import base64
 import errno
 import json
 import os
+import shutil
+import sqlite3
 
 from golem.core import utils
 from golem.core.project import Project
+from golem.report import report_index
+from golem.report import screenshot_store
 from golem.report import test_report
 from golem.test_runner.conf import ResultsEnum
 
@@ -25,6 +29,23 @@ def execution_report_default():
     return execution_report
 
 
+def _add_tests_to_execution_data(execution_data, tests, finalize=False):
+    """Add a list of test function reports to the execution data
+    and update the totals. When `finalize` is True pending tests
+    are converted to not run.
+    """
+    for test_function in tests:
+        execution_data['total_tests'] += 1
+
+        if finalize:
+            if test_function['result'] == ResultsEnum.PENDING:
+                test_function['result'] = ResultsEnum.NOT_RUN
+
+        _status_total = execution_data['totals_by_result'].get(test_function['result'], 0) + 1
+        execution_data['totals_by_result'][test_function['result']] = _status_total
+        execution_data['tests'].append(test_function)
+
+
 def _parse_execution_data(execution_directory=None, project=None, execution=None,
                           timestamp=None, finalize=False):
     execution_data = execution_report_default()
@@ -39,26 +60,10 @@ def _parse_execution_data(execution_directory=None, project=None, execution=None
     for test in tests:  # test_file + test set
         test_path = os.path.join(execution_directory, test)
 
-        test_file_json_report = os.path.join(test_path, 'report.json')
-        report_log_path = os.path.join(test_path, 'execution_info.log')
-
-        if os.path.isfile(test_file_json_report):
-            with open(test_file_json_report, encoding='utf-8') as f:
-                # This contains one dict per test_function inside this test_file
-                test_file_report = json.load(f)
-        else:
-            test_file_report = []
-
-        for test_function in test_file_report:
-            execution_data['total_tests'] += 1
-
-            if finalize:
-                if test_function['result'] == ResultsEnum.PENDING:
-                    test_function['result'] = ResultsEnum.NOT_RUN
+        # This contains one dict per test_function inside this test_file
+        test_file_report = test_report.read_test_file_report(test_path) or []
 
-            _status_total = execution_data['totals_by_result'].get(test_function['result'], 0) + 1
-            execution_data['totals_by_result'][test_function['result']] = _status_total
-            execution_data['tests'].append(test_function)
+        _add_tests_to_execution_data(execution_data, test_file_report, finalize)
     return execution_data
 
 
@@ -87,11 +92,19 @@ def get_execution_data(execution_directory=None, project=None, execution=None,
 
 
 def generate_execution_report(execution_directory, elapsed_time, browsers, processes,
-                              environments, tags, remote_url):
+                              environments, tags, remote_url, tests=None):
     """Generate execution json report.
     This is called at the end of the execution
+
+    `tests` is the list of test function reports collected during
+    the execution. When it is None the reports are read from
+    the execution directory.
     """
-    data = _parse_execution_data(execution_directory=execution_directory, finalize=True)
+    if tests is None:
+        data = _parse_execution_data(execution_directory=execution_directory, finalize=True)
+    else:
+        data = execution_report_default()
+        _add_tests_to_execution_data(data, tests, finalize=True)
     data['net_elapsed_time'] = elapsed_time
     data['params']['browsers'] = browsers
     remote_browser = any([b['capabilities'] for b in browsers])
@@ -105,9 +118,100 @@ def generate_execution_report(execution_directory, elapsed_time, browsers, proce
     report_path = os.path.join(execution_directory, 'report.json')
     with open(report_path, 'w', encoding='utf-8') as json_file:
         json.dump(data, json_file, indent=4, ensure_ascii=False)
+    try:
+        report_index.index_execution_directory(execution_directory, data)
+    except sqlite3.Error as e:
+        print(f'ERROR: could not add the execution to the reports index: {e}')
     return data
 
 
+def _merge_directory(source, target):
+    """Copy the files of a test file report directory.
+    The records of report.jsonl are appended to the existing ones.
+    """
+    for dirpath, _, filenames in os.walk(source):
+        target_dirpath = os.path.join(target, os.path.relpath(dirpath, source))
+        os.makedirs(target_dirpath, exist_ok=True)
+        for filename in filenames:
+            source_path = os.path.join(dirpath, filename)
+            target_path = os.path.join(target_dirpath, filename)
+            if filename == 'report.jsonl' and os.path.isfile(target_path):
+                with open(source_path, encoding='utf-8') as f:
+                    records = [line if line.endswith('\n') else line + '\n' for line in f]
+                with open(target_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(records))
+            else:
+                shutil.copy2(source_path, target_path)
+
+
+def _test_file_directories(execution_directory):
+    """The names of the test file report directories of an execution"""
+    if not os.path.isdir(execution_directory):
+        return []
+    return [entry.name for entry in os.scandir(execution_directory)
+            if entry.is_dir() and entry.name != screenshot_store.STORE_DIRNAME]
+
+
+def _check_merge_collisions(execution_directories, execution_directory):
+    """Raise a ValueError when the same test file report directory is
+    found in more than one execution, the merged report would overwrite
+    its screenshots and count its tests twice.
+    """
+    owners = {name: execution_directory
+              for name in _test_file_directories(execution_directory)}
+    for directory in execution_directories:
+        for name in _test_file_directories(directory):
+            if name in owners:
+                raise ValueError(f'the reports of test file {name} are found in '
+                                 f'{owners[name]} and {directory}')
+            owners[name] = directory
+
+
+def merge_executions(execution_directories, execution_directory):
+    """Merge the reports of several executions into a single execution,
+    e.g.: the shards of an execution run in different machines.
+
+    The test file reports and the screenshots of every execution are
+    copied to `execution_directory`. The report.json of the merged
+    execution is generated from the parameters of each execution:
+    the elapsed time is the longest one, as they run at the same time.
+    Returns the execution data.
+
+    The reports of a test file must come from a single execution,
+    a ValueError is raised before copying anything otherwise.
+    """
+    target = os.path.normpath(os.path.abspath(execution_directory))
+    execution_directories = [d for d in execution_directories
+                             if os.path.normpath(os.path.abspath(d)) != target]
+    _check_merge_collisions(execution_directories, execution_directory)
+    os.makedirs(execution_directory, exist_ok=True)
+    elapsed_time = 0
+    browsers = []
+    processes = 0
+    environments = []
+    tags = []
+    remote_url = ''
+    for directory in execution_directories:
+        report_path = os.path.join(directory, 'report.json')
+        if os.path.isfile(report_path):
+            with open(report_path, encoding='utf-8') as f:
+                data = json.load(f)
+            params = data['params']
+            elapsed_time = max(elapsed_time, data['net_elapsed_time'] or 0)
+            browsers.extend(b for b in params['browsers'] if b not in browsers)
+            processes += params['processes'] or 0
+            environments.extend(e for e in params['environments'] if e not in environments)
+            tags.extend(t for t in params['tags'] if t not in tags)
+            remote_url = remote_url or params['remote_url']
+        else:
+            print(f'WARNING: the execution in {directory} has not finished')
+        for entry in os.scandir(directory):
+            if entry.is_dir():
+                _merge_directory(entry.path, os.path.join(execution_directory, entry.name))
+    return generate_execution_report(execution_directory, elapsed_time, browsers,
+                                     processes or None, environments, tags, remote_url)
+
+
 def save_execution_json_report(report_data, reportdir, report_name='report'):
     """Save execution report data to the specified reportdir and report_name"""
     report_path = os.path.join(reportdir, f'{report_name}.json')
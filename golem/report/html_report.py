@@ -1,33 +1,29 @@
 import errno
+import json
 import os
+import shutil
+import threading
 
 from flask import render_template
 
 from golem.core import utils
 from golem import gui
 from golem.report import execution_report as exec_report
+from golem.report import screenshot_store, test_report
+from golem.report.report_data import ReportData
 
 
-def generate_html_report(project, execution, timestamp, destination_folder=None,
-                         report_name=None, no_images=False):
-    """Generate static HTML report.
-    Report is generated in <report_directory>/<report_name>
-    By default it's generated in <testdir>/projects/<project>/reports/<suite>/<timestamp>
-    Default name is 'report.html' and 'report-no-images.html'
-    """
-    execution_directory = exec_report.execution_report_path(project, execution, timestamp)
+# reports can be generated from many threads
+_create_app_lock = threading.Lock()
 
-    if destination_folder is None:
-        destination_folder = execution_directory
 
-    if not report_name:
-        if no_images:
-            report_name = 'report-no-images'
-        else:
-            report_name = 'report'
+def _create_app():
+    with _create_app_lock:
+        return gui.create_app()
 
-    formatted_date = utils.get_date_time_from_timestamp(timestamp)
-    app = gui.create_app()
+
+def _static_files(app):
+    """The css and js files included in the static HTML report"""
     static_folder = app.static_folder
     # css paths
     css_folder = os.path.join(static_folder, 'css')
@@ -54,25 +50,55 @@ def generate_html_report(project, execution, timestamp, destination_folder=None,
         'main': open(main_js, encoding='utf-8').read(),
         'report_execution': open(report_execution_js).read()
     }
+    return css, js
 
-    execution_data = exec_report.get_execution_data(execution_directory)
+
+def _test_id(test):
+    """testId is test_file + test + set_name"""
+    test_id = f"{test['test_file']}.{test['test']}"
+    if test['set_name']:
+        test_id = f"{test_id}.{test['set_name']}"
+    return test_id
+
+
+def generate_html_report(project, execution, timestamp, destination_folder=None,
+                         report_name=None, no_images=False, report_data=None):
+    """Generate static HTML report.
+    Report is generated in <report_directory>/<report_name>
+    By default it's generated in <testdir>/projects/<project>/reports/<suite>/<timestamp>
+    Default name is 'report.html' and 'report-no-images.html'
+    `report_data` is a ReportData shared with other reports.
+    """
+    execution_directory = exec_report.execution_report_path(project, execution, timestamp)
+
+    if destination_folder is None:
+        destination_folder = execution_directory
+
+    if not report_name:
+        if no_images:
+            report_name = 'report-no-images'
+        else:
+            report_name = 'report'
+
+    if report_data is None:
+        report_data = ReportData(project, execution, timestamp)
+
+    formatted_date = utils.get_date_time_from_timestamp(timestamp)
+    app = _create_app()
+    css, js = _static_files(app)
+
+    execution_data = report_data.execution_data
     detail_test_data = {}
     for test in execution_data['tests']:
-        test_detail = exec_report.function_test_execution_result(
-            project, execution, timestamp, test['test_file'], test['test'], test['set_name'],
-            no_screenshots=no_images, encode_screenshots=True
-        )
-        # testId is test_file + test + set_name
-        test_id = f"{test['test_file']}.{test['test']}"
-        if test['set_name']:
-            test_id = f"{test_id}.{test['set_name']}"
-        detail_test_data[test_id] = test_detail
+        test_detail = report_data.test_detail(test, no_screenshots=no_images,
+                                              encode_screenshots=True)
+        detail_test_data[_test_id(test)] = test_detail
     with app.app_context():
         html_string = render_template(
             'report/report_execution_static.html', project=project, execution=execution,
             timestamp=timestamp, execution_data=execution_data,
             detail_test_data=detail_test_data, formatted_date=formatted_date,
-            css=css, js=js, static=True
+            css=css, js=js, static=True, test_chunks=None
         )
     _, file_extension = os.path.splitext(report_name)
     if not file_extension:
@@ -115,3 +141,98 @@ def get_or_generate_html_report(project, execution, timestamp, no_images=False):
                                            report_name=report_filename,
                                            no_images=no_images)
     return html_string
+
+
+def generate_html_report_directory(project, execution, timestamp, destination_folder=None,
+                                   report_name=None, no_images=False, report_data=None):
+    """Generate a static HTML report as a directory.
+
+    The directory contains an index.html file with the list of tests
+    and an assets folder with the screenshots and the detail of each
+    test (assets/tests/<n>.js). The detail of a test is loaded when its
+    row is expanded, it is a script instead of JSON so the report can
+    be opened from the file system.
+    The report is written one test at a time.
+
+    Report is generated in <destination_folder>/<report_name>/
+    By default it's generated in <testdir>/projects/<project>/reports/<suite>/<timestamp>
+    Default name is 'report' and 'report-no-images'
+    `report_data` is a ReportData shared with other reports.
+    Returns the path of the report directory.
+    """
+    execution_directory = exec_report.execution_report_path(project, execution, timestamp)
+
+    if destination_folder is None:
+        destination_folder = execution_directory
+
+    if not report_name:
+        if no_images:
+            report_name = 'report-no-images'
+        else:
+            report_name = 'report'
+
+    report_directory = os.path.join(destination_folder, report_name)
+    tests_directory = os.path.join(report_directory, 'assets', 'tests')
+    images_directory = os.path.join(report_directory, 'assets', 'images')
+    try:
+        os.makedirs(tests_directory, exist_ok=True)
+        os.makedirs(images_directory, exist_ok=True)
+    except OSError:
+        print(f'ERROR: cannot create report directory {report_directory}')
+        return None
+
+    if report_data is None:
+        report_data = ReportData(project, execution, timestamp)
+
+    # the detail of each test is loaded from its chunk
+    execution_data = dict(report_data.execution_data)
+    execution_data['tests'] = [dict(test, steps=[]) for test in execution_data['tests']]
+    test_chunks = {}
+    for index, test in enumerate(report_data.execution_data['tests']):
+        test_detail = report_data.test_detail(test, no_screenshots=no_images)
+        for step in test_detail['steps']:
+            if step['screenshot']:
+                step['screenshot'] = _copy_screenshot(project, execution, timestamp, test,
+                                                      step['screenshot'], index,
+                                                      images_directory)
+        test_id = _test_id(test)
+        chunk_filename = f'{index}.js'
+        with open(os.path.join(tests_directory, chunk_filename), 'w', encoding='utf-8') as f:
+            f.write(f'DetailTable.testChunkLoaded({json.dumps(test_id)}, ')
+            json.dump(test_detail, f)
+            f.write(');\n')
+        test_chunks[test_id] = f'assets/tests/{chunk_filename}'
+
+    formatted_date = utils.get_date_time_from_timestamp(timestamp)
+    app = _create_app()
+    css, js = _static_files(app)
+    with app.app_context():
+        template = app.jinja_env.get_template('report/report_execution_static.html')
+        context = dict(project=project, execution=execution, timestamp=timestamp,
+                       execution_data=execution_data, detail_test_data={},
+                       formatted_date=formatted_date, css=css, js=js, static=True,
+                       test_chunks=test_chunks)
+        template.stream(context).dump(os.path.join(report_directory, 'index.html'),
+                                      encoding='utf-8')
+    return report_directory
+
+
+def _copy_screenshot(project, execution, timestamp, test, screenshot, test_index,
+                     images_directory):
+    """Copy a screenshot to the images folder of a report directory.
+    Returns the path of the copy relative to the report directory.
+    """
+    source = test_report.screenshot_path(project, execution, timestamp, test['test_file'],
+                                         test['test'], test['set_name'], screenshot)
+    if screenshot_store.is_reference(screenshot):
+        # stored screenshots are copied once
+        filename = screenshot
+    else:
+        filename = f'{test_index}-{screenshot}'
+    destination = os.path.join(images_directory, filename)
+    if not os.path.isfile(destination):
+        try:
+            shutil.copyfile(source, destination)
+        except OSError:
+            print(f'ERROR: could not copy screenshot {source}')
+    return f'assets/images/{filename}'
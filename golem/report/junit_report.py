@@ -2,24 +2,75 @@ import errno
 import os
 import re
 import sys
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from xml.sax.saxutils import XMLGenerator
 
+from golem.core import session
 from golem.test_runner.conf import ResultsEnum as Results
-from golem.report.execution_report import get_execution_data
 from golem.report.execution_report import execution_report_path
-from golem.report.test_report import get_test_debug_log
+from golem.report.report_data import ReportData
+
+
+INDENT = ' ' * 4
 
 
 def generate_junit_report(project_name, execution, timestamp, report_folder=None,
-                          report_name=None):
+                          report_name=None, report_data=None):
     """Generate a report in JUnit XML format.
 
     Output conforms to https://github.com/jenkinsci/xunit-plugin/blob/master/
     src/main/resources/org/jenkinsci/plugins/xunit/types/model/xsd/junit-10.xsd
+
+    `report_data` is a ReportData shared with other reports.
+    Returns the XML string.
     """
-    data = get_execution_data(project=project_name, execution=execution, timestamp=timestamp)
+    report_path = write_junit_report(project_name, execution, timestamp, report_folder,
+                                     report_name, report_data)
+    if report_path is None:
+        return None
+    with open(report_path, encoding='utf-8') as f:
+        return f.read()
+
+
+def write_junit_report(project_name, execution, timestamp, report_folder=None,
+                       report_name=None, report_data=None, log_lines=None):
+    """Write a report in JUnit XML format, see generate_junit_report.
+
+    The report is written one testcase at a time, the debug log of
+    each test file is read once.
+    `log_lines` is the amount of lines of the debug log of each test
+    added to the report (the last lines), 0 to add no log.
+    By default it uses the *junit_log_lines* setting value, when it
+    is None the full log is added.
+    Returns the path of the report or None if it could not be written.
+    """
+    if report_data is None:
+        report_data = ReportData(project_name, execution, timestamp)
+    if log_lines is None and session.settings:
+        log_lines = session.settings.get('junit_log_lines')
+    data = report_data.execution_data
+
+    if not report_folder:
+        report_folder = execution_report_path(project_name, execution, timestamp)
+    if not report_name:
+        report_name = 'report'
+    report_path = os.path.join(report_folder, report_name + '.xml')
+    if not os.path.exists(os.path.dirname(report_path)):
+        os.makedirs(os.path.dirname(report_path), exist_ok=True)
+
+    try:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            _write_testsuites(XMLGenerator(f, encoding='UTF-8', short_empty_elements=True),
+                              execution, timestamp, data, report_data, log_lines)
+    except IOError as e:
+        if e.errno == errno.EACCES:
+            print(f'ERROR: cannot write to {report_path}, PermissionError (Errno 13)')
+        else:
+            print(f'ERROR: There was an error writing to {report_path}')
+        return None
+    return report_path
 
+
+def _write_testsuites(xml, execution, timestamp, data, report_data, log_lines):
     totals = data['totals_by_result']
     errors = totals.get(Results.CODE_ERROR, 0)
     failures = totals.get(Results.FAILURE, 0) + totals.get(Results.ERROR, 0)
@@ -32,12 +83,17 @@ def generate_junit_report(project_name, execution, timestamp, report_folder=None
         'tests': str(data['total_tests']),
         'time': str(data['net_elapsed_time'])
     }
-    testsuites = ET.Element('testsuites', testsuites_attrs)
+    xml.startDocument()
+    xml.startElement('testsuites', testsuites_attrs)
 
-    testsuites_attrs['timestamp'] = timestamp
-    testsuites_attrs['skipped'] = str(skipped)
-    testsuite = ET.SubElement(testsuites, 'testsuite', testsuites_attrs)
+    testsuite_attrs = dict(testsuites_attrs)
+    testsuite_attrs['timestamp'] = timestamp
+    testsuite_attrs['skipped'] = str(skipped)
+    xml.ignorableWhitespace('\n' + INDENT)
+    xml.startElement('testsuite', testsuite_attrs)
 
+    # the debug log of the last test file
+    debug_log = (None, None)
     for test in data['tests']:
         class_name = test['test_file']
         if test['set_name']:
@@ -47,7 +103,8 @@ def generate_junit_report(project_name, execution, timestamp, report_folder=None
             'classname': class_name,
             'time': str(test['elapsed_time'])
         }
-        testcase = ET.SubElement(testsuite, 'testcase', test_attrs)
+        xml.ignorableWhitespace('\n' + INDENT * 2)
+        xml.startElement('testcase', test_attrs)
 
         # testcase nodes can contain 'failure', 'error', and 'skipped' sub-nodes
         # matching Golem 'error' and 'failure' to JUnit 'failure',
@@ -68,36 +125,32 @@ def generate_junit_report(project_name, execution, timestamp, report_folder=None
                 'type': test['result'],
                 'message': str(test['test_data'])
             }
-            error_message = ET.SubElement(testcase, error_type, error_data)
+            xml.ignorableWhitespace('\n' + INDENT * 3)
+            xml.startElement(error_type, error_data)
+            xml.endElement(error_type)
 
         # add debug log to /test/system-out node
-        log_lines = get_test_debug_log(project_name, execution, timestamp,
-                                       test['test_file'], test['set_name'])
-        log_string = '\n'.join(log_lines)
-        system_out = ET.SubElement(testcase, 'system-out')
-        system_out.text = _clean_illegal_xml_chars(log_string)
-
-    xmlstring = ET.tostring(testsuites)
-    doc = minidom.parseString(xmlstring).toprettyxml(indent=' ' * 4, encoding='UTF-8')
-
-    if not report_folder:
-        report_folder = execution_report_path(project_name, execution, timestamp)
-    if not report_name:
-        report_name = 'report'
-    report_path = os.path.join(report_folder, report_name + '.xml')
-    if not os.path.exists(os.path.dirname(report_path)):
-        os.makedirs(os.path.dirname(report_path), exist_ok=True)
-
-    try:
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(doc.decode('UTF-8'))
-    except IOError as e:
-        if e.errno == errno.EACCES:
-            print(f'ERROR: cannot write to {report_path}, PermissionError (Errno 13)')
-        else:
-            print(f'ERROR: There was an error writing to {report_path}')
-
-    return doc
+        if log_lines != 0:
+            test_file_key = (test['test_file'], test['set_name'])
+            if debug_log[0] != test_file_key:
+                debug_log = (test_file_key, report_data.debug_log(*test_file_key, cache=False))
+            lines = debug_log[1] or []
+            if log_lines:
+                lines = lines[-log_lines:]
+            xml.ignorableWhitespace('\n' + INDENT * 3)
+            xml.startElement('system-out', {})
+            xml.characters(_clean_illegal_xml_chars('\n'.join(lines)))
+            xml.endElement('system-out')
+
+        xml.ignorableWhitespace('\n' + INDENT * 2)
+        xml.endElement('testcase')
+
+    xml.ignorableWhitespace('\n' + INDENT)
+    xml.endElement('testsuite')
+    xml.ignorableWhitespace('\n')
+    xml.endElement('testsuites')
+    xml.ignorableWhitespace('\n')
+    xml.endDocument()
 
 
 def get_or_generate_junit_report(project, execution, timestamp):
@@ -122,33 +175,35 @@ def _clean_illegal_xml_chars(string_to_clean):
     see: http://stackoverflow.com/questions/1707890/fast-way-to-filter-illegal-xml-unicode-chars-in-python
     Taken from https://github.com/kyrus/python-junit-xml/blob/master/junit_xml/__init__.py
     """
-    illegal_unichrs = [
-        (0x00, 0x08),
-        (0x0B, 0x1F),
-        (0x7F, 0x84),
-        (0x86, 0x9F),
-        (0xD800, 0xDFFF),
-        (0xFDD0, 0xFDDF),
-        (0xFFFE, 0xFFFF),
-        (0x1FFFE, 0x1FFFF),
-        (0x2FFFE, 0x2FFFF),
-        (0x3FFFE, 0x3FFFF),
-        (0x4FFFE, 0x4FFFF),
-        (0x5FFFE, 0x5FFFF),
-        (0x6FFFE, 0x6FFFF),
-        (0x7FFFE, 0x7FFFF),
-        (0x8FFFE, 0x8FFFF),
-        (0x9FFFE, 0x9FFFF),
-        (0xAFFFE, 0xAFFFF),
-        (0xBFFFE, 0xBFFFF),
-        (0xCFFFE, 0xCFFFF),
-        (0xDFFFE, 0xDFFFF),
-        (0xEFFFE, 0xEFFFF),
-        (0xFFFFE, 0xFFFFF),
-        (0x10FFFE, 0x10FFFF),
-    ]
-
-    illegal_ranges = ["%s-%s" % (chr(low), chr(high)) for (low, high) in illegal_unichrs if low < sys.maxunicode]
-
-    illegal_xml_re = re.compile("[%s]" % "".join(illegal_ranges))
-    return illegal_xml_re.sub("", string_to_clean)
+    return _ILLEGAL_XML_RE.sub('', string_to_clean)
+
+
+_ILLEGAL_UNICHRS = [
+    (0x00, 0x08),
+    (0x0B, 0x1F),
+    (0x7F, 0x84),
+    (0x86, 0x9F),
+    (0xD800, 0xDFFF),
+    (0xFDD0, 0xFDDF),
+    (0xFFFE, 0xFFFF),
+    (0x1FFFE, 0x1FFFF),
+    (0x2FFFE, 0x2FFFF),
+    (0x3FFFE, 0x3FFFF),
+    (0x4FFFE, 0x4FFFF),
+    (0x5FFFE, 0x5FFFF),
+    (0x6FFFE, 0x6FFFF),
+    (0x7FFFE, 0x7FFFF),
+    (0x8FFFE, 0x8FFFF),
+    (0x9FFFE, 0x9FFFF),
+    (0xAFFFE, 0xAFFFF),
+    (0xBFFFE, 0xBFFFF),
+    (0xCFFFE, 0xCFFFF),
+    (0xDFFFE, 0xDFFFF),
+    (0xEFFFE, 0xEFFFF),
+    (0xFFFFE, 0xFFFFF),
+    (0x10FFFE, 0x10FFFF),
+]
+
+_ILLEGAL_XML_RE = re.compile('[%s]' % ''.join(['%s-%s' % (chr(low), chr(high))
+                                               for (low, high) in _ILLEGAL_UNICHRS
+                                               if low < sys.maxunicode]))
@@ -1,13 +1,32 @@
 import os
 import shutil
+import sqlite3
 from datetime import datetime, timedelta
 
 from golem.core import test_directory
 from golem.core.project import Project
+from golem.report import execution_report
+from golem.report import report_index
 from golem.report.execution_report import execution_report_path
 from golem.core import utils
 
 
+def _read_execution_timestamps(project):
+    """Get the timestamps of every execution of a project from the
+    reports index, or from the report directories when the index
+    cannot be used.
+    """
+    try:
+        return report_index.get_timestamps(project)
+    except sqlite3.Error:
+        pass
+    report_path = Project(project).report_directory_path
+    if not os.path.isdir(report_path):
+        return {}
+    return {e: next(os.walk(os.path.join(report_path, e)))[1]
+            for e in next(os.walk(report_path))[1]}
+
+
 def get_last_execution_timestamps(projects=None, execution=None, limit=None, last_days=None):
     """Get the last n execution timestamps from all the executions of
     a list of projects.
@@ -28,35 +47,64 @@ def get_last_execution_timestamps(projects=None, execution=None, limit=None, las
         projects = test_directory.get_projects()
     for project in projects:
         last_timestamps[project] = {}
-        report_path = Project(project).report_directory_path
+        timestamps_by_execution = _read_execution_timestamps(project)
         # if execution is not provided, select all executions
-        if execution and os.path.isdir(os.path.join(report_path, execution)):
-            executions = [execution]
-        else:
-            executions = next(os.walk(report_path))[1]
-        for e in executions:
-            exec_path = os.path.join(report_path, e)
-            timestamps = next(os.walk(exec_path))[1]
+        if execution and execution in timestamps_by_execution:
+            timestamps_by_execution = {execution: timestamps_by_execution[execution]}
+        for e, timestamps in timestamps_by_execution.items():
             timestamps = sorted(timestamps, reverse=True)
             if limit is not None:
                 limit = int(limit)
                 timestamps = timestamps[:limit]
             if start_timestamp is not None:
                 timestamps = [t for t in timestamps if t >= start_timestamp]
-            if len(timestamps):
-                last_timestamps[project][e] = timestamps
-            else:
-                last_timestamps[project][e] = []
+            last_timestamps[project][e] = timestamps
 
     return last_timestamps
 
 
+def get_execution_summaries(project, timestamps_by_execution):
+    """Get the summary of a list of executions of a project.
+
+    `timestamps_by_execution` is a dict of execution -> list of
+    timestamps, as returned by get_last_execution_timestamps.
+
+    Finished executions are read from the reports index. Finished
+    executions missing from the index are read from their report.json
+    and added to it. Executions that have not finished are parsed.
+
+    Returns a dict of (execution, timestamp) -> summary
+    """
+    try:
+        indexed = report_index.get_summaries(project)
+    except sqlite3.Error:
+        indexed = {}
+    summaries = {}
+    missing = []
+    for execution, timestamps in timestamps_by_execution.items():
+        for timestamp in timestamps:
+            summary = indexed.get((execution, timestamp))
+            if summary is None:
+                execution_data = execution_report.get_execution_data(
+                    project=project, execution=execution, timestamp=timestamp)
+                summary = report_index.summary(execution_data)
+                if execution_data['has_finished']:
+                    missing.append((execution, timestamp, execution_data))
+            summaries[(execution, timestamp)] = summary
+    try:
+        report_index.add_executions(project, missing)
+    except sqlite3.Error as e:
+        print(f'ERROR: could not update the reports index: {e}')
+    return summaries
+
+
 def delete_execution(project, execution):
     errors = []
     path = os.path.join(Project(project).report_directory_path, execution)
     if os.path.isdir(path):
         try:
             shutil.rmtree(path)
+            report_index.remove_execution(project, execution)
         except Exception as e:
             errors.append(repr(e))
     else:
@@ -70,6 +118,7 @@ def delete_execution_timestamp(project, execution, timestamp):
     if os.path.isdir(path):
         try:
             shutil.rmtree(path)
+            report_index.remove_execution(project, execution, timestamp)
         except Exception as e:
             errors.append(repr(e))
     else:
@@ -0,0 +1,84 @@
+"""The data of a finished execution shared by the report writers.
+
+Every report (JUnit, html, html-no-images, html-dir) reads the
+execution data, the logs of each test file and the screenshots.
+ReportData loads each of them once, when it is first needed, so
+the reports generated at the end of an execution can share it.
+The writers may use it from different threads.
+"""
+import base64
+import copy
+import threading
+
+from golem.report import execution_report
+from golem.report import test_report
+
+
+class ReportData:
+
+    def __init__(self, project, execution, timestamp, execution_data=None):
+        self.project = project
+        self.execution = execution
+        self.timestamp = timestamp
+        self._execution_data = execution_data
+        self._logs = {}
+        self._screenshots = {}
+        self._lock = threading.Lock()
+
+    @property
+    def execution_data(self):
+        with self._lock:
+            if self._execution_data is None:
+                self._execution_data = execution_report.get_execution_data(
+                    project=self.project, execution=self.execution, timestamp=self.timestamp)
+            return self._execution_data
+
+    def _get(self, cache, key, load, store=True):
+        # loaded outside the lock, a value may be loaded twice
+        # by two threads but both get the same result
+        if key in cache:
+            return cache[key]
+        value = load()
+        if store:
+            cache[key] = value
+        return value
+
+    def debug_log(self, test_file, set_name, cache=True):
+        """The debug log of a test file.
+        When `cache` is False the log is not kept in memory
+        """
+        return self._get(self._logs, (test_file, set_name, 'DEBUG'),
+                         lambda: test_report.get_test_debug_log(
+                             self.project, self.execution, self.timestamp, test_file, set_name),
+                         store=cache)
+
+    def info_log(self, test_file, set_name):
+        return self._get(self._logs, (test_file, set_name, 'INFO'),
+                         lambda: test_report.get_test_info_log(
+                             self.project, self.execution, self.timestamp, test_file, set_name))
+
+    def encoded_screenshot(self, test, screenshot):
+        """A screenshot of a test encoded as a base64 string"""
+        path = test_report.screenshot_path(self.project, self.execution, self.timestamp,
+                                           test['test_file'], test['test'], test['set_name'],
+                                           screenshot)
+
+        def load():
+            with open(path, 'rb') as f:
+                return base64.b64encode(f.read()).decode('utf-8')
+        return self._get(self._screenshots, path, load)
+
+    def test_detail(self, test, no_screenshots=False, encode_screenshots=False):
+        """The detail of a test of the execution, as returned by
+        execution_report.function_test_execution_result
+        """
+        test_detail = copy.deepcopy(test)
+        test_detail['has_finished'] = self.execution_data['has_finished']
+        test_detail['debug_log'] = self.debug_log(test['test_file'], test['set_name'])
+        test_detail['info_log'] = self.info_log(test['test_file'], test['set_name'])
+        for step in test_detail['steps']:
+            if no_screenshots:
+                step['screenshot'] = None
+            elif encode_screenshots and step['screenshot'] is not None:
+                step['screenshot'] = self.encoded_screenshot(test, step['screenshot'])
+        return test_detail
@@ -0,0 +1,258 @@
+"""An index of the finished executions of a project.
+
+The index is a SQLite database located in the reports folder
+of each project: <testdir>/projects/<project>/reports/index.db
+
+It holds one summary row per finished execution (totals by result,
+elapsed time and params), that way the report views do not need to
+load the full report.json of every execution.
+
+It also holds the timestamps of every execution directory, finished
+or not, so the report lists do not need to list every directory of
+the reports folder. The timestamps of an execution are read again
+from its directory when the modification time of the directory
+changes (a timestamp was added or removed).
+"""
+import json
+import os
+import sqlite3
+import time
+
+from golem.core.project import Project
+
+
+INDEX_FILENAME = 'index.db'
+
+_SUMMARY_KEYS = ['params', 'total_tests', 'totals_by_result', 'net_elapsed_time']
+
+# The modification time of a directory changed in the last seconds
+# is not stored, a timestamp directory could be added in the same
+# clock tick after it was read
+_RECENT_MTIME = 2
+
+
+def _connect(reports_path, filename=INDEX_FILENAME):
+    connection = sqlite3.connect(os.path.join(reports_path, filename), timeout=30)
+    connection.execute('CREATE TABLE IF NOT EXISTS executions ('
+                       'execution TEXT NOT NULL, '
+                       'timestamp TEXT NOT NULL, '
+                       'total_tests INTEGER, '
+                       'totals_by_result TEXT, '
+                       'net_elapsed_time REAL, '
+                       'params TEXT, '
+                       'PRIMARY KEY (execution, timestamp))')
+    connection.execute('CREATE TABLE IF NOT EXISTS directories ('
+                       'execution TEXT NOT NULL PRIMARY KEY, '
+                       'mtime REAL)')
+    connection.execute('CREATE TABLE IF NOT EXISTS timestamps ('
+                       'execution TEXT NOT NULL, '
+                       'timestamp TEXT NOT NULL, '
+                       'PRIMARY KEY (execution, timestamp))')
+    return connection
+
+
+def _row(execution, timestamp, execution_data):
+    return (execution, timestamp, execution_data['total_tests'],
+            json.dumps(execution_data['totals_by_result']),
+            execution_data['net_elapsed_time'], json.dumps(execution_data['params']))
+
+
+def _insert(reports_path, rows):
+    connection = _connect(reports_path)
+    try:
+        with connection:
+            connection.executemany('INSERT OR REPLACE INTO executions VALUES (?, ?, ?, ?, ?, ?)',
+                                   rows)
+    finally:
+        connection.close()
+
+
+def summary(execution_data):
+    """Get the summary of the execution data, without the tests"""
+    execution_summary = {key: execution_data[key] for key in _SUMMARY_KEYS}
+    execution_summary['has_finished'] = execution_data['has_finished']
+    return execution_summary
+
+
+def add_execution(project, execution, timestamp, execution_data):
+    """Add the summary of a finished execution to the index"""
+    reports_path = Project(project).report_directory_path
+    _insert(reports_path, [_row(execution, timestamp, execution_data)])
+
+
+def add_executions(project, executions):
+    """Add many finished executions to the index.
+    `executions` is a list of (execution, timestamp, execution_data) tuples.
+    """
+    if executions:
+        reports_path = Project(project).report_directory_path
+        _insert(reports_path, [_row(*e) for e in executions])
+
+
+def index_execution_directory(execution_directory, execution_data):
+    """Add a finished execution to the index of its project given
+    the execution directory:
+      <testdir>/projects/<project>/reports/<execution>/<timestamp>
+
+    Directories outside of a project reports folder are not indexed.
+    Returns True when the execution was indexed.
+    """
+    timestamp_path = os.path.normpath(os.path.abspath(execution_directory))
+    execution_path, timestamp = os.path.split(timestamp_path)
+    reports_path, execution = os.path.split(execution_path)
+    project_path, reports_dirname = os.path.split(reports_path)
+    projects_dirname = os.path.basename(os.path.dirname(project_path))
+    if reports_dirname != 'reports' or projects_dirname != 'projects':
+        return False
+    _insert(reports_path, [_row(execution, timestamp, execution_data)])
+    return True
+
+
+def remove_execution(project, execution, timestamp=None):
+    """Remove an execution from the index.
+    When timestamp is None every timestamp of the execution is removed.
+    """
+    reports_path = Project(project).report_directory_path
+    if not os.path.isfile(os.path.join(reports_path, INDEX_FILENAME)):
+        return
+    connection = _connect(reports_path)
+    try:
+        with connection:
+            if timestamp is None:
+                for table in ['directories', 'timestamps', 'executions']:
+                    connection.execute(f'DELETE FROM {table} WHERE execution = ?', (execution,))
+            else:
+                for table in ['timestamps', 'executions']:
+                    connection.execute(f'DELETE FROM {table} '
+                                       'WHERE execution = ? AND timestamp = ?',
+                                       (execution, timestamp))
+    finally:
+        connection.close()
+
+
+def _subdirectories(path):
+    return [entry for entry in os.scandir(path) if entry.is_dir()]
+
+
+def _sync_execution(connection, execution_path, execution, mtime):
+    """Read the timestamps of an execution directory again"""
+    on_disk = {entry.name for entry in _subdirectories(execution_path)}
+    indexed = {row[0] for row in connection.execute(
+        'SELECT timestamp FROM timestamps WHERE execution = ?', (execution,))}
+    connection.executemany('INSERT OR REPLACE INTO timestamps VALUES (?, ?)',
+                           [(execution, t) for t in on_disk - indexed])
+    connection.executemany('DELETE FROM timestamps WHERE execution = ? AND timestamp = ?',
+                           [(execution, t) for t in indexed - on_disk])
+    connection.executemany('DELETE FROM executions WHERE execution = ? AND timestamp = ?',
+                           [(execution, t) for t in indexed - on_disk])
+    if time.time() - mtime < _RECENT_MTIME:
+        mtime = None
+    connection.execute('INSERT OR REPLACE INTO directories VALUES (?, ?)', (execution, mtime))
+
+
+def get_timestamps(project):
+    """Get the timestamps of every execution directory of a project.
+    Only the execution directories that changed since the last call
+    are read.
+    Returns a dict of execution -> list of timestamps
+    """
+    reports_path = Project(project).report_directory_path
+    if not os.path.isdir(reports_path):
+        return {}
+    connection = _connect(reports_path)
+    try:
+        with connection:
+            synced = dict(connection.execute('SELECT execution, mtime FROM directories'))
+            on_disk = set()
+            for entry in _subdirectories(reports_path):
+                on_disk.add(entry.name)
+                mtime = entry.stat().st_mtime
+                if synced.get(entry.name) != mtime:
+                    _sync_execution(connection, entry.path, entry.name, mtime)
+            for execution in set(synced) - on_disk:
+                for table in ['directories', 'timestamps', 'executions']:
+                    connection.execute(f'DELETE FROM {table} WHERE execution = ?', (execution,))
+        timestamps = {execution: [] for execution in on_disk}
+        for execution, timestamp in connection.execute(
+                'SELECT execution, timestamp FROM timestamps'):
+            timestamps.setdefault(execution, []).append(timestamp)
+    finally:
+        connection.close()
+    return timestamps
+
+
+def get_summaries(project, execution=None):
+    """Get the summaries of the indexed executions of a project.
+    Returns a dict of (execution, timestamp) -> summary
+    """
+    reports_path = Project(project).report_directory_path
+    if not os.path.isfile(os.path.join(reports_path, INDEX_FILENAME)):
+        return {}
+    query = ('SELECT execution, timestamp, total_tests, totals_by_result, '
+             'net_elapsed_time, params FROM executions')
+    args = ()
+    if execution is not None:
+        query += ' WHERE execution = ?'
+        args = (execution,)
+    connection = _connect(reports_path)
+    try:
+        rows = connection.execute(query, args).fetchall()
+    finally:
+        connection.close()
+    summaries = {}
+    for execution_, timestamp, total_tests, totals_by_result, elapsed_time, params in rows:
+        summaries[(execution_, timestamp)] = {
+            'params': json.loads(params),
+            'total_tests': total_tests,
+            'totals_by_result': json.loads(totals_by_result),
+            'net_elapsed_time': elapsed_time,
+            'has_finished': True
+        }
+    return summaries
+
+
+def rebuild_index(project):
+    """Rebuild the index of a project from the report.json
+    of every finished execution.
+    The new index is built in a temporary file that replaces the
+    index when it is complete, readers never see a partial index.
+    Returns the number of indexed executions.
+    """
+    reports_path = Project(project).report_directory_path
+    if not os.path.isdir(reports_path):
+        return 0
+    rows = []
+    timestamps = []
+    for execution_entry in _subdirectories(reports_path):
+        execution = execution_entry.name
+        for timestamp_entry in _subdirectories(execution_entry.path):
+            timestamp = timestamp_entry.name
+            timestamps.append((execution, timestamp))
+            report_path = os.path.join(timestamp_entry.path, 'report.json')
+            if not os.path.isfile(report_path):
+                continue
+            try:
+                with open(report_path, encoding='utf-8') as f:
+                    execution_data = json.load(f)
+                rows.append(_row(execution, timestamp, execution_data))
+            except (ValueError, KeyError):
+                print(f'ERROR: could not read {report_path}')
+    temp_path = os.path.join(reports_path, f'{INDEX_FILENAME}.{os.getpid()}.tmp')
+    if os.path.isfile(temp_path):
+        os.remove(temp_path)
+    try:
+        connection = _connect(reports_path, os.path.basename(temp_path))
+        try:
+            with connection:
+                connection.executemany('INSERT OR REPLACE INTO executions '
+                                       'VALUES (?, ?, ?, ?, ?, ?)', rows)
+                connection.executemany('INSERT OR REPLACE INTO timestamps VALUES (?, ?)',
+                                       timestamps)
+        finally:
+            connection.close()
+        os.replace(temp_path, os.path.join(reports_path, INDEX_FILENAME))
+    except Exception:
+        if os.path.isfile(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(rows)
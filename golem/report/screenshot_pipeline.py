@@ -0,0 +1,125 @@
+"""Save screenshots in background threads.
+
+Decoding, resizing, encoding and writing a screenshot takes CPU time
+that does not need to block the test. The test takes the screenshot
+(the PNG bytes) and submits the rest to a thread pool of the current
+process. The amount of pending screenshots is bounded, when it is
+reached `submit` waits until one of them is saved.
+
+The pipeline is flushed before the report of a test function is
+generated and when the process exits. When a screenshot could not be
+saved the steps do not reference it.
+
+The callbacks of the submitted functions are called by `flush` in the
+thread of the test, once the steps that reference the screenshot are
+added.
+"""
+import os
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import util
+
+from golem import execution
+
+
+# Pending screenshots per worker thread
+PENDING_PER_THREAD = 4
+
+_executor = None
+_slots = None
+# (future, on_error, on_result) tuples
+_pending = []
+_lock = threading.Lock()
+_finalizer_registered = False
+
+
+def _get_executor(threads):
+    global _executor, _slots, _finalizer_registered
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=threads,
+                                       thread_name_prefix='golem-screenshot')
+        _slots = threading.BoundedSemaphore(threads * PENDING_PER_THREAD)
+        if not _finalizer_registered:
+            util.Finalize(None, shutdown, exitpriority=10)
+            _finalizer_registered = True
+    return _executor
+
+
+def _run(function, args, logger):
+    """Returns a (success, value returned by function) tuple"""
+    try:
+        return True, function(*args)
+    except Exception:
+        if logger:
+            logger.warning('There was an error while saving screenshot:\n' +
+                           traceback.format_exc())
+        return False, None
+    finally:
+        _slots.release()
+
+
+def submit(function, *args, on_error=None, on_result=None):
+    """Call function(*args) in the screenshot thread pool.
+    It is called immediately when the `screenshot_threads`
+    setting is 0.
+    `flush` calls `on_result` with the value returned by function,
+    or `on_error` when function raised an exception.
+    """
+    threads = execution.settings.get('screenshot_threads') if execution.settings else None
+    if not threads:
+        try:
+            value = function(*args)
+        except Exception:
+            if on_error:
+                on_error()
+            raise
+        if on_result:
+            future = Future()
+            future.set_result((True, value))
+            with _lock:
+                _pending.append((future, None, on_result))
+        return
+    executor = _get_executor(threads)
+    _slots.acquire()
+    future = executor.submit(_run, function, args, execution.logger)
+    with _lock:
+        _pending.append((future, on_error, on_result))
+
+
+def replace_in_steps(screenshot, replacement=None):
+    """Replace a screenshot in the steps, e.g.: remove a screenshot
+    that could not be saved
+    """
+    for step in execution.steps or []:
+        if step.get('screenshot') == screenshot:
+            step['screenshot'] = replacement
+
+
+def write_file(content, path):
+    """Write a file, readers never see it partially written"""
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+def flush():
+    """Wait until every submitted screenshot is saved"""
+    with _lock:
+        pending = list(_pending)
+        _pending.clear()
+    for future, on_error, on_result in pending:
+        success, value = future.result()
+        if not success and on_error:
+            on_error()
+        elif success and on_result:
+            on_result(value)
+
+
+def shutdown():
+    global _executor
+    flush()
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,142 @@
+"""Content-addressed store of the screenshots of an execution.
+
+Screenshots are saved once per execution in:
+  <execution_report_dir>/screenshots/<sha256>.<extension>
+
+The step stores the reference ('<sha256>.<extension>') instead of a
+filename inside the test function report folder. Identical
+screenshots, e.g. consecutive steps on a static page, are saved once.
+
+With the 'perceptual' `screenshot_dedup` setting a screenshot that
+looks like a previous screenshot of the execution (the distance of
+their perceptual hashes is not greater than the
+`screenshot_dedup_threshold` setting) references the previous one.
+Computing the perceptual hash requires Pillow. The screenshot has to
+be decoded and compared with every screenshot of the execution, this
+is done by the screenshot pipeline (see find_similar), not by the test.
+"""
+import hashlib
+import os
+import re
+import threading
+from io import BytesIO
+
+
+STORE_DIRNAME = 'screenshots'
+
+DEDUP_OPTIONS = ['exact', 'perceptual']
+
+_REFERENCE_PATTERN = re.compile(r'^[0-9a-f]{64}\.(png|jpg)$')
+
+# references already saved or submitted to be saved, by execution
+# directory: {reference: reference of the saved screenshot}, a
+# screenshot similar to a previous one references the previous one
+_stored = {}
+# (perceptual hash, reference) tuples by execution directory,
+# extension and options
+_perceptual_hashes = {}
+# find_similar is called by the threads of the screenshot pipeline
+_perceptual_lock = threading.Lock()
+# A process runs the tests of one execution at a time, the values of
+# the previous executions are discarded (e.g.: long-lived workers)
+
+
+def is_reference(screenshot):
+    """Is the screenshot value of a step a reference to the store.
+    Screenshots saved in the test function folder are named
+    '<message>_<id>.<extension>' and never match.
+    """
+    return bool(screenshot) and _REFERENCE_PATTERN.match(screenshot) is not None
+
+
+def store_dir(execution_reportdir):
+    return os.path.join(execution_reportdir, STORE_DIRNAME)
+
+
+def store_path(execution_reportdir, reference):
+    return os.path.join(store_dir(execution_reportdir), reference)
+
+
+def reference(png, extension, options=None):
+    """The reference of a screenshot, the hash of the screenshot
+    taken by the browser and the options used to modify it
+    """
+    content_hash = hashlib.sha256(png)
+    if options:
+        content_hash.update(repr(options).encode())
+    return f'{content_hash.hexdigest()}.{extension}'
+
+
+def _evict(execution_reportdir):
+    """Discard the values of every other execution directory"""
+    for other in list(_stored):
+        if other != execution_reportdir:
+            del _stored[other]
+    for key in list(_perceptual_hashes):
+        if key[0] != execution_reportdir:
+            del _perceptual_hashes[key]
+
+
+def discard(execution_reportdir, screenshot_reference):
+    """Remove a reference that could not be saved"""
+    _stored.get(execution_reportdir, {}).pop(screenshot_reference, None)
+    with _perceptual_lock:
+        for key, similar in _perceptual_hashes.items():
+            if key[0] == execution_reportdir:
+                similar[:] = [s for s in similar if s[1] != screenshot_reference]
+
+
+def perceptual_hash(png, size=8):
+    """Difference hash of an image, as an int of size*size bits"""
+    from PIL import Image
+
+    image = Image.open(BytesIO(png))
+    image.draft('L', (size * 4, size * 4))
+    pixels = list(image.convert('L').resize((size + 1, size), Image.BILINEAR).getdata())
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def add(execution_reportdir, png, extension, options=None):
+    """Get the reference of a screenshot in the store.
+    Returns a (reference, is_new) tuple, when is_new is True the
+    screenshot must be saved to store_path(execution_reportdir, reference).
+    """
+    os.makedirs(store_dir(execution_reportdir), exist_ok=True)
+    if execution_reportdir not in _stored:
+        _evict(execution_reportdir)
+    stored = _stored.setdefault(execution_reportdir, {})
+    screenshot_reference = reference(png, extension, options)
+    if screenshot_reference in stored:
+        return stored[screenshot_reference], False
+    stored[screenshot_reference] = screenshot_reference
+    if os.path.isfile(store_path(execution_reportdir, screenshot_reference)):
+        # saved by another process of the execution
+        return screenshot_reference, False
+    return screenshot_reference, True
+
+
+def find_similar(execution_reportdir, screenshot_reference, png, options=None, threshold=0):
+    """Find a stored screenshot that looks like a new screenshot.
+    Returns the reference of the similar screenshot, from then on
+    `screenshot_reference` refers to it. Returns None when there is
+    none, the new screenshot must be saved.
+    The screenshot is decoded and compared with every screenshot of
+    the execution, it is called by the screenshot pipeline.
+    """
+    phash = perceptual_hash(png)
+    extension = screenshot_reference.split('.')[-1]
+    key = (execution_reportdir, extension, repr(options))
+    with _perceptual_lock:
+        similar = _perceptual_hashes.setdefault(key, [])
+        for other_phash, other_reference in similar:
+            if bin(phash ^ other_phash).count('1') <= threshold:
+                _stored.get(execution_reportdir, {})[screenshot_reference] = other_reference
+                return other_reference
+        similar.append((phash, screenshot_reference))
+    return None
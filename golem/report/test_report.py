@@ -3,7 +3,7 @@ import json
 import os
 
 from golem.core import utils
-from golem.report import execution_report
+from golem.report import execution_report, screenshot_store
 from golem.test_runner.conf import ResultsEnum
 
 
@@ -26,14 +26,55 @@ def test_file_report_default():
     return default
 
 
+def append_test_file_report_records(reportdir, records):
+    """Append test function reports to the report.jsonl of a test file.
+
+    The test file report is an append-only log, one JSON record per
+    line. Each line is written with a single write call, a crash can
+    only leave the last line incomplete and readers ignore it.
+    """
+    path = os.path.join(reportdir, 'report.jsonl')
+    lines = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(lines)
+
+
+def read_test_file_report(reportdir):
+    """Read the report of a test file.
+
+    The records of report.jsonl are folded into a list with the
+    latest record of each test function, in order of appearance.
+    A `pending` record never replaces a previous record, pending
+    reports are written in the background and could be appended
+    after the test function finished.
+    Test file reports generated by previous versions (report.json)
+    are also supported.
+    Returns None when the report does not exist.
+    """
+    path = os.path.join(reportdir, 'report.jsonl')
+    if os.path.isfile(path):
+        tests = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # incomplete line
+                    continue
+                if record.get('result') == ResultsEnum.PENDING and record['test'] in tests:
+                    continue
+                tests[record['test']] = record
+        return list(tests.values())
+    legacy_path = os.path.join(reportdir, 'report.json')
+    if os.path.isfile(legacy_path):
+        with open(legacy_path, encoding='utf-8') as f:
+            return json.load(f)
+    return None
+
+
 def get_test_file_report_json(project, execution, timestamp, test_file, set_name=None):
     path = test_file_report_dir(test_file, project, execution, timestamp, set_name)
-    path = os.path.join(path, 'report.json')
-    if os.path.isfile(path):
-        with open(path, 'r', encoding='utf-8') as json_file:
-            return json.load(json_file)
-    else:
-        return None
+    return read_test_file_report(path)
 
 
 def get_test_function_report_json(project, execution, timestamp, test_file, test_function, set_name=None):
@@ -114,16 +155,22 @@ def screenshot_dir(project, execution, timestamp, test_file, test, set_name):
 
 
 def screenshot_path(project, execution, timestamp, test_file, test, set_name, screenshot_file):
+    """Path of the screenshot of a step.
+    `screenshot_file` is a filename in the test function report folder
+    or a reference to the screenshot store of the execution.
+    """
+    if screenshot_store.is_reference(screenshot_file):
+        execdir = execution_report.execution_report_path(project, execution, timestamp)
+        return screenshot_store.store_path(execdir, screenshot_file)
     path = screenshot_dir(project, execution, timestamp, test_file, test, set_name)
     return os.path.join(path, screenshot_file)
 
 
 def initialize_test_file_report(test_file, tests, set_name, reportdir, environment, browser_name):
     """Given a test file and a list of test functions initialize
-    test file json report with default values and result `pending`
+    test file json report with default values and result `pending`.
+    Returns the list of pending reports.
     """
-    json_report_path = os.path.join(reportdir, 'report.json')
-
     test_list = []
 
     for test in tests:
@@ -136,13 +183,14 @@ def initialize_test_file_report(test_file, tests, set_name, reportdir, environme
         report['browser'] = browser_name
         test_list.append(report)
 
-    with open(json_report_path, 'w', encoding='utf-8') as f:
-        json.dump(test_list, f, indent=4, ensure_ascii=False)
+    append_test_file_report_records(reportdir, test_list)
+    return test_list
 
 
 def generate_report(test_file_name, result, test_data, reportdir):
-    """Adds the report of a test function to a test_file report.json"""
-    json_report_path = os.path.join(reportdir, 'report.json')
+    """Adds the report of a test function to a test_file report.jsonl.
+    Returns the report of the test function.
+    """
     # short_error = ''
     # if result['error']:
     #     short_error = '\n'.join(result['error'].split('\n')[-2:])
@@ -188,20 +236,5 @@ def generate_report(test_file_name, result, test_data, reportdir):
     report['elapsed_time'] = result['test_elapsed_time']
     report['timestamp'] = result['test_timestamp']
 
-    if os.path.isfile(json_report_path):
-        with open(json_report_path, 'r', encoding='utf-8') as json_file:
-            report_data = json.load(json_file)
-    else:
-        report_data = []
-
-    index = None
-    for i, test in enumerate(report_data):
-        if test['test'] == result['name']:
-            index = i
-    if index is None:
-        report_data.append(report)
-    else:
-        report_data[index] = report
-
-    with open(json_report_path, 'w', encoding='utf-8') as json_file:
-        json.dump(report_data, json_file, indent=4, ensure_ascii=False)
+    append_test_file_report_records(reportdir, [report])
+    return report
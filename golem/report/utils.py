@@ -1,14 +1,18 @@
+import functools
 import os
 from io import BytesIO
 
 from golem import execution
 from golem.browser import get_browser
+from golem.report import screenshot_pipeline, screenshot_store
 
 
 def save_screenshot(reportdir, image_name, format='PNG', quality=None, width=None,
                     height=None, resize=None):
     """Modify screenshot format, size and quality before saving.
     Pillow must be installed.
+    The screenshot is taken immediately and saved by the screenshot
+    pipeline, the file may not exist yet when this returns.
 
     - format must be 'PNG' or 'JPEG'
     - quality must be an int in 1..95 range.
@@ -24,9 +28,91 @@ def save_screenshot(reportdir, image_name, format='PNG', quality=None, width=Non
                                  ' screenshot format, size or quality')
         return
 
-    extension = 'png'
-    resample_filter = Image.BOX  # for PNG
+    options = validate_screenshot_options(format, quality, width, height, resize)
+    base_png = get_browser().get_screenshot_as_png()
+    screenshot_filename = f'{image_name}.{_extension(format)}'
+    screenshot_path = os.path.join(reportdir, screenshot_filename)
+    # decode, resize and encode in the background
+    on_error = functools.partial(screenshot_pipeline.replace_in_steps, screenshot_filename)
+    screenshot_pipeline.submit(write_screenshot, base_png, screenshot_path, *options,
+                               on_error=on_error)
+    return screenshot_filename
+
+
+def store_screenshot(execution_reportdir, options=None, dedup='exact', threshold=0):
+    """Take a screenshot and add it to the screenshot store of the
+    execution. `options` is a dict with the format, quality, width,
+    height and resize keys, as in the `screenshots` setting.
+    See save_screenshot.
+    Returns the reference of the stored screenshot. With the
+    'perceptual' dedup the screenshot is compared with the stored ones
+    by the screenshot pipeline, when it looks like one of them
+    screenshot_pipeline.flush replaces the reference in the steps.
+    """
+    if options or dedup == 'perceptual':
+        try:
+            from PIL import Image
+        except ModuleNotFoundError:
+            execution.logger.warning('Pillow must be installed in order to modify'
+                                     ' screenshot format, size or quality')
+            return None
+    if options:
+        options = validate_screenshot_options(**options)
+        format = options[0]
+    else:
+        format = 'PNG'
+    base_png = get_browser().get_screenshot_as_png()
+    reference, is_new = screenshot_store.add(execution_reportdir, base_png, _extension(format),
+                                             options)
+    if is_new:
+        on_error = functools.partial(_stored_screenshot_not_saved, execution_reportdir,
+                                     reference)
+        if dedup == 'perceptual':
+            # decoding and comparing the screenshot is done in the background too
+            on_result = functools.partial(_use_similar_screenshot, reference)
+            screenshot_pipeline.submit(_save_unless_similar, execution_reportdir, reference,
+                                       base_png, options, threshold, on_error=on_error,
+                                       on_result=on_result)
+        else:
+            screenshot_pipeline.submit(_save_stored_screenshot, execution_reportdir, reference,
+                                       base_png, options, on_error=on_error)
+    return reference
+
+
+def _save_stored_screenshot(execution_reportdir, reference, png, options):
+    path = screenshot_store.store_path(execution_reportdir, reference)
+    if options:
+        write_screenshot(png, path, *options)
+    else:
+        screenshot_pipeline.write_file(png, path)
+
+
+def _save_unless_similar(execution_reportdir, reference, png, options, threshold):
+    """Save a screenshot unless it looks like a stored one.
+    Returns the reference of the similar screenshot.
+    """
+    similar = screenshot_store.find_similar(execution_reportdir, reference, png, options,
+                                            threshold)
+    if similar is None:
+        _save_stored_screenshot(execution_reportdir, reference, png, options)
+    return similar
+
 
+def _use_similar_screenshot(reference, similar):
+    if similar is not None:
+        screenshot_pipeline.replace_in_steps(reference, similar)
+
+
+def _stored_screenshot_not_saved(execution_reportdir, reference):
+    screenshot_store.discard(execution_reportdir, reference)
+    screenshot_pipeline.replace_in_steps(reference)
+
+
+def validate_screenshot_options(format='PNG', quality=None, width=None, height=None,
+                                resize=None):
+    """Validate the options of the `screenshots` setting.
+    Returns a (format, quality, width, height, resize) tuple
+    """
     # validate format
     if format not in ['JPEG', 'PNG']:
         raise ValueError("settings screenshots format should be 'jpg' or 'png'")
@@ -64,13 +150,25 @@ def save_screenshot(reportdir, image_name, format='PNG', quality=None, width=Non
             raise ValueError('settings screenshots resize should be int')
         if resize < 0:
             raise ValueError('settings screenshots resize should be greater than 0')
+    return format, quality, width, height, resize
+
+
+def _extension(format):
+    return 'jpg' if format == 'JPEG' else 'png'
 
-    base_png = get_browser().get_screenshot_as_png()
-    pil_image = Image.open(BytesIO(base_png))
+
+def write_screenshot(png, screenshot_path, format='PNG', quality=None, width=None,
+                     height=None, resize=None):
+    """Decode a PNG screenshot, modify its format and size and save it.
+    The arguments must be already validated by save_screenshot.
+    """
+    from PIL import Image
+
+    resample_filter = Image.BOX  # for PNG
+    pil_image = Image.open(BytesIO(png))
 
     if format == 'JPEG':
         pil_image = pil_image.convert('RGB')
-        extension = 'jpg'
         resample_filter = Image.BICUBIC
 
     if any([width, height, resize]):
@@ -91,15 +189,13 @@ def save_screenshot(reportdir, image_name, format='PNG', quality=None, width=Non
             new_height = round(pil_image.size[1] * resize / 100)
         pil_image = pil_image.resize((new_width, new_height), resample=resample_filter)
 
-    screenshot_filename = f'{image_name}.{extension}'
-    screenshot_path = os.path.join(reportdir, screenshot_filename)
+    output = BytesIO()
     if format == 'PNG':
-        pil_image.save(screenshot_path, format=format, optimize=True)
+        pil_image.save(output, format=format, optimize=True)
     elif format == 'JPEG':
         if quality is None:
-            pil_image.save(screenshot_path, format=format, optimize=True)
+            pil_image.save(output, format=format, optimize=True)
         else:
-            pil_image.save(screenshot_path, format=format, optimize=True,
+            pil_image.save(output, format=format, optimize=True,
                            quality=quality)
-
-    return screenshot_filename
+    screenshot_pipeline.write_file(output.getvalue(), screenshot_path)
@@ -6,12 +6,14 @@ import traceback
 
 from golem.core import session
 from golem.core import utils
+from golem.core import test_data as test_data_module
 from golem.core.test import Test
 from golem.core.project import Project
 from golem.test_runner.test_runner_utils import import_page_into_test
 from golem.test_runner import test_logger
 from golem.test_runner.conf import ResultsEnum
-from golem import actions, execution
+from golem import actions, browser, execution
+from golem.report import screenshot_pipeline
 from golem.report import test_report
 
 
@@ -37,12 +39,12 @@ class Secrets(dict):
 
 def run_test(testdir, project, test_name, test_data, secrets, browser, env_name,
              settings, exec_report_dir, set_name, test_functions=None,
-             execution_has_failed_tests=None, tags=None, from_suite=False):
+             execution_totals=None, tags=None, from_suite=False, execution_results=None):
     """Run a single test"""
     session.testdir = testdir
     runner = TestRunner(testdir, project, test_name, test_data, secrets, browser, env_name,
-                        settings, exec_report_dir, set_name, test_functions, execution_has_failed_tests,
-                        tags, from_suite)
+                        settings, exec_report_dir, set_name, test_functions, execution_totals,
+                        tags, from_suite, execution_results)
     runner.prepare()
 
 
@@ -52,10 +54,12 @@ class TestRunner:
 
     def __init__(self, testdir, project, test_name, test_data, secrets, browser, env_name,
                  settings, exec_report_dir, set_name, test_functions_to_run=None,
-                 execution_has_failed_tests=None, tags=None, from_suite=False):
+                 execution_totals=None, tags=None, from_suite=False,
+                 execution_results=None):
         self.testdir = testdir
         self.project = Project(project)
         self.test = Test(project, test_name)
+        # a dict or a reference to a data set, read in prepare
         self.test_data = test_data
         self.secrets = secrets
         self.browser = browser
@@ -72,7 +76,10 @@ class TestRunner:
             'after_each': [],
             'after_test': []
         }
-        self.execution_has_failed_tests = execution_has_failed_tests
+        self.execution_totals = execution_totals
+        # queue where the report of each test function is sent
+        # to the process that runs the execution
+        self.execution_results = execution_results
         self.execution_tags = tags or []
         self.from_suite = from_suite
         self.global_skip = False
@@ -86,6 +93,8 @@ class TestRunner:
         self.logger = None
 
     def prepare(self):
+        if isinstance(self.test_data, test_data_module.DataSet):
+            self.test_data = self.test_data.load()
         # Create report directory for the test file
         self.reportdir = test_report.create_test_file_report_dir(
             self.exec_report_dir, self.test.name, self.set_name)
@@ -300,13 +309,12 @@ class TestRunner:
         result['test_timestamp'] = self.test_timestamp
         result['browser'] = execution.browser_definition['name']
         result['browser_capabilities'] = execution.browser_definition['capabilities']
-        # Report a test has failed in the test execution,
-        # this will later determine the exit status
-        _error_codes = [ResultsEnum.CODE_ERROR, ResultsEnum.ERROR, ResultsEnum.FAILURE]
-        if self.execution_has_failed_tests is not None and result['result'] in _error_codes:
-            self.execution_has_failed_tests.value = True
+        # Add the result to the execution totals, a failed test
+        # will later determine the exit status
+        if self.execution_totals is not None:
+            self.execution_totals.add_result(result['result'])
 
-        test_report.generate_report(self.test.name, result, execution.data, self.reportdir)
+        self._generate_report(result)
 
         self._reset_execution_module_values_for_test_function()
 
@@ -334,10 +342,14 @@ class TestRunner:
                 self.generate_report_for_hook_function(hook_name, result)
 
         # if there is no teardown or teardown failed or it did not close the driver,
-        # let's try to close the driver manually
-        if execution.browser:
+        # let's try to close the driver manually.
+        # When reuse_browser is true the drivers are kept for the next test
+        if execution.browser and self.settings.get('reuse_browser'):
+            browser.park_browsers()
+            execution.browser = None
+        elif execution.browser:
             try:
-                for browser, driver in execution.browsers.items():
+                for browser_id, driver in execution.browsers.items():
                     driver.quit()
             except:
                 # if this fails, we have lost control over the webdriver window
@@ -359,8 +371,7 @@ class TestRunner:
             result['result'] = self.result
             result['test_timestamp'] = self.test_timestamp
             result['errors'] = execution.errors
-            test_report.generate_report(self.test.name, result, execution.data,
-                                        self.reportdir)
+            self._generate_report(result)
 
         test_logger.reset_logger(execution.logger)
 
@@ -389,7 +400,15 @@ class TestRunner:
         result_dict['errors'] = execution.errors
         result_dict['steps'] = execution.steps
         result_dict['browser'] = execution.browser_definition['name']
-        test_report.generate_report(self.test.name, result_dict, execution.data, self.reportdir)
+        self._generate_report(result_dict)
+
+    def _generate_report(self, result):
+        # the screenshots of the steps must be saved before the report
+        screenshot_pipeline.flush()
+        report = test_report.generate_report(self.test.name, result, execution.data,
+                                             self.reportdir)
+        if self.execution_results is not None:
+            self.execution_results.put(dict(report))
 
     def _set_execution_module_values(self):
         execution.test_file = self.test.name
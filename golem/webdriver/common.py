@@ -1,4 +1,5 @@
 import time
+import types
 
 from selenium.webdriver.remote.webelement import WebElement
 
@@ -9,53 +10,259 @@ from golem.core.exceptions import (IncorrectSelectorType,
 # from golem.webdriver.extended_webelement import extend_webelement, ExtendedWebElement
 
 
+ELEMENT_LOOKUP_STRATEGIES = ['poll', 'implicit_wait', 'mutation_observer']
+
+# Wait time between attempts of the `poll` strategy, it doubles
+# after each attempt up to POLL_MAX_INTERVAL
+POLL_MIN_INTERVAL = 0.05
+POLL_MAX_INTERVAL = 0.5
+
+# Default driver timeouts, in seconds
+DEFAULT_IMPLICIT_WAIT = 0
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+# Defines findElement(root, selectorType, selectorValue), it returns
+# the first element that matches the selector or null
+FIND_ELEMENT_JS = """
+function findElement(root, selectorType, selectorValue) {
+  var doc = root.ownerDocument || root;
+  function byLinkText(matches) {
+    var links = root.getElementsByTagName('a');
+    for (var i = 0; i < links.length; i++) {
+      if (matches(links[i].innerText.trim())) { return links[i]; }
+    }
+    return null;
+  }
+  switch (selectorType) {
+    case 'id':
+      return root.querySelector('[id="' + CSS.escape(selectorValue) + '"]');
+    case 'css':
+      return root.querySelector(selectorValue);
+    case 'name':
+      return root.querySelector('[name="' + CSS.escape(selectorValue) + '"]');
+    case 'tag_name':
+      return root.getElementsByTagName(selectorValue)[0] || null;
+    case 'xpath':
+      return doc.evaluate(selectorValue, root, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    case 'link_text':
+      return byLinkText(function(text) { return text === selectorValue; });
+    case 'partial_link_text':
+      return byLinkText(function(text) { return text.indexOf(selectorValue) !== -1; });
+  }
+  throw new Error('Selector ' + selectorType + ' is not a valid option');
+}
+"""
+
+# Resolves true as soon as an element matching the selector exists
+# or false when the timeout is reached
+WAIT_FOR_ELEMENT_SCRIPT = FIND_ELEMENT_JS + """
+var root = arguments[0] || document;
+var selectorType = arguments[1];
+var selectorValue = arguments[2];
+var timeout = arguments[3];
+var callback = arguments[arguments.length - 1];
+function exists() {
+  return findElement(root, selectorType, selectorValue) !== null;
+}
+var done = false;
+function finish(result) {
+  if (!done) {
+    done = true;
+    observer.disconnect();
+    callback(result);
+  }
+}
+var observer = new MutationObserver(function() {
+  if (exists()) { finish(true); }
+});
+try {
+  if (exists()) { callback(true); return; }
+} catch (e) { callback(false); return; }
+observer.observe(document, {childList: true, subtree: true, attributes: true,
+                            characterData: true});
+setTimeout(function() { finish(false); }, timeout);
+"""
+
+# Returns [element, displayed, enabled] for each [selectorType, selectorValue]
+# An element is displayed when it has a size and it is not hidden by CSS
+FIND_MANY_SCRIPT = FIND_ELEMENT_JS + """
+var root = arguments[0] || document;
+return arguments[1].map(function(selector) {
+  var element = null;
+  try {
+    element = findElement(root, selector[0], selector[1]);
+  } catch (e) {}
+  if (element === null) { return [null, false, false]; }
+  var style = window.getComputedStyle(element);
+  var rect = element.getBoundingClientRect();
+  var displayed = style.visibility !== 'hidden' && style.display !== 'none' &&
+                  rect.width > 0 && rect.height > 0;
+  return [element, displayed, !element.disabled];
+});
+"""
+
+
+def _find_by_selector(root, selector_type, selector_value):
+    if selector_type == 'id':
+        return root.find_element_by_id(selector_value)
+    elif selector_type == 'css':
+        return root.find_element_by_css_selector(selector_value)
+    elif selector_type == 'link_text':
+        return root.find_element_by_link_text(selector_value)
+    elif selector_type == 'partial_link_text':
+        return root.find_element_by_partial_link_text(selector_value)
+    elif selector_type == 'name':
+        return root.find_element_by_name(selector_value)
+    elif selector_type == 'xpath':
+        return root.find_element_by_xpath(selector_value)
+    elif selector_type == 'tag_name':
+        return root.find_element_by_tag_name(selector_value)
+    else:
+        msg = f'Selector {selector_type} is not a valid option'
+        raise IncorrectSelectorType(msg)
+
+
+def _try_find(root, selector_type, selector_value):
+    """Find a web element, return None when it is not found"""
+    try:
+        return _find_by_selector(root, selector_type, selector_value)
+    except IncorrectSelectorType:
+        raise
+    except Exception:
+        return None
+
+
+def _root_driver(root):
+    """The driver of root, root can be a driver or a web element"""
+    if isinstance(root, WebElement):
+        return root.parent
+    return root
+
+
+def _poll(condition, remaining_time):
+    """Call `condition` until it returns a truthy value or there
+    is no remaining time. The wait time between calls starts
+    at POLL_MIN_INTERVAL and doubles up to POLL_MAX_INTERVAL.
+    """
+    interval = POLL_MIN_INTERVAL
+    result = condition()
+    while not result and remaining_time() > 0:
+        time.sleep(min(interval, max(remaining_time(), 0)))
+        interval = min(interval * 2, POLL_MAX_INTERVAL)
+        result = condition()
+    return result
+
+
+def _get_implicit_wait(driver):
+    """The implicit wait of the driver.
+    Selenium 3 has no getter for it, the value set by golem is used.
+    """
+    if hasattr(driver, 'timeouts'):
+        return driver.timeouts.implicit_wait
+    return getattr(driver, '_golem_implicit_wait', DEFAULT_IMPLICIT_WAIT)
+
+
+def _set_implicit_wait(driver, seconds):
+    driver.implicitly_wait(seconds)
+    driver._golem_implicit_wait = seconds
+
+
+def _get_script_timeout(driver):
+    """The script timeout of the driver.
+    Selenium 3 has no getter for it, the value set by golem is used.
+    """
+    if hasattr(driver, 'timeouts'):
+        return driver.timeouts.script
+    return getattr(driver, '_golem_script_timeout', DEFAULT_SCRIPT_TIMEOUT)
+
+
+def _set_script_timeout(driver, seconds):
+    driver.set_script_timeout(seconds)
+    driver._golem_script_timeout = seconds
+
+
+def _wait_with_implicit_wait(root, selector_type, selector_value, remaining_time):
+    """Let the driver wait for the element using an implicit wait"""
+    driver = _root_driver(root)
+    previous_implicit_wait = _get_implicit_wait(driver)
+    _set_implicit_wait(driver, max(remaining_time(), 0))
+    try:
+        return _try_find(root, selector_type, selector_value)
+    finally:
+        _set_implicit_wait(driver, previous_implicit_wait)
+
+
+def _wait_with_mutation_observer(root, selector_type, selector_value, remaining_time):
+    """Wait in the browser for the element to be added to the DOM"""
+    driver = _root_driver(root)
+    timeout = max(remaining_time(), 0)
+    previous_script_timeout = _get_script_timeout(driver)
+    if timeout + 5 > previous_script_timeout:
+        _set_script_timeout(driver, timeout + 5)
+    js_root = root if isinstance(root, WebElement) else None
+    try:
+        found = driver.execute_async_script(WAIT_FOR_ELEMENT_SCRIPT, js_root, selector_type,
+                                            selector_value, int(timeout * 1000))
+    except Exception as e:
+        execution.logger.debug(f'Could not wait for element in the browser: {e}')
+        return _poll(lambda: _try_find(root, selector_type, selector_value), remaining_time)
+    finally:
+        if _get_script_timeout(driver) != previous_script_timeout:
+            _set_script_timeout(driver, previous_script_timeout)
+    if found:
+        return _try_find(root, selector_type, selector_value)
+    return None
+
+
+def _record_lookup_time(lookup_time):
+    """Add the element lookup time to the last step"""
+    if execution.steps:
+        last_step = execution.steps[-1]
+        last_step['lookup_time'] = round(last_step.get('lookup_time', 0) + lookup_time, 4)
+
+
 def _find_webelement(root, selector_type, selector_value, element_name,
                      timeout=0, wait_displayed=False, highlight=False):
-    """Finds a web element."""
-    webelement = None
+    """Finds a web element.
+
+    When the element is not present it waits up to `timeout` seconds
+    using the `element_lookup_strategy` setting:
+      poll:              find again with an increasing wait time
+      implicit_wait:     the driver waits for the element
+      mutation_observer: the browser notifies when the element is added
+    """
+    strategy = execution.settings.get('element_lookup_strategy') or 'poll'
+    if strategy not in ELEMENT_LOOKUP_STRATEGIES:
+        raise ValueError(f'Invalid element_lookup_strategy setting: {strategy}, '
+                         f'options are: {", ".join(ELEMENT_LOOKUP_STRATEGIES)}')
     remaining_time = lambda: timeout - (time.time() - start_time)
     start_time = time.time()
-    while webelement is None:
-        try:
-            if selector_type == 'id':
-                webelement = root.find_element_by_id(selector_value)
-            elif selector_type == 'css':
-                webelement = root.find_element_by_css_selector(selector_value)
-            elif selector_type == 'link_text':
-                webelement = root.find_element_by_link_text(selector_value)
-            elif selector_type == 'partial_link_text':
-                webelement = root.find_element_by_partial_link_text(selector_value)
-            elif selector_type == 'name':
-                webelement = root.find_element_by_name(selector_value)
-            elif selector_type == 'xpath':
-                webelement = root.find_element_by_xpath(selector_value)
-            elif selector_type == 'tag_name':
-                webelement = root.find_element_by_tag_name(selector_value)
-            else:
-                msg = f'Selector {selector_type} is not a valid option'
-                raise IncorrectSelectorType(msg)
-            execution.logger.debug('Element found')
-        except:
-            if remaining_time() <= 0:
-                break
-            else:
-                time.sleep(0.5)
-                execution.logger.debug('Element not found yet, remaining time: {:.2f}'
-                                       .format(remaining_time()))
+    webelement = _try_find(root, selector_type, selector_value)
+    if webelement is None and remaining_time() > 0:
+        execution.logger.debug(f'Element not found yet, waiting using {strategy} strategy')
+        if strategy == 'implicit_wait':
+            webelement = _wait_with_implicit_wait(root, selector_type, selector_value,
+                                                  remaining_time)
+        elif strategy == 'mutation_observer':
+            webelement = _wait_with_mutation_observer(root, selector_type, selector_value,
+                                                      remaining_time)
+        else:
+            webelement = _poll(lambda: _try_find(root, selector_type, selector_value),
+                               remaining_time)
     if webelement is None:
+        _record_lookup_time(time.time() - start_time)
         raise ElementNotFound(f'Element {element_name} not found using selector '
                               f'{selector_type}:\'{selector_value}\'')
-    else:
-        if wait_displayed:
-            while not webelement.is_displayed() and remaining_time() > 0:
-                execution.logger.debug('Element still not visible, waiting')
-                time.sleep(0.5)
-
-            if not webelement.is_displayed():
-                msg = (f'Timeout waiting for element {element_name} to be displayed, '
-                       f'using selector {selector_type}:\'{selector_value}\'')
-                raise ElementNotDisplayed(msg)
-        return webelement
+    execution.logger.debug('Element found')
+    if wait_displayed:
+        if not _poll(webelement.is_displayed, remaining_time):
+            _record_lookup_time(time.time() - start_time)
+            msg = (f'Timeout waiting for element {element_name} to be displayed, '
+                   f'using selector {selector_type}:\'{selector_value}\'')
+            raise ElementNotDisplayed(msg)
+    _record_lookup_time(time.time() - start_time)
+    return webelement
 
 
 def _find(self, element=None, id=None, name=None, link_text=None, partial_link_text=None,
@@ -88,19 +295,8 @@ def _find(self, element=None, id=None, name=None, link_text=None, partial_link_t
 
     if isinstance(element, WebElement) or isinstance(element, ExtendedWebElement):
         webelement = element
-    elif isinstance(element, tuple):
-        selector_type = element[0]
-        selector_value = element[1]
-        element_name = element[2] if len(element) == 3 else element[1]
-    elif isinstance(element, str):
-        if _str_is_xpath_selector(element):
-            selector_type = 'xpath'
-            selector_value = element
-            element_name = element
-        else:
-            selector_type = 'css'
-            selector_value = element
-            element_name = element
+    elif isinstance(element, (tuple, str)):
+        selector_type, selector_value, element_name = _parse_selector(element)
     elif id:
         selector_type = 'id'
         selector_value = element_name = id
@@ -140,6 +336,97 @@ def _find(self, element=None, id=None, name=None, link_text=None, partial_link_t
     return webelement
 
 
+def _parse_selector(element):
+    """Get the selector type, value and name of an element tuple
+    (<selector_type>, <selector_value>, [<display_name>]),
+    a css selector string or an XPath selector string
+    """
+    if isinstance(element, tuple):
+        element_name = element[2] if len(element) == 3 else element[1]
+        return element[0], element[1], element_name
+    elif isinstance(element, str):
+        selector_type = 'xpath' if _str_is_xpath_selector(element) else 'css'
+        return selector_type, element, element
+    raise IncorrectSelectorType(f'Incorrect element {element}')
+
+
+def _find_many(self, elements, timeout=None, wait_displayed=None, highlight=None):
+    """Find many webelements with one call to the browser.
+
+    `elements` is a list or a dict of element tuples, css selector
+    strings or XPath selector strings. Returns a list or a dict of
+    webelements with the same order or keys.
+
+    The elements, and whether they are displayed and enabled, are
+    resolved in the browser by a single script. Elements that are not
+    present yet (or not displayed when `wait_displayed` is true) are
+    then waited for one by one, as _find does.
+    The state found by the script is stored in `webelement.state`.
+    """
+    # TODO: avoid circular import
+    from golem.webdriver.extended_webelement import extend_webelement
+
+    if timeout is None:
+        timeout = execution.settings['search_timeout']
+    if wait_displayed is None:
+        wait_displayed = execution.settings['wait_displayed']
+    if highlight is None:
+        highlight = execution.settings['highlight_elements']
+
+    keys = list(elements) if isinstance(elements, dict) else None
+    element_list = [elements[k] for k in keys] if keys is not None else list(elements)
+    selectors = [_parse_selector(element) for element in element_list]
+
+    start_time = time.time()
+    js_root = self if isinstance(self, WebElement) else None
+    try:
+        results = _root_driver(self).execute_script(
+            FIND_MANY_SCRIPT, js_root, [[s[0], s[1]] for s in selectors])
+    except Exception as e:
+        execution.logger.debug(f'Could not find the elements in one call: {e}')
+        results = [[None, False, False]] * len(selectors)
+    _record_lookup_time(time.time() - start_time)
+
+    webelements = []
+    for (selector_type, selector_value, element_name), result in zip(selectors, results):
+        webelement, displayed, enabled = result
+        if webelement is None or (wait_displayed and not displayed):
+            webelement = _find_webelement(self, selector_type, selector_value, element_name,
+                                          timeout, wait_displayed, highlight)
+            state = None
+        else:
+            state = {'displayed': displayed, 'enabled': enabled}
+        webelement.selector_type = selector_type
+        webelement.selector_value = selector_value
+        webelement.name = element_name
+        webelement = extend_webelement(webelement)
+        webelement.state = state
+        if highlight:
+            webelement.highlight()
+        webelements.append(webelement)
+
+    if keys is not None:
+        return dict(zip(keys, webelements))
+    return webelements
+
+
+def _is_element_tuple(value):
+    return (isinstance(value, tuple) and len(value) in (2, 3) and
+            value[0] in ['id', 'css', 'link_text', 'partial_link_text', 'name', 'xpath', 'tag_name'])
+
+
+def _resolve_page(self, page, timeout=None, wait_displayed=None, highlight=None):
+    """Find every element tuple defined in a page with one call
+    to the browser. `page` is a page module or any object with
+    element tuples as attributes.
+    Returns a namespace with the same names.
+    """
+    elements = {name: value for name, value in vars(page).items()
+                if not name.startswith('_') and _is_element_tuple(value)}
+    webelements = _find_many(self, elements, timeout, wait_displayed, highlight)
+    return types.SimpleNamespace(**webelements)
+
+
 def _find_all(self, element=None, id=None, name=None, link_text=None,
               partial_link_text=None, css=None, xpath=None, tag_name=None):
     """Find all webelements
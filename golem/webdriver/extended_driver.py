@@ -200,6 +200,38 @@ class GolemExtendedDriver:
         return common._find_all(self, element, id, name, link_text, partial_link_text,
                                 css, xpath, tag_name)
 
+    def find_many(self, elements, timeout=None, wait_displayed=None,
+                  highlight=None) -> List[ExtendedRemoteWebElement]:
+        """Find many WebElements with a single call to the browser.
+
+        `elements` is a list or a dict of element tuples, CSS strings
+        or XPath strings. Elements that are not present yet are
+        waited for, like `find` does.
+
+        :Usage:
+            username, password = driver.find_many([('id', 'username'), '#password'])
+            elements = driver.find_many({'username': ('id', 'username')})
+
+        :Returns:
+          a list, or a dict when `elements` is a dict, of
+          ExtendedRemoteWebElement
+        """
+        return common._find_many(self, elements, timeout, wait_displayed, highlight)
+
+    def resolve_page(self, page, timeout=None, wait_displayed=None, highlight=None):
+        """Find all the elements defined in a page with a single
+        call to the browser.
+
+        :Usage:
+            login = driver.resolve_page(login_page)
+            login.username_input.send_keys('admin')
+
+        :Returns:
+          a namespace with an ExtendedRemoteWebElement for each
+          element tuple of the page
+        """
+        return common._resolve_page(self, page, timeout, wait_displayed, highlight)
+
     def get_window_index(self):
         """Get the index of the current window/tab"""
         return self.window_handles.index(self.current_window_handle)
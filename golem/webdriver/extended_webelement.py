@@ -10,7 +10,7 @@ from selenium.webdriver.support.select import Select as SeleniumSelect
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
 
-from golem.webdriver.common import _find, _find_all
+from golem.webdriver.common import _find, _find_all, _find_many
 from golem.webdriver import golem_expected_conditions as gec
 
 
@@ -19,6 +19,8 @@ class ExtendedWebElement:
     selector_type = None
     selector_value = None
     name = None
+    # displayed and enabled state when found with find_many
+    state = None
 
     def check(self):
         """Check element if element is checkbox or radiobutton.
@@ -67,6 +69,14 @@ class ExtendedWebElement:
         return _find(self, element, id, name, link_text, partial_link_text,
                      css, xpath, tag_name, timeout, wait_displayed, highlight)
 
+    def find_many(self, elements, timeout=None, wait_displayed=None,
+                  highlight=None) -> List['ExtendedRemoteWebElement']:
+        """Find many WebElements inside this element with a single
+        call to the browser.
+        See GolemExtendedDriver.find_many
+        """
+        return _find_many(self, elements, timeout, wait_displayed, highlight)
+
     def find_all(self, element=None, id=None, name=None, link_text=None,
                  partial_link_text=None, css=None, xpath=None,
                  tag_name=None) -> List['ExtendedRemoteWebElement']:
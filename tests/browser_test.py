@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 from golem.gui import gui_utils
@@ -49,3 +51,262 @@ class TestGetBrowser:
                 browser.open_browser()
                 expected = f'No executable file found using path {setting_path}'
                 assert expected in str(excinfo.value)
+
+
+class _FakeSwitchTo:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    def alert(self):
+        raise Exception('no alert')
+
+    def window(self, handle):
+        self.driver.current_window = handle
+
+
+class _FakeDriver:
+
+    def __init__(self, windows=1, fail_reset=False):
+        self.window_handles = [f'window{i}' for i in range(windows)]
+        self.current_window = self.window_handles[0]
+        self.switch_to = _FakeSwitchTo(self)
+        self.fail_reset = fail_reset
+        self.calls = []
+
+    def close(self):
+        self.window_handles.remove(self.current_window)
+
+    def execute_script(self, script):
+        self.calls.append('execute_script')
+
+    def execute_cdp_cmd(self, cmd, args):
+        raise Exception('not supported')
+
+    def delete_all_cookies(self):
+        if self.fail_reset:
+            raise Exception('reset failed')
+        self.calls.append('delete_all_cookies')
+
+    def get(self, url):
+        self.calls.append(url)
+
+    def quit(self):
+        self.calls.append('quit')
+
+
+class TestReuseBrowser:
+
+    @pytest.fixture(autouse=True)
+    def _execution(self):
+        execution.settings = settings_manager.assign_settings_default_values({})
+        execution.settings['reuse_browser'] = True
+        execution.logger = test_logger.get_logger()
+        execution.browser_definition = {'name': 'chrome', 'capabilities': {}}
+        execution.browsers = {}
+        execution.browser = None
+        yield
+        browser.quit_parked_browsers()
+
+    def test_reset_browser(self):
+        driver = _FakeDriver(windows=3)
+        browser.reset_browser(driver)
+        assert driver.window_handles == ['window0']
+        assert driver.current_window == 'window0'
+        assert driver.calls == ['execute_script', 'delete_all_cookies', 'about:blank']
+
+    def test_park_and_reuse_browser(self):
+        driver = _FakeDriver()
+        driver.golem_reuse_key = browser._reuse_key('chrome', {}, None)
+        execution.browsers = {'main': driver}
+        browser.park_browsers()
+        assert 'quit' not in driver.calls
+        execution.browsers = {}
+        assert browser.open_browser() is driver
+        assert execution.browsers == {'main': driver}
+        assert execution.browser is driver
+
+    def test_reuse_dead_browser(self, monkeypatch):
+        driver = _FakeDriver()
+        driver.golem_reuse_key = browser._reuse_key('chrome', {}, None)
+        execution.browsers = {'main': driver}
+        browser.park_browsers()
+        del driver.window_handles
+        new_driver = _FakeDriver()
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: new_driver)
+        execution.browsers = {}
+        assert browser.open_browser() is new_driver
+        assert driver.calls[-1] == 'quit'
+        assert browser._parked_drivers == {}
+
+    def test_park_browser_reset_fails(self):
+        driver = _FakeDriver(fail_reset=True)
+        driver.golem_reuse_key = browser._reuse_key('chrome', {}, None)
+        execution.browsers = {'main': driver}
+        browser.park_browsers()
+        assert driver.calls[-1] == 'quit'
+        assert browser._parked_drivers == {}
+
+    def test_park_one_browser_per_definition(self):
+        driver_one = _FakeDriver()
+        driver_two = _FakeDriver()
+        driver_one.golem_reuse_key = browser._reuse_key('chrome', {}, None)
+        driver_two.golem_reuse_key = browser._reuse_key('chrome', {}, None)
+        execution.browsers = {'main': driver_one, 'browser1': driver_two}
+        browser.park_browsers()
+        assert 'quit' not in driver_one.calls
+        assert driver_two.calls[-1] == 'quit'
+
+    def test_quit_parked_browsers(self):
+        driver = _FakeDriver()
+        driver.golem_reuse_key = browser._reuse_key('chrome', {}, None)
+        execution.browsers = {'main': driver}
+        browser.park_browsers()
+        browser.quit_parked_browsers()
+        assert driver.calls[-1] == 'quit'
+        assert browser._parked_drivers == {}
+
+
+class _DeadDriver(_FakeDriver):
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def window_handles(self):
+        raise Exception('session deleted')
+
+
+class TestBrowserPool:
+
+    @pytest.fixture(autouse=True)
+    def _execution(self):
+        execution.settings = settings_manager.assign_settings_default_values({})
+        execution.settings['browser_pool_size'] = 2
+        execution.logger = test_logger.get_logger()
+        execution.browser_definition = {'name': 'chrome', 'capabilities': {}}
+        execution.browsers = {}
+        execution.browser = None
+        yield
+        browser.close_idle_browsers()
+
+    @staticmethod
+    def _start_args():
+        return 'chrome', {}, None, execution.settings, None, execution.testdir, execution.logger
+
+    def test_fill_and_acquire(self, monkeypatch):
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: _FakeDriver())
+        pool = browser.BrowserPool(2)
+        key = browser._reuse_key('chrome', {}, None)
+        pool.fill(key, self._start_args())
+        assert isinstance(pool.acquire(key), _FakeDriver)
+        assert isinstance(pool.acquire(key), _FakeDriver)
+        assert pool.acquire(key) is None
+        assert pool.metrics['ready'] + pool.metrics['waited'] == 2
+        assert pool.metrics['missed'] == 1
+        pool.close()
+
+    def test_acquire_discards_unhealthy_browser(self, monkeypatch):
+        dead_driver = _DeadDriver()
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: dead_driver)
+        pool = browser.BrowserPool(1)
+        key = browser._reuse_key('chrome', {}, None)
+        pool.fill(key, self._start_args())
+        assert pool.acquire(key) is None
+        assert dead_driver.calls == ['quit']
+        assert pool.metrics['failed_health_checks'] == 1
+        pool.close()
+
+    def test_failed_start(self, monkeypatch):
+        def start_driver(*args):
+            raise Exception('could not start')
+        monkeypatch.setattr(browser, '_start_driver', start_driver)
+        pool = browser.BrowserPool(1)
+        key = browser._reuse_key('chrome', {}, None)
+        pool.fill(key, self._start_args())
+        assert pool.acquire(key) is None
+        assert pool.metrics['failed_starts'] == 1
+        pool.close()
+
+    def test_background_start_uses_values_captured_by_fill(self, monkeypatch):
+        started = []
+        can_start = threading.Event()
+
+        def start_driver(*args):
+            if threading.current_thread() is not threading.main_thread():
+                can_start.wait(5)
+            started.append(args)
+            return _FakeDriver()
+        monkeypatch.setattr(browser, '_start_driver', start_driver)
+        monkeypatch.setattr(browser, 'Project', lambda name: None)
+        monkeypatch.setattr(execution, 'testdir', 'testdir')
+        logger = execution.logger
+        browser.open_browser()
+        # the worker resets the execution module before the next test
+        monkeypatch.setattr(execution, 'testdir', None)
+        monkeypatch.setattr(execution, 'logger', None)
+        can_start.set()
+        browser._browser_pool.close()
+        assert len(started) == 3
+        assert all(args[-2:] == ('testdir', logger) for args in started)
+
+    def test_close_quits_ready_browsers(self, monkeypatch):
+        drivers = []
+
+        def start_driver(*args):
+            drivers.append(_FakeDriver())
+            return drivers[-1]
+        monkeypatch.setattr(browser, '_start_driver', start_driver)
+        pool = browser.BrowserPool(2)
+        key = browser._reuse_key('chrome', {}, None)
+        pool.fill(key, self._start_args())
+        pool.close()
+        assert len(drivers) == 2
+        assert all(d.calls == ['quit'] for d in drivers)
+
+    def test_open_browser_from_pool(self, monkeypatch):
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: _FakeDriver())
+        monkeypatch.setattr(browser, 'Project', lambda name: None)
+        driver = browser.open_browser()
+        assert isinstance(driver, _FakeDriver)
+        assert execution.browser is driver
+        pool = browser._browser_pool
+        assert pool.metrics['ready'] + pool.metrics['waited'] + pool.metrics['missed'] == 1
+
+    def test_open_browser_single_test_process(self, monkeypatch):
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: _FakeDriver())
+        monkeypatch.setattr(browser, 'Project', lambda name: None)
+        monkeypatch.setattr(browser, 'single_test_process', True)
+        assert isinstance(browser.open_browser(), _FakeDriver)
+        assert browser._browser_pool is None
+
+    def test_health_check_does_not_block_the_pool(self, monkeypatch):
+        pool = browser.BrowserPool(1)
+
+        class _CheckedDriver:
+            def quit(self):
+                pass
+
+            @property
+            def window_handles(self):
+                # another thread can use the pool during the check
+                acquired = []
+                thread = threading.Thread(target=lambda: acquired.append(pool.acquire('other')))
+                thread.start()
+                thread.join(timeout=5)
+                assert acquired == [None]
+                return ['handle']
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: _CheckedDriver())
+        key = browser._reuse_key('chrome', {}, None)
+        pool.fill(key, self._start_args())
+        assert isinstance(pool.acquire(key), _CheckedDriver)
+        pool.close()
+
+    def test_close_idle_browsers_prints_metrics(self, monkeypatch, capsys):
+        monkeypatch.setattr(browser, '_start_driver', lambda *args: _FakeDriver())
+        monkeypatch.setattr(browser, 'Project', lambda name: None)
+        browser.open_browser()
+        browser.close_idle_browsers()
+        out, _ = capsys.readouterr()
+        assert 'Browser pool: 1 browsers requested' in out
@@ -6,6 +6,7 @@ from golem.cli import commands, messages
 from golem.core import file_manager
 from golem.core import utils
 from golem.report import execution_report
+from golem.report import report_index
 from golem.gui.user_management import Users
 
 
@@ -200,6 +201,25 @@ class TestRunCommand:
         assert msg in out
 
 
+class TestReindexReportsCommand:
+
+    def test_reindexreports_command(self, project_function, test_utils, capsys):
+        _, project = project_function.activate()
+        execution = test_utils.execute_random_suite(project)
+        report_index.remove_execution(project, execution['suite_name'])
+        commands.reindexreports_command(project)
+        out, err = capsys.readouterr()
+        assert f'{project}: 1 executions indexed' in out
+        assert len(report_index.get_summaries(project)) == 1
+
+    def test_reindexreports_command_project_does_not_exist(self, project_session):
+        project_session.activate()
+        with pytest.raises(SystemExit) as excinfo:
+            commands.reindexreports_command('incorrect')
+        expected = 'golem reindexreports: error: a project with name incorrect does not exist'
+        assert str(excinfo.value) == expected
+
+
 class TestCreateDirectoryCommand:
 
     def test_createdirectory_command(self, dir_function):
@@ -0,0 +1,77 @@
+import os
+import shutil
+
+from golem.core import file_index
+from golem.core import file_manager
+
+
+def _set_old_mtime(path):
+    """Make the modification time of every directory old
+    so the index trusts it
+    """
+    for dirpath, _, _ in os.walk(path):
+        os.utime(dirpath, (1000000000, 1000000000))
+
+
+class TestFileIndex:
+
+    def test_files_and_tree(self, dir_function, test_utils):
+        path = dir_function.path
+        test_utils.create_file(path, 'file1.py')
+        test_utils.create_file(path, '__init__.py')
+        test_utils.create_file(path, 'file.txt')
+        test_utils.create_file(os.path.join(path, 'subdir1'), 'file2.py')
+        test_utils.create_file(os.path.join(path, 'subdir1', 'subdir2'), 'file3.py')
+        test_utils.create_file(os.path.join(path, '__pycache__'), 'file4.py')
+        index = file_index.FileIndex(path)
+        assert sorted(index.files()) == ['file1', 'subdir1.file2', 'subdir1.subdir2.file3']
+        assert sorted(index.files('subdir1')) == ['subdir1.file2', 'subdir1.subdir2.file3']
+        assert index.files('does_not_exist') == []
+        assert index.tree() == file_manager.generate_file_structure_dict(path)
+
+    def test_directory_does_not_exist(self, dir_function):
+        index = file_index.FileIndex(os.path.join(dir_function.path, 'does_not_exist'))
+        assert index.files() == []
+
+    def test_changes_are_detected(self, dir_function, test_utils):
+        path = dir_function.path
+        test_utils.create_file(os.path.join(path, 'subdir1'), 'file1.py')
+        test_utils.create_file(os.path.join(path, 'subdir2'), 'file2.py')
+        _set_old_mtime(path)
+        index = file_index.FileIndex(path)
+        assert sorted(index.files()) == ['subdir1.file1', 'subdir2.file2']
+        # add a file
+        test_utils.create_file(os.path.join(path, 'subdir1'), 'file3.py')
+        assert sorted(index.files()) == ['subdir1.file1', 'subdir1.file3', 'subdir2.file2']
+        # rename a directory
+        os.rename(os.path.join(path, 'subdir1'), os.path.join(path, 'subdir3'))
+        assert sorted(index.files()) == ['subdir2.file2', 'subdir3.file1', 'subdir3.file3']
+        # remove a directory
+        shutil.rmtree(os.path.join(path, 'subdir2'))
+        assert sorted(index.files()) == ['subdir3.file1', 'subdir3.file3']
+
+    def test_unchanged_directories_are_not_listed(self, dir_function, test_utils, monkeypatch):
+        path = dir_function.path
+        test_utils.create_file(os.path.join(path, 'subdir1'), 'file1.py')
+        test_utils.create_file(os.path.join(path, 'subdir2'), 'file2.py')
+        _set_old_mtime(path)
+        index = file_index.FileIndex(path)
+        index.files()
+        listed = []
+        original_scandir = os.scandir
+
+        def scandir(dir_path):
+            listed.append(dir_path)
+            return original_scandir(dir_path)
+        monkeypatch.setattr(os, 'scandir', scandir)
+        assert sorted(index.files()) == ['subdir1.file1', 'subdir2.file2']
+        assert listed == []
+        test_utils.create_file(os.path.join(path, 'subdir1'), 'file3.py')
+        index.files()
+        assert listed == [os.path.join(path, 'subdir1')]
+
+    def test_get_index(self, dir_function):
+        index = file_index.get_index(dir_function.path)
+        assert file_index.get_index(dir_function.path) is index
+        file_index.invalidate(dir_function.path)
+        assert file_index.get_index(dir_function.path) is not index
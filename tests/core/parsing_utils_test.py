@@ -1,6 +1,7 @@
 import ast
 
 from golem.core import parsing_utils
+from golem.core import utils
 
 
 class TestAstParseFile:
@@ -62,3 +63,70 @@ class TestTopLevelAssignments:
         ast_node = parsing_utils.ast_parse_file(filepath)
         assignments = parsing_utils.top_level_assignments(ast_node)
         assert assignments == ['foo', 'bar']
+
+
+class TestModuleLiterals:
+
+    def test_module_literals(self, dir_function, test_utils):
+        content = ('import os\n'
+                   'description = "desc"\n'
+                   'tags = ["a", "b"]\n'
+                   'skip = False\n'
+                   'data = get_data()\n'
+                   'def test(data):\n'
+                   '    pass\n')
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content=content)
+        values, unresolved = parsing_utils.module_literals(filepath)
+        assert values == {'description': 'desc', 'tags': ['a', 'b'], 'skip': False}
+        assert unresolved == {'os', 'data', 'test'}
+
+    def test_module_literals_reassigned(self, dir_function, test_utils):
+        content = ('tags = ["a"]\n'
+                   'tags += ["b"]\n'
+                   'pages = ["p1"]\n'
+                   'if True:\n'
+                   '    pages = []\n')
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content=content)
+        values, unresolved = parsing_utils.module_literals(filepath)
+        assert values == {}
+        assert unresolved == {'tags', 'pages'}
+
+    def test_module_literals_star_import(self, dir_function, test_utils):
+        content = 'from os import *\ntags = ["a"]\n'
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content=content)
+        assert parsing_utils.module_literals(filepath) == ({}, None)
+
+    def test_module_literals_syntax_error(self, dir_function, test_utils):
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content='tags = [\n')
+        assert parsing_utils.module_literals(filepath) == ({}, None)
+
+    def test_module_literals_file_changed(self, dir_function, test_utils):
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content='tags = ["a"]\n')
+        assert parsing_utils.module_literals(filepath)[0] == {'tags': ['a']}
+        with open(filepath, 'w') as f:
+            f.write('tags = ["a", "b"]\n')
+        assert parsing_utils.module_literals(filepath)[0] == {'tags': ['a', 'b']}
+
+    def test_module_literals_values_are_copies(self, dir_function, test_utils):
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content='tags = ["a"]\n')
+        parsing_utils.module_literals(filepath)[0]['tags'].append('b')
+        assert parsing_utils.module_literals(filepath)[0] == {'tags': ['a']}
+
+
+class TestModuleVariable:
+
+    def test_module_variable(self, dir_function, test_utils):
+        content = 'tags = ["a"]\ndata = dict(key="value")\n'
+        filepath = test_utils.create_file(dir_function.path, 'test_one.py', content=content)
+        modules = []
+
+        def load_module():
+            module, _ = utils.import_module(filepath)
+            modules.append(module)
+            return module
+
+        assert parsing_utils.module_variable(filepath, 'tags', load_module) == ['a']
+        assert parsing_utils.module_variable(filepath, 'skip', load_module, False) is False
+        assert modules == []
+        assert parsing_utils.module_variable(filepath, 'data', load_module) == {'key': 'value'}
+        assert len(modules) == 1
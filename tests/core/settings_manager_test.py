@@ -6,6 +6,7 @@ from golem.core import settings_manager
 DEFAULT_EMPTY = {
     'search_timeout': 0,
     'wait_displayed': False,
+    'element_lookup_strategy': 'poll',
     'screenshot_on_error': True,
     'screenshot_on_step': False,
     'screenshot_on_end': False,
@@ -24,7 +25,16 @@ DEFAULT_EMPTY = {
     'cli_log_level': 'INFO',
     'log_all_events': True,
     'start_maximized': True,
-    'screenshots': {}
+    'screenshots': {},
+    'screenshot_threads': 2,
+    'screenshot_dedup': None,
+    'screenshot_dedup_threshold': 5,
+    'junit_log_lines': None,
+    'persistent_workers': False,
+    'worker_max_tests': None,
+    'worker_max_memory': None,
+    'reuse_browser': False,
+    'browser_pool_size': 0
 }
 
 DEFAULT_PREDEFINED = {
@@ -37,6 +47,7 @@ DEFAULT_PREDEFINED = {
     'operadriver_path': './drivers/operadriver*',
     'search_timeout': 20,
     'wait_displayed': False,
+    'element_lookup_strategy': 'poll',
     'highlight_elements': False,
     'log_all_events': True,
     'remote_browsers': {},
@@ -48,7 +59,16 @@ DEFAULT_PREDEFINED = {
     'implicit_page_import': True,
     'wait_hook': None,
     'start_maximized': True,
-    'screenshots': {}
+    'screenshots': {},
+    'screenshot_threads': 2,
+    'screenshot_dedup': None,
+    'screenshot_dedup_threshold': 5,
+    'junit_log_lines': None,
+    'persistent_workers': False,
+    'worker_max_tests': None,
+    'worker_max_memory': None,
+    'reuse_browser': False,
+    'browser_pool_size': 0
 }
 
 
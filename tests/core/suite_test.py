@@ -243,6 +243,16 @@ class TestSuiteBrowsers:
         assert Suite(project, suite_name).browsers == browsers
 
 
+class TestSuiteReuseBrowser:
+
+    def test_suite_reuse_browser(self, project_session, test_utils):
+        _, project = project_session.activate()
+        suite_name = test_utils.create_random_suite(project)
+        assert Suite(project, suite_name).reuse_browser is None
+        suite.edit_suite_code(project, suite_name, 'tests = []\nreuse_browser = True\n')
+        assert Suite(project, suite_name).reuse_browser is True
+
+
 class TestSuiteTests:
 
     def test_suite_tests(self, project_function, test_utils):
@@ -96,6 +96,36 @@ class TestFilterTestsByTags:
         assert expected in str(excinfo.value) or expected_ver2 in str(excinfo.value)
 
 
+class TestCompileTagExpression:
+
+    def test_compile_tag_expression(self):
+        index = {'alfa': {'t1', 't2'}, 'bravo': {'t2', 't3'}, 'fox trot': {'t4'}, '1': {'t4'}}
+        tests = {'t1', 't2', 't3', 't4', 't5'}
+        assert tags_manager.compile_tag_expression('alfa')(index, tests) == {'t1', 't2'}
+        assert tags_manager.compile_tag_expression('alfa and bravo')(index, tests) == {'t2'}
+        assert tags_manager.compile_tag_expression('alfa or bravo')(index, tests) == {'t1', 't2', 't3'}
+        assert tags_manager.compile_tag_expression('not alfa')(index, tests) == {'t3', 't4', 't5'}
+        assert tags_manager.compile_tag_expression('"fox trot" and 1')(index, tests) == {'t4'}
+        assert tags_manager.compile_tag_expression('charlie')(index, tests) == set()
+
+    def test_compile_tag_expression_is_cached(self):
+        query = tags_manager.compile_tag_expression('alfa and not bravo')
+        assert tags_manager.compile_tag_expression('alfa and not bravo') is query
+
+    def test_compile_tag_expression_invalid(self):
+        with pytest.raises(tags_manager.InvalidTagExpression):
+            tags_manager.compile_tag_expression('alfa == bravo')
+
+
+class TestBuildTagIndex:
+
+    def test_build_tag_index(self):
+        tests_tags = {'t1': ['alfa', 'bravo'], 't2': ['bravo'], 't3': [], 't4': 'alfa',
+                      't5': None}
+        index = tags_manager.build_tag_index(tests_tags)
+        assert index == {'alfa': {'t1', 't4'}, 'bravo': {'t1', 't2'}}
+
+
 class TestGetTestsTags:
 
     def test_get_tests_tags(self, project_session, test_utils):
@@ -138,6 +168,56 @@ class TestGetTestsTags:
             assert cache[test_name]['tags'] == ['baz']
         assert tags[test_name] == ['baz']
 
+    def test_get_tests_tags_cache_not_written_when_unchanged(self, project_function, test_utils):
+        testdir, project = project_function.activate()
+        test_utils.create_test(project, 'test_one', content='tags = ["foo"]')
+        cache_path = os.path.join(testdir, 'projects', project, '.tags')
+        tags_manager.get_tests_tags(project, ['test_one'])
+        os.utime(cache_path, (1000000000, 1000000000))
+        tags = tags_manager.get_tests_tags(project, ['test_one'])
+        assert tags == {'test_one': ['foo']}
+        assert os.path.getmtime(cache_path) == 1000000000
+
+
+    def test_get_tests_tags_in_parallel(self, project_function, test_utils, monkeypatch):
+        _, project = project_function.activate()
+        monkeypatch.setattr(tags_manager, 'PARALLEL_READ_THRESHOLD', 2)
+        monkeypatch.setattr(tags_manager, 'PROGRESS_STEP', 2)
+        test_utils.create_test(project, 'test_one', content='tags = ["foo"]')
+        test_utils.create_test(project, 'test_two', content='tags = ["b" + "ar"]')
+        test_utils.create_test(project, 'test_three', content='def test(data):\n    pass\n')
+        progress = []
+        tests = ['test_one', 'test_two', 'test_three']
+        tags = tags_manager.get_tests_tags(project, tests,
+                                           progress=lambda done, total: progress.append((done, total)))
+        assert tags == {'test_one': ['foo'], 'test_two': ['bar'], 'test_three': []}
+        assert progress == [(2, 3), (3, 3)]
+        # the next call reads the cache
+        progress.clear()
+        assert tags_manager.get_tests_tags(project, tests, progress=progress.append) == tags
+        assert progress == []
+
+
+    def test_get_tests_tags_in_parallel_imported_tags(self, project_function, test_utils,
+                                                      monkeypatch):
+        testdir, project = project_function.activate()
+        monkeypatch.setattr(tags_manager, 'PARALLEL_READ_THRESHOLD', 2)
+        monkeypatch.syspath_prepend(testdir)
+        with open(os.path.join(testdir, 'projects', project, 'tag_values.py'), 'w') as f:
+            f.write('TAGS = ["imported"]\n')
+        content = f'from projects.{project}.tag_values import TAGS\n\ntags = TAGS\n'
+        imported_path = test_utils.create_test(project, 'test_one', content=content)
+        test_utils.create_test(project, 'test_two', content='tags = ["foo"]')
+        test_utils.create_test(project, 'test_three', content='tags = ["bar"]')
+        # modules are imported by this process, not by the pool
+        read_tags = tags_manager._read_tags
+        imported = []
+        monkeypatch.setattr(tags_manager, '_read_tags',
+                            lambda path: imported.append(path) or read_tags(path))
+        tags = tags_manager.get_tests_tags(project, ['test_one', 'test_two', 'test_three'])
+        assert tags == {'test_one': ['imported'], 'test_two': ['foo'], 'test_three': ['bar']}
+        assert imported == [imported_path]
+
 
 class TestGetAllProjectTestsTags:
 
@@ -1,6 +1,8 @@
 import json
 import os
 
+import pytest
+
 from golem.core import test_data
 from golem.core import test
 
@@ -316,3 +318,55 @@ class TestGetParsedTestData:
         test_name = test_utils.create_random_test(project)
         data = test_data.get_parsed_test_data(project, test_name)
         assert data == [{}]
+
+
+class TestGetTestDataSets:
+
+    def test_get_test_data_sets_csv(self, project_class, test_utils):
+        _, project = project_class.activate()
+        test_name = test_utils.create_random_test(project)
+        with open(test_data.csv_file_path(project, test_name), 'w', encoding='utf-8') as f:
+            f.write('a,b\n1,2\n\n"multi\nline",ñ\n3,4,5\n')
+        data_sets = test_data.get_test_data_sets(project, test_name)
+        assert [d.source for d in data_sets] == ['csv', 'csv', 'csv']
+        assert [d.load() for d in data_sets] == test_data.get_csv_test_data(project, test_name)
+        assert data_sets[1].load() == {'a': 'multi\nline', 'b': 'ñ'}
+
+    @pytest.mark.parametrize('newline', ['\r\n', '\r'])
+    def test_get_test_data_sets_csv_newlines(self, project_class, test_utils, newline):
+        _, project = project_class.activate()
+        test_name = test_utils.create_random_test(project)
+        content = 'a,b\n1,2\n"multi\nline",ñ\n3,4\n'.replace('\n', newline)
+        with open(test_data.csv_file_path(project, test_name), 'w', encoding='utf-8',
+                  newline='') as f:
+            f.write(content)
+        data_sets = test_data.get_test_data_sets(project, test_name)
+        assert [d.load() for d in data_sets] == test_data.get_csv_test_data(project, test_name)
+        assert [d.load() for d in data_sets] == [
+            {'a': '1', 'b': '2'}, {'a': 'multi\nline', 'b': 'ñ'}, {'a': '3', 'b': '4'}]
+
+    def test_get_test_data_sets_json(self, project_class, test_utils):
+        _, project = project_class.activate()
+        test_name = test_utils.create_random_test(project)
+        test_data.save_json_test_data(project, test_name, '[{"c": "d"}, {"c": "e"}]')
+        data_sets = test_data.get_test_data_sets(project, test_name)
+        assert [d.load() for d in data_sets] == [{'c': 'd'}, {'c': 'e'}]
+
+    def test_get_test_data_sets_internal_and_no_data(self, project_class, test_utils):
+        _, project = project_class.activate()
+        test_name = test_utils.create_random_test(project)
+        data_sets = test_data.get_test_data_sets(project, test_name)
+        assert [d.load() for d in data_sets] == [{}]
+        with open(test.Test(project, test_name).path, 'w') as f:
+            f.write("data = [{'e': 'f'}]")
+        data_sets = test_data.get_test_data_sets(project, test_name)
+        assert [d.load() for d in data_sets] == [{'e': 'f'}]
+
+    def test_data_set_with_values(self, project_class, test_utils):
+        _, project = project_class.activate()
+        test_name = test_utils.create_random_test(project)
+        test_data.save_csv_test_data(project, test_name, [{'a': 'b'}])
+        data_set = test_data.get_test_data_sets(project, test_name)[0]
+        data_set_env = data_set.with_values(env={'name': 'stage'})
+        assert data_set_env.load() == {'a': 'b', 'env': {'name': 'stage'}}
+        assert data_set.load() == {'a': 'b'}
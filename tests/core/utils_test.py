@@ -93,6 +93,30 @@ class TestImportModule:
             assert expected in error
 
 
+class TestImportModuleCached:
+
+    def test_import_module_cached(self, dir_function):
+        filepath = os.path.join(dir_function.path, 'python_module.py')
+        with open(filepath, 'w') as f:
+            f.write('foo = 2\n')
+        module, error = utils.import_module_cached(filepath)
+        assert module.foo == 2
+        assert error is None
+        assert utils.import_module_cached(filepath)[0] is module
+        # the module is imported again when the file changes
+        with open(filepath, 'w') as f:
+            f.write('foo = 3\n')
+        new_module, _ = utils.import_module_cached(filepath)
+        assert new_module is not module
+        assert new_module.foo == 3
+
+    def test_import_module_cached_does_not_exist(self, dir_function):
+        filepath = os.path.join(dir_function.path, 'non_existent.py')
+        module, error = utils.import_module_cached(filepath)
+        assert module is None
+        assert error
+
+
 class TestModuleLocalFunctions:
 
     def test_module_local_functions(self):
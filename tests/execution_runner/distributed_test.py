@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from golem.core import session
+from golem.core import settings_manager
+from golem.core import utils
+from golem.execution_runner import distributed
+from golem.execution_runner import execution_runner as exc_runner
+from golem.execution_runner.execution_totals import ExecutionTotals
+from golem.execution_runner.multiprocess_executor import RunConstants
+from golem.report import execution_report as exec_report
+
+
+def _coordinator(tasks_count, reportdir, **kwargs):
+    run = RunConstants('testdir', 'project', {}, {}, None, [], False)
+    tasks = []
+    for i in range(tasks_count):
+        test = SimpleNamespace(name=f'test0{i}', data_set={}, secrets={},
+                               browser={'name': 'chrome'}, reportdir=reportdir, env=None,
+                               set_name='')
+        tasks.append(run.task_descriptor(test))
+    return distributed.Coordinator('127.0.0.1:0', run, tasks, reportdir, **kwargs)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class TestParseAddress:
+
+    def test_parse_address(self):
+        assert distributed.parse_address('10.0.0.5:9000') == ('10.0.0.5', 9000)
+        assert distributed.parse_address('10.0.0.5') == ('10.0.0.5', distributed.DEFAULT_PORT)
+        assert distributed.parse_address('http://host:9000/') == ('host', 9000)
+        assert distributed.parse_address(':9000') == ('127.0.0.1', 9000)
+
+
+class TestCoordinator:
+
+    def test_lease_and_complete(self, dir_function):
+        totals = ExecutionTotals()
+        coordinator = _coordinator(1, dir_function.path, totals=totals)
+        status, lease = coordinator.lease()
+        assert status == 200
+        assert lease['task']['name'] == 'test00'
+        # nothing else to lease
+        assert coordinator.lease() == (204, None)
+        # upload the reports of the test set
+        uploaded = os.path.join(dir_function.path, 'uploaded')
+        os.makedirs(os.path.join(uploaded, 'test00'))
+        with open(os.path.join(uploaded, 'test00', 'file.log'), 'w') as f:
+            f.write('log')
+        with open(os.path.join(uploaded, distributed.AGENT_FILE), 'w') as f:
+            json.dump({'totals': {'success': 1}, 'has_failed': False}, f)
+        content = distributed._zip_directory(uploaded)
+        assert coordinator.heartbeat(lease['lease']) == 200
+        assert coordinator.complete(lease['lease'], content) == 200
+        assert os.path.isfile(os.path.join(dir_function.path, 'test00', 'file.log'))
+        assert not os.path.exists(os.path.join(dir_function.path, distributed.AGENT_FILE))
+        assert totals.by_result() == {'success': 1}
+        # the same lease cannot be completed twice
+        assert coordinator.complete(lease['lease'], content) == 410
+        assert coordinator.heartbeat(lease['lease']) == 410
+        assert coordinator.lease() == (410, None)
+
+    def test_stop(self, dir_function):
+        stopped = []
+        coordinator = _coordinator(3, dir_function.path, stop=lambda: bool(stopped))
+        status, lease = coordinator.lease()
+        assert status == 200
+        stopped.append(True)
+        # the leased test set is allowed to finish
+        assert coordinator.lease() == (204, None)
+        assert coordinator.complete(lease['lease'], distributed._zip_directory(
+            dir_function.path)) == 200
+        assert coordinator.lease() == (410, None)
+
+    def test_invalid_upload_is_leased_again(self, dir_function):
+        coordinator = _coordinator(1, dir_function.path)
+        _, lease = coordinator.lease()
+        assert coordinator.complete(lease['lease'], b'not a zip') == 400
+        status, lease = coordinator.lease()
+        assert status == 200
+        assert lease['task']['name'] == 'test00'
+
+    def test_expired_lease_is_leased_again(self, dir_function, capsys):
+        totals = ExecutionTotals()
+        coordinator = _coordinator(1, dir_function.path, totals=totals, lease_timeout=0.1,
+                                   max_attempts=2)
+        _, first_lease = coordinator.lease()
+        time.sleep(0.2)
+        status, second_lease = coordinator.lease()
+        assert status == 200
+        assert second_lease['task']['name'] == 'test00'
+        assert 'will be run again' in capsys.readouterr().out
+        assert coordinator.heartbeat(first_lease['lease']) == 410
+        # the reports of the first lease are not accepted once it is leased again
+        assert coordinator._expired_leases == {}
+        assert coordinator.complete(first_lease['lease'], b'') == 410
+        # the last attempt expires, the test set is lost
+        time.sleep(0.2)
+        assert coordinator.lease() == (410, None)
+        assert 'was lost after 2 attempts' in capsys.readouterr().out
+        assert totals.has_failed
+        assert coordinator._expired_leases == {}
+
+    def test_expired_lease_can_complete_until_leased_again(self, dir_function):
+        coordinator = _coordinator(1, dir_function.path, lease_timeout=0.1)
+        _, lease = coordinator.lease()
+        time.sleep(0.2)
+        with coordinator._lock:
+            coordinator._requeue_expired_leases()
+        assert coordinator.complete(lease['lease'], distributed._zip_directory(
+            dir_function.path)) == 200
+        assert coordinator._expired_leases == {}
+
+    @pytest.mark.parametrize('name', ['../outside.log', 'dir/../../outside.log',
+                                      '..\\..\\outside.log', '/tmp/outside.log',
+                                      'C:\\outside.log', 'C:/outside.log', 'c:outside.log'])
+    def test_extract_rejects_paths_outside_the_report_dir(self, dir_function, name, capsys):
+        reportdir = os.path.join(dir_function.path, 'reportdir')
+        os.makedirs(reportdir)
+        coordinator = _coordinator(1, reportdir)
+        content = io.BytesIO()
+        with zipfile.ZipFile(content, 'w') as archive:
+            archive.writestr(name, 'evil')
+            archive.writestr('test00/file.log', 'log')
+        coordinator._extract(content.getvalue())
+        assert f'invalid path in uploaded reports: {name}' in capsys.readouterr().out
+        assert os.listdir(dir_function.path) == ['reportdir']
+        assert os.listdir(reportdir) == ['test00']
+        assert os.listdir(os.path.join(reportdir, 'test00')) == ['file.log']
+
+
+class TestToken:
+
+    def _get_run(self, coordinator, token=None):
+        request = urllib.request.Request(coordinator.url + '/run')
+        if token is not None:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def test_requests_require_the_token(self, dir_function):
+        coordinator = _coordinator(1, dir_function.path, token='secret')
+        coordinator.start()
+        try:
+            assert self._get_run(coordinator) == 401
+            assert self._get_run(coordinator, 'wrong') == 401
+            assert self._get_run(coordinator, 'secret') == 200
+        finally:
+            coordinator.stop()
+
+    def test_random_token_by_default(self, dir_function):
+        assert _coordinator(1, dir_function.path).token
+
+    def test_agent_with_wrong_token(self, dir_function, monkeypatch):
+        monkeypatch.setenv(distributed.TOKEN_ENV_VAR, 'wrong')
+        coordinator = _coordinator(1, dir_function.path, token='secret')
+        coordinator.start()
+        try:
+            agent = distributed.Agent(coordinator.url, dir_function.path)
+            with pytest.raises(PermissionError, match='rejected the token'):
+                agent.run()
+        finally:
+            coordinator.stop()
+
+
+class TestRunWithAgents:
+
+    @pytest.mark.slow
+    def test_run_with_agents(self, project_function, test_utils, capsys, monkeypatch):
+        monkeypatch.setenv(distributed.TOKEN_ENV_VAR, 'secret')
+        testdir, project = project_function.activate()
+        session.settings = settings_manager.get_project_settings(project)
+        test_utils.create_test(project, 'test01')
+        test_utils.create_test(project, 'test02')
+        test_utils.create_test(project, 'test03', content='def test(data):\n    assert False\n')
+        address = f'127.0.0.1:{_free_port()}'
+        agents = [distributed.Agent(address, testdir, poll_interval=0.1) for _ in range(2)]
+        threads = [threading.Thread(target=agent.run) for agent in agents]
+        for thread in threads:
+            thread.start()
+        timestamp = utils.get_timestamp()
+        execution_runner = exc_runner.ExecutionRunner(project, browsers=['chrome'],
+                                                      timestamp=timestamp, coordinator=address)
+        with pytest.raises(SystemExit):
+            execution_runner.run_directory('')
+        for thread in threads:
+            thread.join(timeout=60)
+        assert sum(agent.completed for agent in agents) == 3
+        assert execution_runner.execution.totals.by_result() == {'success': 2, 'failure': 1}
+        data = exec_report.get_execution_data(project=project, execution='all', timestamp=timestamp)
+        assert data['total_tests'] == 3
+        assert data['totals_by_result'] == {'success': 2, 'failure': 1}
@@ -202,11 +202,12 @@ class TestDefineExecutionList:
         execution_runner.execution.browsers = ['chrome']
         execution_runner.execution.envs = []
         execution_list = execution_runner._define_execution_list()
-        expected_list = [
-            SimpleNamespace(name='test_001', data_set={}, secrets={}, browser='chrome',
-                            reportdir=None, env=None, set_name='')
-        ]
-        assert execution_list == expected_list
+        assert len(execution_list) == 1
+        assert execution_list[0].data_set.load() == {}
+        expected = SimpleNamespace(name='test_001', data_set=execution_list[0].data_set,
+                                   secrets={}, browser='chrome', reportdir=None, env=None,
+                                   set_name='')
+        assert execution_list[0] == expected
 
     @pytest.mark.slow
     def test_define_execution_list_multiple_data_sets(self, project_function_clean):
@@ -234,9 +235,9 @@ class TestDefineExecutionList:
         execution_runner.execution.browsers = ['chrome']
         execution_runner.execution.envs = []
         execution_list = execution_runner._define_execution_list()
-        assert execution_list[0].data_set == {'col1': 'a', 'col2': 'b'}
+        assert execution_list[0].data_set.load() == {'col1': 'a', 'col2': 'b'}
         assert isinstance(execution_list[0].set_name, str) and execution_list[0].set_name != ''
-        assert execution_list[1].data_set == {'col1': 'c', 'col2': 'd'}
+        assert execution_list[1].data_set.load() == {'col1': 'c', 'col2': 'd'}
         assert isinstance(execution_list[1].set_name, str) and execution_list[1].set_name != ''
 
     @pytest.mark.slow
@@ -269,11 +270,11 @@ class TestDefineExecutionList:
         execution_runner.execution.envs = []
         exec_list = execution_runner._define_execution_list()
         assert exec_list[0].name == 'test_one_001'
-        assert exec_list[0].data_set == {'col1': 'a', 'col2': 'b'}
+        assert exec_list[0].data_set.load() == {'col1': 'a', 'col2': 'b'}
         assert exec_list[1].name == 'test_one_001'
-        assert exec_list[1].data_set == {'col1': 'c', 'col2': 'd'}
+        assert exec_list[1].data_set.load() == {'col1': 'c', 'col2': 'd'}
         assert exec_list[2].name == 'test_two_001'
-        assert exec_list[2].data_set == {}
+        assert exec_list[2].data_set.load() == {}
 
     @pytest.mark.slow
     def test_define_execution_list_multiple_envs(self, project_function_clean):
@@ -297,9 +298,9 @@ class TestDefineExecutionList:
         execution_runner.execution.browsers = ['chrome']
         execution_runner.execution.envs = ['stage', 'preview']
         exec_list = execution_runner._define_execution_list()
-        assert exec_list[0].data_set == {'env': {'url': 'xxx', 'name': 'stage'}}
+        assert exec_list[0].data_set.load() == {'env': {'url': 'xxx', 'name': 'stage'}}
         assert exec_list[0].env == 'stage'
-        assert exec_list[1].data_set == {'env': {'url': 'yyy', 'name': 'preview'}}
+        assert exec_list[1].data_set.load() == {'env': {'url': 'yyy', 'name': 'preview'}}
         assert exec_list[1].env == 'preview'
 
     @pytest.mark.slow
@@ -366,29 +367,29 @@ class TestDefineExecutionList:
         execution_runner.execution.envs = ['stage', 'preview']
         ex = execution_runner._define_execution_list()
         assert ex[0].browser == 'chrome' and ex[0].env == 'stage' and \
-               ex[0].data_set == {'col1': 'a', 'env': {'url': 'xxx', 'name': 'stage'}}
+               ex[0].data_set.load() == {'col1': 'a', 'env': {'url': 'xxx', 'name': 'stage'}}
         assert ex[1].browser == 'firefox' and ex[1].env == 'stage' and \
-               ex[1].data_set == {'col1': 'a', 'env': {'url': 'xxx', 'name': 'stage'}}
+               ex[1].data_set.load() == {'col1': 'a', 'env': {'url': 'xxx', 'name': 'stage'}}
         assert ex[2].browser == 'chrome' and ex[2].env == 'preview' and \
-               ex[2].data_set == {'col1': 'a', 'env': {'url': 'yyy', 'name': 'preview'}}
+               ex[2].data_set.load() == {'col1': 'a', 'env': {'url': 'yyy', 'name': 'preview'}}
         assert ex[3].browser == 'firefox' and ex[3].env == 'preview' and \
-               ex[3].data_set == {'col1': 'a', 'env': {'url': 'yyy', 'name': 'preview'}}
+               ex[3].data_set.load() == {'col1': 'a', 'env': {'url': 'yyy', 'name': 'preview'}}
         assert ex[4].browser == 'chrome' and ex[4].env == 'stage' and \
-               ex[4].data_set == {'col1': 'b', 'env': {'url': 'xxx', 'name': 'stage'}}
+               ex[4].data_set.load() == {'col1': 'b', 'env': {'url': 'xxx', 'name': 'stage'}}
         assert ex[5].browser == 'firefox' and ex[5].env == 'stage' and \
-               ex[5].data_set == {'col1': 'b', 'env': {'url': 'xxx', 'name': 'stage'}}
+               ex[5].data_set.load() == {'col1': 'b', 'env': {'url': 'xxx', 'name': 'stage'}}
         assert ex[6].browser == 'chrome' and ex[6].env == 'preview' and \
-               ex[6].data_set == {'col1': 'b', 'env': {'url': 'yyy', 'name': 'preview'}}
+               ex[6].data_set.load() == {'col1': 'b', 'env': {'url': 'yyy', 'name': 'preview'}}
         assert ex[7].browser == 'firefox' and ex[7].env == 'preview' and \
-               ex[7].data_set == {'col1': 'b', 'env': {'url': 'yyy', 'name': 'preview'}}
+               ex[7].data_set.load() == {'col1': 'b', 'env': {'url': 'yyy', 'name': 'preview'}}
         assert ex[8].browser == 'chrome' and ex[8].env == 'stage' and \
-               ex[8].data_set == {'env': {'url': 'xxx', 'name': 'stage'}}
+               ex[8].data_set.load() == {'env': {'url': 'xxx', 'name': 'stage'}}
         assert ex[9].browser == 'firefox' and ex[9].env == 'stage' and \
-               ex[9].data_set == {'env': {'url': 'xxx', 'name': 'stage'}}
+               ex[9].data_set.load() == {'env': {'url': 'xxx', 'name': 'stage'}}
         assert ex[10].browser == 'chrome' and ex[10].env == 'preview' and \
-               ex[10].data_set == {'env': {'url': 'yyy', 'name': 'preview'}}
+               ex[10].data_set.load() == {'env': {'url': 'yyy', 'name': 'preview'}}
         assert ex[11].browser == 'firefox' and ex[11].env == 'preview' and \
-               ex[11].data_set == {'env': {'url': 'yyy', 'name': 'preview'}}
+               ex[11].data_set.load() == {'env': {'url': 'yyy', 'name': 'preview'}}
 
     @pytest.mark.slow
     def test_define_execution_list_with_secrets(self, project_function_clean):
@@ -407,7 +408,9 @@ class TestDefineExecutionList:
         execution_runner.execution.envs = []
         execution_list = execution_runner._define_execution_list()
         expected_list = [
-            SimpleNamespace(name='test_001', data_set={}, secrets={"a": "secret", "b": "secret02"}, browser='chrome', reportdir=None, env=None, set_name='')
+            SimpleNamespace(name='test_001', data_set=execution_list[0].data_set,
+                            secrets={"a": "secret", "b": "secret02"}, browser='chrome',
+                            reportdir=None, env=None, set_name='')
         ]
         assert execution_list == expected_list
 
@@ -681,6 +684,92 @@ class TestRunDirectory:
         assert data['total_tests'] == 1
 
 
+class TestRunInParallel:
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('persistent_workers', [False, True])
+    def test_run_in_parallel(self, project_function, test_utils, capsys, persistent_workers):
+        _, project = project_function.activate()
+        session.settings = settings_manager.get_project_settings(project)
+        session.settings['persistent_workers'] = persistent_workers
+        test_utils.create_test(project, 'test01')
+        test_utils.create_test(project, 'test02')
+        test_utils.create_test(project, 'test03', content='def test(data):\n    assert False\n')
+        timestamp = utils.get_timestamp()
+        execution_runner = exc_runner.ExecutionRunner(project, browsers=['chrome'],
+                                                      timestamp=timestamp, processes=2)
+        with pytest.raises(SystemExit):
+            execution_runner.run_directory('')
+        out, err = capsys.readouterr()
+        assert 'Progress: 3/3 sets' in out
+        assert execution_runner.execution.totals.by_result() == {'success': 2, 'failure': 1}
+        data = exec_report.get_execution_data(project=project, execution='all', timestamp=timestamp)
+        assert data['total_tests'] == 3
+        assert data['totals_by_result'] == {'success': 2, 'failure': 1}
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('persistent_workers', [False, True])
+    def test_run_in_parallel_with_data_envs_and_secrets(self, project_function, test_utils,
+                                                        persistent_workers):
+        _, project = project_function.activate()
+        session.settings = settings_manager.get_project_settings(project)
+        session.settings['persistent_workers'] = persistent_workers
+        environment_manager.save_environments(project, json.dumps({'stage': {'url': 'xxx'}}))
+        with open(os.path.join(project_function.path, 'secrets.json'), 'w') as f:
+            f.write(json.dumps({'password': 'abc'}))
+        content = ('def test(data):\n'
+                   '    assert data.env.url == "xxx"\n'
+                   '    assert data.col1 in ("a", "b")\n'
+                   '    assert get_secrets().password == "abc"\n')
+        test_utils.create_test(project, 'test01', content=content)
+        test_data.save_csv_test_data(project, 'test01', [{'col1': 'a'}, {'col1': 'b'}])
+        timestamp = utils.get_timestamp()
+        execution_runner = exc_runner.ExecutionRunner(project, browsers=['chrome'],
+                                                      timestamp=timestamp, processes=2,
+                                                      environments=['stage'])
+        execution_runner.run_directory('')
+        data = exec_report.get_execution_data(project=project, execution='all', timestamp=timestamp)
+        assert data['totals_by_result'] == {'success': 2}
+
+
+class TestRunWithMaxFailures:
+
+    @pytest.mark.slow
+    def test_run_with_max_failures(self, project_function, test_utils, capsys):
+        _, project = project_function.activate()
+        session.settings = settings_manager.get_project_settings(project)
+        for name in ['test01', 'test02', 'test03']:
+            test_utils.create_test(project, name, content='def test(data):\n    assert False\n')
+        timestamp = utils.get_timestamp()
+        execution_runner = exc_runner.ExecutionRunner(project, browsers=['chrome'],
+                                                      timestamp=timestamp, max_failures=2)
+        with pytest.raises(SystemExit):
+            execution_runner.run_directory('')
+        out, err = capsys.readouterr()
+        assert 'Execution stopped after 2 failed tests, 1 test sets were not run' in out
+        data = exec_report.get_execution_data(project=project, execution='all', timestamp=timestamp)
+        assert data['totals_by_result'] == {'failure': 2, 'not run': 1}
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('persistent_workers', [False, True])
+    def test_run_in_parallel_with_max_failures(self, project_function, test_utils,
+                                               persistent_workers):
+        _, project = project_function.activate()
+        session.settings = settings_manager.get_project_settings(project)
+        session.settings['persistent_workers'] = persistent_workers
+        for name in ['test01', 'test02', 'test03', 'test04']:
+            test_utils.create_test(project, name, content='def test(data):\n    assert False\n')
+        timestamp = utils.get_timestamp()
+        execution_runner = exc_runner.ExecutionRunner(project, browsers=['chrome'],
+                                                      timestamp=timestamp, processes=2,
+                                                      max_failures=1)
+        with pytest.raises(SystemExit):
+            execution_runner.run_directory('')
+        data = exec_report.get_execution_data(project=project, execution='all', timestamp=timestamp)
+        # the two test sets started at the same time finish
+        assert data['totals_by_result'] == {'failure': 2, 'not run': 2}
+
+
 class TestRunWithEnvs:
 
     @pytest.mark.slow
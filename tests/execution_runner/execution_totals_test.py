@@ -0,0 +1,56 @@
+import multiprocessing
+
+from golem.execution_runner.execution_totals import ExecutionTotals
+from golem.test_runner.conf import ResultsEnum
+
+
+def _add_results(execution_totals, results):
+    for result in results:
+        execution_totals.add_result(result)
+
+
+class TestExecutionTotals:
+
+    def test_add_result(self):
+        totals = ExecutionTotals()
+        assert totals.total == 0
+        assert totals.by_result() == {}
+        assert not totals.has_failed
+        totals.add_result(ResultsEnum.SUCCESS)
+        totals.add_result(ResultsEnum.SUCCESS)
+        totals.add_result(ResultsEnum.SKIPPED)
+        assert totals.total == 3
+        assert totals.by_result() == {ResultsEnum.SUCCESS: 2, ResultsEnum.SKIPPED: 1}
+        assert not totals.has_failed
+
+    def test_add_result_failed(self):
+        for result in [ResultsEnum.FAILURE, ResultsEnum.ERROR, ResultsEnum.CODE_ERROR]:
+            totals = ExecutionTotals()
+            totals.add_result(result)
+            assert totals.has_failed
+
+    def test_failures(self):
+        totals = ExecutionTotals()
+        for result in [ResultsEnum.SUCCESS, ResultsEnum.FAILURE, ResultsEnum.ERROR,
+                       ResultsEnum.CODE_ERROR, ResultsEnum.SKIPPED]:
+            totals.add_result(result)
+        assert totals.failures == 3
+
+    def test_has_failed_setter(self):
+        totals = ExecutionTotals()
+        totals.has_failed = True
+        assert totals.has_failed
+        assert totals.total == 0
+
+    def test_totals_are_shared_with_child_processes(self):
+        totals = ExecutionTotals()
+        processes = []
+        for _ in range(3):
+            args = (totals, [ResultsEnum.SUCCESS] * 10 + [ResultsEnum.FAILURE])
+            process = multiprocessing.Process(target=_add_results, args=args)
+            process.start()
+            processes.append(process)
+        for process in processes:
+            process.join()
+        assert totals.by_result() == {ResultsEnum.SUCCESS: 30, ResultsEnum.FAILURE: 3}
+        assert totals.has_failed
@@ -0,0 +1,29 @@
+import pickle
+from types import SimpleNamespace
+
+from golem.core.test_data import DataSet
+from golem.execution_runner import multiprocess_executor
+
+
+class TestRunConstants:
+
+    def test_task_descriptor(self):
+        run = multiprocess_executor.RunConstants('testdir', 'project', {}, {'a': 'b'},
+                                                 None, [], False)
+        env_data = {'url': 'xxx', 'name': 'stage'}
+        browser = {'name': 'chrome', 'capabilities': {}}
+        data_set = DataSet('value', data={'col1': 'a'}).with_values(env=env_data)
+        test = SimpleNamespace(name='test01', data_set=data_set, secrets={'a': 'b'},
+                               browser=browser, reportdir='/reportdir', env='stage',
+                               set_name='abc')
+        task = run.task_descriptor(test)
+        other_task = run.task_descriptor(SimpleNamespace(**dict(vars(test), browser=dict(browser))))
+        assert task.browser == other_task.browser == 0
+        assert task.reportdir == 0
+        assert run.browsers == [browser]
+        assert run.reportdirs == ['/reportdir']
+        assert run.envs == {'stage': env_data}
+        assert task.data_set.load() == {'col1': 'a'}
+        # the descriptor does not include the environment data
+        task = pickle.loads(pickle.dumps(task))
+        assert (task.name, task.env, task.set_name) == ('test01', 'stage', 'abc')
@@ -0,0 +1,65 @@
+import multiprocessing
+
+from golem.execution_runner.results_collector import ResultsCollector
+
+
+def _report(test, result, test_file='test_file', set_name=''):
+    return {'test_file': test_file, 'set_name': set_name, 'test': test, 'result': result}
+
+
+def _send_reports(queue, reports):
+    for report in reports:
+        queue.put(report)
+
+
+class TestResultsCollector:
+
+    def test_pending_reports_are_replaced(self):
+        collector = ResultsCollector()
+        collector.add_pending([_report('test_one', 'pending'), _report('test_two', 'pending')])
+        collector.add(_report('test_two', 'success'))
+        collector.add(_report('setup', 'code error'))
+        results = [(r['test'], r['result']) for r in collector.reports]
+        assert results == [('test_one', 'pending'), ('test_two', 'success'),
+                           ('setup', 'code error')]
+
+    def test_add_pending_does_not_replace_results(self):
+        collector = ResultsCollector()
+        collector.add(_report('test_one', 'success'))
+        collector.add_pending([_report('test_one', 'pending')])
+        assert collector.reports == [_report('test_one', 'success')]
+
+    def test_pending_reports_define_the_order(self):
+        collector = ResultsCollector()
+        collector.add(_report('test_two', 'success'))
+        collector.add(_report('setup', 'code error'))
+        collector.add_pending([_report('test_one', 'pending'), _report('test_two', 'pending')])
+        results = [(r['test'], r['result']) for r in collector.reports]
+        assert results == [('test_one', 'pending'), ('test_two', 'success'),
+                           ('setup', 'code error')]
+
+    def test_sets_are_collected_separately(self):
+        collector = ResultsCollector()
+        collector.add(_report('test', 'success', set_name='abc'))
+        collector.add(_report('test', 'failure', set_name='def'))
+        assert len(collector.reports) == 2
+
+    def test_reports_from_child_processes(self):
+        collector = ResultsCollector()
+        collector.start()
+        processes = []
+        for test_file in ['one', 'two']:
+            reports = [_report(f'test{i}', 'success', test_file=test_file) for i in range(50)]
+            process = multiprocessing.Process(target=_send_reports,
+                                              args=(collector.queue, reports))
+            process.start()
+            processes.append(process)
+        for process in processes:
+            process.join()
+        collector.stop()
+        assert len(collector.reports) == 100
+
+    def test_stop_without_start(self):
+        collector = ResultsCollector()
+        collector.stop()
+        assert collector.reports == []
@@ -0,0 +1,144 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from golem.core.project import Project
+from golem.execution_runner import scheduler
+
+
+def _create_execution_report(project, execution, timestamp, tests):
+    path = os.path.join(Project(project).report_directory_path, execution, timestamp)
+    os.makedirs(path)
+    with open(os.path.join(path, 'report.json'), 'w') as f:
+        json.dump({'tests': tests}, f)
+
+
+def _test(test_file, elapsed_time, set_name='', test='test'):
+    return {'test_file': test_file, 'test': test, 'set_name': set_name,
+            'elapsed_time': elapsed_time}
+
+
+class TestGetTestDurations:
+
+    def test_get_test_durations(self, project_function):
+        _, project = project_function.activate()
+        _create_execution_report(project, 'suite01', '2021.01.01.10.00.00.000', [
+            _test('test_a', 10),
+            _test('test_b', 1, test='test_one'),
+            _test('test_b', 2, test='test_two'),
+        ])
+        _create_execution_report(project, 'suite01', '2021.01.02.10.00.00.000', [
+            _test('test_a', 20),
+            _test('test_b', 3, test='test_one'),
+            _test('test_b', None, test='test_two'),
+        ])
+        durations = scheduler.get_test_durations(project, 'suite01')
+        assert durations == {'test_a': 15, 'test_b': 3}
+
+    def test_get_test_durations_multiple_sets(self, project_function):
+        _, project = project_function.activate()
+        _create_execution_report(project, 'suite01', '2021.01.01.10.00.00.000', [
+            _test('test_a', 10, set_name='abc'),
+            _test('test_a', 20, set_name='def'),
+        ])
+        durations = scheduler.get_test_durations(project, 'suite01')
+        assert durations == {'test_a': 15}
+
+    def test_get_test_durations_unfinished_execution(self, project_function):
+        _, project = project_function.activate()
+        path = os.path.join(Project(project).report_directory_path, 'suite01', 'timestamp')
+        os.makedirs(path)
+        assert scheduler.get_test_durations(project, 'suite01') == {}
+
+    def test_get_test_durations_without_shards(self, project_function):
+        _, project = project_function.activate()
+        _create_execution_report(project, 'suite01', '2021.01.01.10.00.00.000', [
+            _test('test_a', 10),
+        ])
+        _create_execution_report(project, 'suite01', '2021.01.02.10.00.00.000', [
+            _test('test_a', 20),
+        ])
+        shard_path = os.path.join(Project(project).report_directory_path, 'suite01',
+                                  '2021.01.02.10.00.00.000', scheduler.SHARD_FILE)
+        with open(shard_path, 'w') as f:
+            json.dump({'index': 0, 'count': 2}, f)
+        assert scheduler.get_test_durations(project, 'suite01') == {'test_a': 15}
+        assert scheduler.get_test_durations(project, 'suite01',
+                                            include_shards=False) == {'test_a': 10}
+
+    def test_get_test_durations_no_history(self, project_function):
+        _, project = project_function.activate()
+        assert scheduler.get_test_durations(project, 'suite01') == {}
+
+
+class TestLongestFirst:
+
+    def test_longest_first(self):
+        execution_list = [SimpleNamespace(name=name) for name in ['a', 'b', 'c', 'd']]
+        durations = {'a': 1, 'b': 10, 'c': 4}
+        result = scheduler.longest_first(execution_list, durations)
+        # 'd' has no history, it uses the average (5)
+        assert [t.name for t in result] == ['b', 'd', 'c', 'a']
+
+    def test_longest_first_without_history(self):
+        execution_list = [SimpleNamespace(name=name) for name in ['a', 'b', 'c']]
+        result = scheduler.longest_first(execution_list, {})
+        assert [t.name for t in result] == ['a', 'b', 'c']
+
+
+class TestSchedule:
+
+    def test_schedule_file(self, project_function):
+        _, project = project_function.activate()
+        execution_list = [SimpleNamespace(name='b'), SimpleNamespace(name='a')]
+        assert scheduler.schedule(execution_list, project, 'suite01') == execution_list
+        assert scheduler.schedule(execution_list, project, 'suite01', 'file') == execution_list
+
+    def test_schedule_longest_first(self, project_function):
+        _, project = project_function.activate()
+        _create_execution_report(project, 'suite01', '2021.01.01.10.00.00.000', [
+            _test('a', 1), _test('b', 2)
+        ])
+        execution_list = [SimpleNamespace(name='a'), SimpleNamespace(name='b')]
+        result = scheduler.schedule(execution_list, project, 'suite01', 'longest-first')
+        assert [t.name for t in result] == ['b', 'a']
+
+    def test_schedule_invalid_strategy(self, project_function):
+        _, project = project_function.activate()
+        with pytest.raises(ValueError, match='invalid schedule strategy foo'):
+            scheduler.schedule([], project, 'suite01', 'foo')
+
+
+class TestShard:
+
+    def test_shard(self):
+        execution_list = [SimpleNamespace(name=name) for name in ['a', 'b', 'c', 'd', 'e']]
+        durations = {'a': 10, 'b': 6, 'c': 5, 'd': 4}
+        shards = [scheduler.shard(execution_list, durations, i, 2) for i in range(2)]
+        # 'e' has no history, it uses the average (6.25)
+        assert [t.name for t in shards[0]] == ['a', 'c']
+        assert [t.name for t in shards[1]] == ['b', 'd', 'e']
+
+    def test_shard_does_not_depend_on_the_order(self):
+        names = [f'test{i:02d}' for i in range(20)]
+        execution_list = [SimpleNamespace(name=name) for name in names]
+        shards = [scheduler.shard(execution_list, {}, i, 3) for i in range(3)]
+        reversed_shards = [scheduler.shard(execution_list[::-1], {}, i, 3) for i in range(3)]
+        assert [sorted(t.name for t in s) for s in shards] == \
+               [sorted(t.name for t in s) for s in reversed_shards]
+        # every test is in exactly one shard
+        assert sorted(t.name for s in shards for t in s) == names
+        assert [len(s) for s in shards] == [7, 7, 6]
+
+    def test_shard_keeps_the_sets_of_a_test_together(self):
+        execution_list = [SimpleNamespace(name=name, set_name=set_name)
+                          for name in ['a', 'b'] for set_name in ['1', '2', '3']]
+        shards = [scheduler.shard(execution_list, {}, i, 2) for i in range(2)]
+        assert [(t.name, t.set_name) for t in shards[0]] == [('a', '1'), ('a', '2'), ('a', '3')]
+        assert [(t.name, t.set_name) for t in shards[1]] == [('b', '1'), ('b', '2'), ('b', '3')]
+
+    def test_shard_invalid_index(self):
+        with pytest.raises(ValueError):
+            scheduler.shard([], {}, 2, 2)
@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import types
+
+import pytest
+
+from golem import execution
+from golem.execution_runner import worker_pool
+
+
+def _write_pid(directory, name):
+    with open(os.path.join(directory, name), 'w') as f:
+        f.write(str(os.getpid()))
+
+
+def _write_pid_or_crash(directory, name):
+    if name == 'crash':
+        os._exit(1)
+    time.sleep(0.1)
+    _write_pid(directory, name)
+
+
+def _read_pids(directory):
+    pids = []
+    for filename in os.listdir(directory):
+        with open(os.path.join(directory, filename)) as f:
+            pids.append(f.read())
+    return pids
+
+
+class TestPersistentWorkerPool:
+
+    @pytest.mark.slow
+    def test_workers_run_many_tasks(self, dir_function):
+        tasks = [(i, (dir_function.path, f'task{i}')) for i in range(6)]
+        finished = []
+        pool = worker_pool.PersistentWorkerPool(2, _write_pid)
+        pool.run(tasks, callback=finished.append)
+        assert sorted(finished) == list(range(6))
+        pids = _read_pids(dir_function.path)
+        assert len(pids) == 6
+        assert len(set(pids)) <= 2
+
+    @pytest.mark.slow
+    def test_workers_are_recycled_after_max_tests(self, dir_function):
+        tasks = [(i, (dir_function.path, f'task{i}')) for i in range(4)]
+        pool = worker_pool.PersistentWorkerPool(1, _write_pid, max_tests=2)
+        pool.run(tasks)
+        pids = _read_pids(dir_function.path)
+        assert len(set(pids)) == 2
+
+    @pytest.mark.slow
+    def test_less_tasks_than_processes(self, dir_function):
+        tasks = [(0, (dir_function.path, 'task0'))]
+        pool = worker_pool.PersistentWorkerPool(3, _write_pid)
+        pool.run(tasks)
+        assert len(_read_pids(dir_function.path)) == 1
+
+
+    @pytest.mark.slow
+    def test_stop(self, dir_function):
+        tasks = [(i, (dir_function.path, f'task{i}')) for i in range(6)]
+        finished = []
+        pool = worker_pool.PersistentWorkerPool(2, _write_pid)
+        pool.run(tasks, callback=finished.append, stop=lambda: len(finished) >= 3)
+        # the two running tasks finish, no task is started after the third one
+        assert 3 <= len(finished) <= 4
+        assert len(_read_pids(dir_function.path)) == len(finished)
+
+    @pytest.mark.slow
+    def test_crashed_worker_is_noticed_while_others_finish_tasks(self, dir_function, capsys):
+        tasks = [(0, (dir_function.path, 'crash'))]
+        tasks += [(i, (dir_function.path, f'task{i}')) for i in range(1, 20)]
+        finished = []
+        pool = worker_pool.PersistentWorkerPool(2, _write_pid_or_crash)
+        pool.run(tasks, callback=finished.append)
+        assert sorted(finished) == list(range(20))
+        # the crash is reported before the other tasks are done
+        assert finished.index(0) < 10
+        assert 'exited unexpectedly while running task 0' in capsys.readouterr().out
+        assert len(_read_pids(dir_function.path)) == 19
+
+
+class TestResetWorkerState:
+
+    def test_reset_worker_state(self):
+        base_modules = set(sys.modules)
+        base_sys_path = list(sys.path)
+        execution.test_file = 'test_one'
+        execution.steps = [{'message': 'step'}]
+        sys.modules['projects.foo.pages.bar'] = types.ModuleType('bar')
+        sys.path.append('/some/project/path')
+        worker_pool.reset_worker_state(base_modules, base_sys_path)
+        assert execution.test_file is None
+        assert execution.steps == []
+        assert 'projects.foo.pages.bar' not in sys.modules
+        assert sys.path == base_sys_path
+
+
+class TestGetRssMb:
+
+    def test_get_rss_mb(self):
+        rss = worker_pool.get_rss_mb()
+        assert rss is None or rss > 0
@@ -1,3 +1,4 @@
+import json
 import os
 
 import pytest
@@ -19,6 +20,7 @@ class TestGolemHelp:
         ('golem -h createtest', messages.CREATETEST_USAGE_MSG),
         ('golem -h createsuite', messages.CREATESUITE_USAGE_MSG),
         ('golem -h createsuperuser', messages.CREATESUPERUSER_USAGE_MSG),
+        ('golem -h mergereports', messages.MERGEREPORTS_USAGE_MSG),
         ('golem run -h', messages.RUN_USAGE_MSG),
         ('golem gui -h', messages.GUI_USAGE_MSG),
     ]
@@ -235,6 +237,61 @@ class TestGolemRun:
         assert os.path.isfile(os.path.join(reportdir, 'foo.xml'))
         assert os.path.isfile(os.path.join(reportdir, 'foo.json'))
 
+    @pytest.mark.slow
+    def test_golem_run_shards_and_merge_reports(self, project_function, test_utils):
+        testdir, project = project_function.activate()
+        for name in ['test1', 'test2', 'test3']:
+            test_utils.create_test(project, name=name)
+        os.chdir(testdir)
+        reportsdir = os.path.join(testdir, 'projects', project, 'reports', 'all')
+        for i in range(2):
+            result = test_utils.run_command(f'golem run {project} . --shard-index {i} '
+                                            f'--shard-count 2 --timestamp shard{i}')
+            assert f'Shard {i} of 2 (0 to 1)' in result
+        shard_tests = [sorted(next(os.walk(os.path.join(reportsdir, f'shard{i}')))[1])
+                       for i in range(2)]
+        assert shard_tests == [['test1', 'test3'], ['test2']]
+        test_utils.run_command(f'golem mergereports {project} all shard0 shard1 -r junit '
+                               f'--timestamp merged')
+        reportdir = os.path.join(reportsdir, 'merged')
+        assert os.path.isfile(os.path.join(reportdir, 'report.xml'))
+        with open(os.path.join(reportdir, 'report.json')) as f:
+            assert json.load(f)['total_tests'] == 3
+
+    @pytest.mark.slow
+    def test_golem_run_shard_index_without_shard_count(self, project_session, test_utils):
+        testdir, project = project_session.activate()
+        os.chdir(testdir)
+        result = test_utils.run_command(f'golem run {project} . --shard-index 0')
+        assert result == ('golem run: error: --shard-index and --shard-count '
+                          'must be used together')
+        result = test_utils.run_command(f'golem run {project} . --shard-index 2 --shard-count 2')
+        assert result == 'golem run: error: --shard-index must be between 0 and 1'
+
+    @pytest.mark.slow
+    def test_golem_run_coordinator_without_token(self, project_session, test_utils,
+                                                 monkeypatch):
+        monkeypatch.delenv('GOLEM_COORDINATOR_TOKEN', raising=False)
+        testdir, project = project_session.activate()
+        os.chdir(testdir)
+        result = test_utils.run_command(f'golem run {project} . --coordinator 127.0.0.1:0')
+        assert result == ('golem run: error: the GOLEM_COORDINATOR_TOKEN environment '
+                          'variable is required by --coordinator')
+        result = test_utils.run_command('golem agent 127.0.0.1:8123')
+        assert result == ('golem agent: error: the GOLEM_COORDINATOR_TOKEN environment '
+                          'variable is required')
+
+    @pytest.mark.slow
+    def test_golem_run_fail_fast(self, project_function, test_utils):
+        testdir, project = project_function.activate()
+        for name in ['test1', 'test2']:
+            test_utils.create_test(project, name=name, content='def test(data):\n    assert False\n')
+        os.chdir(testdir)
+        result = test_utils.run_command(f'golem run {project} . --fail-fast')
+        assert 'Execution stopped after 1 failed tests, 1 test sets were not run' in result
+        result = test_utils.run_command(f'golem run {project} . --max-failures 0')
+        assert result == 'golem run: error: --max-failures must be greater than 0'
+
     @pytest.mark.slow
     def test_golem_run__cli_log_level_arg(self, project_session, test_utils):
         """Set cli-log-level arg, overrides default level (INFO)"""
@@ -1,5 +1,7 @@
 import pytest
 
+from golem.report import cli_report
+
 
 SUCCESS_MESSAGE = 'Test Result: SUCCESS'
 
@@ -44,3 +46,24 @@ class TestReportToCli:
         assert lines[-3] == 'AssertionError'
         assert lines[-2] == ''
         assert 'Total: 2 tests, 1 success, 1 failure in' in lines[-1]
+
+
+class TestPrintProgress:
+
+    def test_print_progress(self, capsys):
+        cli_report.print_progress(3, 10, {'success': 5, 'failure': 1})
+        out, err = capsys.readouterr()
+        assert out == 'Progress: 3/10 sets, 5 success, 1 failure\n'
+
+    def test_print_progress_no_results(self, capsys):
+        cli_report.print_progress(0, 2, {})
+        out, err = capsys.readouterr()
+        assert out == 'Progress: 0/2 sets\n'
+
+
+class TestPrintReportTimings:
+
+    def test_print_report_timings(self, capsys):
+        cli_report.print_report_timings([('junit', 0.12), ('html', 1.5)])
+        out, err = capsys.readouterr()
+        assert out == 'Reports: junit 0.12s, html 1.5s\n'
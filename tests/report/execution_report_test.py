@@ -1,10 +1,13 @@
 import json
 import os
 
+import pytest
+
 from golem.core import utils
 from golem.execution_runner.execution_runner import define_browsers
 from golem.report.execution_report import generate_execution_report
 from golem.report.execution_report import get_execution_data
+from golem.report.execution_report import merge_executions
 from golem.report.execution_report import _parse_execution_data
 from golem.report.execution_report import save_execution_json_report
 from golem.report.execution_report import create_execution_directory
@@ -112,6 +115,73 @@ class TestGenerateExecutionReport:
         assert reprt['params'] == expected_params
         assert os.path.isfile(execution['report_path'])
 
+    def test_generate_execution_report_from_collected_tests(self, dir_function):
+        browsers = define_browsers(['chrome'], [], ['chrome'], [])
+        tests = [
+            {'test_file': 'foo', 'test': 'test_one', 'set_name': '', 'result': 'success'},
+            {'test_file': 'foo', 'test': 'test_two', 'set_name': '', 'result': 'pending'}
+        ]
+        reprt = generate_execution_report(dir_function.path, 10, browsers, 1, [], [], '',
+                                          tests=tests)
+        assert reprt['total_tests'] == 2
+        assert reprt['totals_by_result'] == {'success': 1, 'not run': 1}
+        assert [t['result'] for t in reprt['tests']] == ['success', 'not run']
+        with open(os.path.join(dir_function.path, 'report.json')) as f:
+            assert json.load(f)['total_tests'] == 2
+
+
+class TestMergeExecutions:
+
+    def test_merge_executions(self, dir_function):
+        browsers = define_browsers(['chrome'], [], ['chrome'], [])
+        shard_dirs = []
+        for i, (test_file, result) in enumerate([('foo', 'success'), ('bar', 'failure')]):
+            shard_dir = os.path.join(dir_function.path, f'shard{i}')
+            test_file_dir = os.path.join(shard_dir, test_file)
+            os.makedirs(os.path.join(test_file_dir, 'test_one'))
+            with open(os.path.join(test_file_dir, 'test_one', 'screenshot.png'), 'wb') as f:
+                f.write(b'png')
+            report = {'test_file': test_file, 'test': 'test_one', 'set_name': '',
+                      'result': result}
+            with open(os.path.join(test_file_dir, 'report.jsonl'), 'w') as f:
+                f.write(json.dumps(report) + '\n')
+            generate_execution_report(shard_dir, 10 * (i + 1), browsers, 2, ['stage'],
+                                      [f'tag{i}'], '', tests=[report])
+            shard_dirs.append(shard_dir)
+        merged_dir = os.path.join(dir_function.path, 'merged')
+        data = merge_executions(shard_dirs, merged_dir)
+        assert data['total_tests'] == 2
+        assert data['totals_by_result'] == {'success': 1, 'failure': 1}
+        assert data['net_elapsed_time'] == 20
+        assert data['params']['browsers'] == browsers
+        assert data['params']['processes'] == 4
+        assert data['params']['environments'] == ['stage']
+        assert data['params']['tags'] == ['tag0', 'tag1']
+        assert os.path.isfile(os.path.join(merged_dir, 'bar', 'test_one', 'screenshot.png'))
+        assert get_execution_data(merged_dir)['total_tests'] == 2
+
+    def test_merge_executions_same_test_file(self, dir_function):
+        browsers = define_browsers(['chrome'], [], ['chrome'], [])
+        execution_dirs = []
+        for i in range(2):
+            execution_dir = os.path.join(dir_function.path, f'execution{i}')
+            test_file_dir = os.path.join(execution_dir, 'foo')
+            os.makedirs(os.path.join(test_file_dir, 'test_one'))
+            report = {'test_file': 'foo', 'test': 'test_one', 'set_name': '',
+                      'result': 'success'}
+            with open(os.path.join(test_file_dir, 'report.jsonl'), 'w') as f:
+                f.write(json.dumps(report) + '\n')
+            os.makedirs(os.path.join(execution_dir, 'screenshots'))
+            generate_execution_report(execution_dir, 10, browsers, 1, [], [], '',
+                                      tests=[report])
+            execution_dirs.append(execution_dir)
+        merged_dir = os.path.join(dir_function.path, 'merged')
+        with pytest.raises(ValueError) as excinfo:
+            merge_executions(execution_dirs, merged_dir)
+        assert str(excinfo.value) == (f'the reports of test file foo are found in '
+                                      f'{execution_dirs[0]} and {execution_dirs[1]}')
+        assert not os.path.exists(merged_dir)
+
 
 class TestSaveExecutionJsonReport:
 
@@ -18,3 +18,47 @@ class TestGenerateHTMLReport:
         assert os.path.isfile(html_path)
         with open(html_path, encoding='utf-8') as f:
             assert f.read() == html
+
+
+class TestGenerateHTMLReportDirectory:
+
+    def test_generate_html_report_directory(self, project_class, test_utils):
+        _, project = project_class.activate()
+        execution = test_utils.execute_random_suite(project)
+
+        path = html_report.generate_html_report_directory(
+            project, execution['suite_name'], execution['timestamp'])
+
+        assert path == os.path.join(execution['exec_dir'], 'report')
+        with open(os.path.join(path, 'index.html'), encoding='utf-8') as f:
+            index = f.read()
+        assert 'assets/tests/0.js' in index
+        with open(os.path.join(path, 'assets', 'tests', '0.js'), encoding='utf-8') as f:
+            chunk = f.read()
+        test_id = f"{execution['tests'][0]}.test"
+        assert chunk.startswith(f'DetailTable.testChunkLoaded("{test_id}", {{')
+
+    def test_generate_html_report_directory_screenshots(self, project_class, test_utils):
+        _, project = project_class.activate()
+        test_name = test_utils.random_string()
+        content = ('import os\n'
+                   'from golem import execution\n'
+                   'def test(data):\n'
+                   '    execution.steps.append({"message": "step", "error": None,\n'
+                   '                            "screenshot": "step_1a2b3.png"})\n'
+                   '    path = os.path.join(execution.test_reportdir, "step_1a2b3.png")\n'
+                   '    with open(path, "wb") as f:\n'
+                   '        f.write(b"image")\n')
+        test_utils.create_test(project, test_name, content)
+        suite_name = test_utils.random_string()
+        test_utils.create_suite(project, suite_name, tests=[test_name])
+        execution = test_utils.execute_suite(project, suite_name)
+
+        path = html_report.generate_html_report_directory(
+            project, suite_name, execution['timestamp'], report_name='foo')
+
+        image_path = os.path.join(path, 'assets', 'images', '0-step_1a2b3.png')
+        with open(image_path, 'rb') as f:
+            assert f.read() == b'image'
+        with open(os.path.join(path, 'assets', 'tests', '0.js'), encoding='utf-8') as f:
+            assert '"screenshot": "assets/images/0-step_1a2b3.png"' in f.read()
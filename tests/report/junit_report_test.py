@@ -1,7 +1,7 @@
 import os
 import xml.etree.ElementTree as ET
 
-from golem.report.junit_report import generate_junit_report
+from golem.report.junit_report import generate_junit_report, write_junit_report
 
 
 class TestGenerateJunitReport:
@@ -133,3 +133,28 @@ class TestGenerateJunitReport:
 
         xml_path = os.path.join(execution['exec_dir'], 'report.xml')
         assert os.path.isfile(xml_path)
+
+
+class TestWriteJunitReport:
+
+    def test_write_junit_report_log_lines(self, project_class, test_utils):
+        _, project = project_class.activate()
+        execution = test_utils.execute_random_suite(project)
+
+        path = write_junit_report(project, execution['suite_name'], execution['timestamp'],
+                                  log_lines=1)
+
+        assert path == os.path.join(execution['exec_dir'], 'report.xml')
+        system_out = ET.parse(path).getroot().find('testsuite/testcase/system-out')
+        assert len(system_out.text.splitlines()) == 1
+        assert 'INFO Test Result: SUCCESS' in system_out.text
+
+    def test_write_junit_report_without_logs(self, project_class, test_utils):
+        _, project = project_class.activate()
+        execution = test_utils.execute_random_suite(project)
+
+        path = write_junit_report(project, execution['suite_name'], execution['timestamp'],
+                                  log_lines=0)
+
+        testcase = ET.parse(path).getroot().find('testsuite/testcase')
+        assert testcase.find('system-out') is None
@@ -0,0 +1,42 @@
+from golem.report import execution_report
+from golem.report import test_report
+from golem.report.report_data import ReportData
+
+
+class TestReportData:
+
+    def test_test_detail(self, project_class, test_utils):
+        _, project = project_class.activate()
+        execution = test_utils.execute_random_suite(project)
+        report_data = ReportData(project, execution['suite_name'], execution['timestamp'])
+        test = report_data.execution_data['tests'][0]
+        expected = execution_report.function_test_execution_result(
+            project, execution['suite_name'], execution['timestamp'], test['test_file'],
+            test['test'], test['set_name'])
+        assert report_data.test_detail(test) == expected
+
+    def test_logs_are_read_once(self, project_class, test_utils, monkeypatch):
+        _, project = project_class.activate()
+        execution = test_utils.execute_random_suite(project)
+        calls = []
+
+        def get_test_debug_log(*args):
+            calls.append(args)
+            return ['line']
+        monkeypatch.setattr(test_report, 'get_test_debug_log', get_test_debug_log)
+        report_data = ReportData(project, execution['suite_name'], execution['timestamp'])
+        test = report_data.execution_data['tests'][0]
+        report_data.debug_log(test['test_file'], test['set_name'])
+        assert report_data.debug_log(test['test_file'], test['set_name']) == ['line']
+        assert len(calls) == 1
+
+    def test_execution_data_is_not_modified(self, project_class, test_utils):
+        _, project = project_class.activate()
+        execution = test_utils.execute_random_suite(project)
+        report_data = ReportData(project, execution['suite_name'], execution['timestamp'],
+                                 execution['exec_data'])
+        test = report_data.execution_data['tests'][0]
+        test_detail = report_data.test_detail(test, no_screenshots=True)
+        test_detail['steps'].append({})
+        assert 'debug_log' not in test
+        assert test_detail['steps'] != test['steps']
@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+
+from golem.core.project import Project
+from golem.report import report_index
+
+
+def _execution_data(total_tests=1, result='success'):
+    return {
+        'tests': [{'test': 'test', 'result': result}] * total_tests,
+        'params': {'browsers': [], 'processes': 1, 'environments': [], 'tags': [],
+                   'remote_url': ''},
+        'total_tests': total_tests,
+        'totals_by_result': {result: total_tests},
+        'net_elapsed_time': 1.5,
+        'has_finished': True
+    }
+
+
+class TestReportIndex:
+
+    def test_add_execution(self, project_function):
+        _, project = project_function.activate()
+        report_index.add_execution(project, 'suite01', 'timestamp01', _execution_data(3))
+        summaries = report_index.get_summaries(project)
+        assert summaries == {
+            ('suite01', 'timestamp01'): {
+                'params': {'browsers': [], 'processes': 1, 'environments': [], 'tags': [],
+                           'remote_url': ''},
+                'total_tests': 3,
+                'totals_by_result': {'success': 3},
+                'net_elapsed_time': 1.5,
+                'has_finished': True
+            }
+        }
+
+    def test_get_summaries_by_execution(self, project_function):
+        _, project = project_function.activate()
+        report_index.add_executions(project, [
+            ('suite01', 'timestamp01', _execution_data()),
+            ('suite02', 'timestamp01', _execution_data()),
+        ])
+        assert list(report_index.get_summaries(project, 'suite02')) == [('suite02', 'timestamp01')]
+
+    def test_get_summaries_without_index(self, project_function):
+        _, project = project_function.activate()
+        assert report_index.get_summaries(project) == {}
+
+    def test_remove_execution(self, project_function):
+        _, project = project_function.activate()
+        report_index.add_executions(project, [
+            ('suite01', 'timestamp01', _execution_data()),
+            ('suite01', 'timestamp02', _execution_data()),
+            ('suite02', 'timestamp01', _execution_data()),
+        ])
+        report_index.remove_execution(project, 'suite01', 'timestamp01')
+        assert len(report_index.get_summaries(project)) == 2
+        report_index.remove_execution(project, 'suite01')
+        assert list(report_index.get_summaries(project)) == [('suite02', 'timestamp01')]
+
+    def test_index_execution_directory(self, project_function, dir_function):
+        _, project = project_function.activate()
+        execution_directory = os.path.join(Project(project).report_directory_path,
+                                           'suite01', 'timestamp01')
+        assert report_index.index_execution_directory(execution_directory, _execution_data())
+        assert ('suite01', 'timestamp01') in report_index.get_summaries(project)
+        # directories outside of a project are not indexed
+        assert not report_index.index_execution_directory(dir_function.path, _execution_data())
+        assert not os.path.isfile(os.path.join(os.path.dirname(os.path.dirname(dir_function.path)),
+                                               report_index.INDEX_FILENAME))
+
+    def test_rebuild_index(self, project_function, test_utils):
+        _, project = project_function.activate()
+        execution = test_utils.execute_random_suite(project)
+        report_index.add_execution(project, 'deleted', 'timestamp01', _execution_data())
+        # unfinished execution
+        reports_path = Project(project).report_directory_path
+        os.makedirs(os.path.join(reports_path, 'suite01', 'timestamp01'))
+        assert report_index.rebuild_index(project) == 1
+        summaries = report_index.get_summaries(project)
+        assert list(summaries) == [(execution['suite_name'], execution['timestamp'])]
+
+    def test_rebuild_index_invalid_report(self, project_function, capsys):
+        _, project = project_function.activate()
+        path = os.path.join(Project(project).report_directory_path, 'suite01', 'timestamp01')
+        os.makedirs(path)
+        with open(os.path.join(path, 'report.json'), 'w') as f:
+            json.dump({}, f)
+        assert report_index.rebuild_index(project) == 0
+        out, err = capsys.readouterr()
+        assert 'ERROR: could not read' in out
+
+    def test_rebuild_index_without_reports(self, project_function):
+        _, project = project_function.activate()
+        shutil.rmtree(Project(project).report_directory_path, ignore_errors=True)
+        assert report_index.rebuild_index(project) == 0
+
+    def test_rebuild_index_replaces_the_index(self, project_function, test_utils, monkeypatch):
+        _, project = project_function.activate()
+        execution = test_utils.execute_random_suite(project)
+        reports_path = Project(project).report_directory_path
+        index_path = os.path.join(reports_path, report_index.INDEX_FILENAME)
+        assert os.path.isfile(index_path)
+        # the index exists until the new one replaces it
+        replace = os.replace
+        index_exists = []
+
+        def replace_index(src, dst):
+            index_exists.append(os.path.isfile(dst))
+            replace(src, dst)
+        monkeypatch.setattr(os, 'replace', replace_index)
+        assert report_index.rebuild_index(project) == 1
+        assert index_exists == [True]
+        assert not [f for f in os.listdir(reports_path) if f.endswith('.tmp')]
+        assert list(report_index.get_summaries(project)) == [
+            (execution['suite_name'], execution['timestamp'])]
+
+
+class TestGetTimestamps:
+
+    @staticmethod
+    def _make_old(*paths):
+        for path in paths:
+            os.utime(path, (1000000000, 1000000000))
+
+    def test_get_timestamps(self, project_function):
+        _, project = project_function.activate()
+        reports_path = Project(project).report_directory_path
+        for timestamp in ['timestamp01', 'timestamp02']:
+            os.makedirs(os.path.join(reports_path, 'suite01', timestamp))
+        os.makedirs(os.path.join(reports_path, 'suite02'))
+        timestamps = report_index.get_timestamps(project)
+        assert sorted(timestamps['suite01']) == ['timestamp01', 'timestamp02']
+        assert timestamps['suite02'] == []
+        # a timestamp is added, another one is removed
+        os.makedirs(os.path.join(reports_path, 'suite01', 'timestamp03'))
+        shutil.rmtree(os.path.join(reports_path, 'suite01', 'timestamp01'))
+        shutil.rmtree(os.path.join(reports_path, 'suite02'))
+        timestamps = report_index.get_timestamps(project)
+        assert list(timestamps) == ['suite01']
+        assert sorted(timestamps['suite01']) == ['timestamp02', 'timestamp03']
+
+    def test_get_timestamps_reads_changed_directories(self, project_function, monkeypatch):
+        _, project = project_function.activate()
+        reports_path = Project(project).report_directory_path
+        suite01 = os.path.join(reports_path, 'suite01')
+        suite02 = os.path.join(reports_path, 'suite02')
+        os.makedirs(os.path.join(suite01, 'timestamp01'))
+        os.makedirs(os.path.join(suite02, 'timestamp01'))
+        self._make_old(suite01, suite02)
+        synced = []
+        sync_execution = report_index._sync_execution
+        monkeypatch.setattr(report_index, '_sync_execution',
+                            lambda c, path, e, mtime: synced.append(e) or
+                            sync_execution(c, path, e, mtime))
+        report_index.get_timestamps(project)
+        assert sorted(synced) == ['suite01', 'suite02']
+        synced.clear()
+        report_index.get_timestamps(project)
+        assert synced == []
+        os.makedirs(os.path.join(suite02, 'timestamp02'))
+        timestamps = report_index.get_timestamps(project)
+        assert synced == ['suite02']
+        assert sorted(timestamps['suite02']) == ['timestamp01', 'timestamp02']
+
+    def test_get_timestamps_without_reports(self, project_function):
+        _, project = project_function.activate()
+        shutil.rmtree(Project(project).report_directory_path, ignore_errors=True)
+        assert report_index.get_timestamps(project) == {}
@@ -1,6 +1,7 @@
 import os
 
 from golem.report import report
+from golem.report import report_index
 from golem.core.project import Project
 
 
@@ -34,6 +35,44 @@ class TestGetLastExecutionTimestamps:
         assert last_exec[project][suite_name][1] == timestamp_first
 
 
+class TestGetExecutionSummaries:
+
+    def test_get_execution_summaries(self, project_function, test_utils):
+        _, project = project_function.activate()
+        execution = test_utils.execute_random_suite(project)
+        suite_name = execution['suite_name']
+        timestamp = execution['timestamp']
+        # the execution was indexed when it finished
+        assert (suite_name, timestamp) in report_index.get_summaries(project)
+        summaries = report.get_execution_summaries(project, {suite_name: [timestamp]})
+        summary = summaries[(suite_name, timestamp)]
+        assert summary['total_tests'] == 1
+        assert summary['has_finished'] is True
+        assert 'tests' not in summary
+
+    def test_get_execution_summaries_missing_from_index(self, project_function, test_utils):
+        _, project = project_function.activate()
+        execution = test_utils.execute_random_suite(project)
+        suite_name = execution['suite_name']
+        timestamp = execution['timestamp']
+        report_index.remove_execution(project, suite_name)
+        summaries = report.get_execution_summaries(project, {suite_name: [timestamp]})
+        assert summaries[(suite_name, timestamp)]['total_tests'] == 1
+        # finished execution was added to the index
+        assert (suite_name, timestamp) in report_index.get_summaries(project)
+
+    def test_get_execution_summaries_unfinished_execution(self, project_function, test_utils):
+        _, project = project_function.activate()
+        execution = test_utils.execute_random_suite(project)
+        suite_name = execution['suite_name']
+        timestamp = execution['timestamp']
+        report_index.remove_execution(project, suite_name)
+        os.remove(execution['report_path'])
+        summaries = report.get_execution_summaries(project, {suite_name: [timestamp]})
+        assert summaries[(suite_name, timestamp)]['has_finished'] is False
+        assert report_index.get_summaries(project) == {}
+
+
 class TestDeleteExecution:
 
     def test_delete_execution(self, project_class, test_utils):
@@ -47,6 +86,7 @@ class TestDeleteExecution:
 
         assert errors == []
         assert not os.path.isdir(execpath)
+        assert report_index.get_summaries(project, execution['suite_name']) == {}
 
 
 class TestDeleteExecutionTimestamp:
@@ -0,0 +1,98 @@
+import os
+import threading
+
+import pytest
+
+from golem import execution
+from golem.core import settings_manager
+from golem.report import screenshot_pipeline
+from golem.test_runner import test_logger
+
+
+class TestScreenshotPipeline:
+
+    @pytest.fixture(autouse=True)
+    def _execution(self):
+        execution.settings = settings_manager.assign_settings_default_values({})
+        execution.logger = test_logger.get_logger()
+        yield
+        screenshot_pipeline.shutdown()
+
+    def test_write_file_in_background(self, dir_function):
+        path = os.path.join(dir_function.path, 'screenshot.png')
+        screenshot_pipeline.submit(screenshot_pipeline.write_file, b'content', path)
+        screenshot_pipeline.flush()
+        with open(path, 'rb') as f:
+            assert f.read() == b'content'
+
+    def test_submit_runs_in_another_thread(self):
+        threads = []
+        screenshot_pipeline.submit(lambda: threads.append(threading.current_thread()))
+        screenshot_pipeline.flush()
+        assert threads[0] is not threading.current_thread()
+
+    def test_submit_without_threads(self):
+        execution.settings['screenshot_threads'] = 0
+        threads = []
+        screenshot_pipeline.submit(lambda: threads.append(threading.current_thread()))
+        assert threads == [threading.current_thread()]
+
+    def test_error_is_logged(self, caplog):
+        def fail():
+            raise ValueError('cannot decode')
+        screenshot_pipeline.submit(fail)
+        screenshot_pipeline.flush()
+        assert 'There was an error while saving screenshot' in caplog.text
+
+    def test_on_error(self):
+        def fail():
+            raise ValueError('cannot decode')
+        errors = []
+        screenshot_pipeline.submit(fail, on_error=lambda: errors.append('fail'))
+        screenshot_pipeline.submit(lambda: None, on_error=lambda: errors.append('success'))
+        screenshot_pipeline.flush()
+        assert errors == ['fail']
+
+    @pytest.mark.parametrize('threads', [0, 2])
+    def test_on_result(self, threads):
+        execution.settings['screenshot_threads'] = threads
+        results = []
+        screenshot_pipeline.submit(lambda: 'value', on_result=results.append)
+        assert results == []
+        screenshot_pipeline.flush()
+        assert results == ['value']
+
+    def test_replace_in_steps(self):
+        execution.steps = [{'message': 'a', 'screenshot': 'a.png', 'error': None},
+                           {'message': 'b', 'screenshot': 'b.png', 'error': None}]
+        screenshot_pipeline.replace_in_steps('a.png', 'c.png')
+        screenshot_pipeline.replace_in_steps('b.png')
+        assert [step['screenshot'] for step in execution.steps] == ['c.png', None]
+
+    def test_finalizer_is_registered_once(self, monkeypatch):
+        finalizers = []
+        monkeypatch.setattr(screenshot_pipeline, '_finalizer_registered', False)
+        monkeypatch.setattr(screenshot_pipeline.util, 'Finalize',
+                            lambda *args, **kwargs: finalizers.append(args))
+        for _ in range(2):
+            screenshot_pipeline.submit(lambda: None)
+            screenshot_pipeline.shutdown()
+        assert len(finalizers) == 1
+
+    def test_pending_screenshots_are_bounded(self):
+        execution.settings['screenshot_threads'] = 1
+        release = threading.Event()
+        submitted = []
+
+        def submit_all():
+            for i in range(screenshot_pipeline.PENDING_PER_THREAD + 1):
+                screenshot_pipeline.submit(release.wait)
+                submitted.append(i)
+        thread = threading.Thread(target=submit_all)
+        thread.start()
+        thread.join(0.3)
+        assert len(submitted) == screenshot_pipeline.PENDING_PER_THREAD
+        release.set()
+        thread.join()
+        screenshot_pipeline.flush()
+        assert len(submitted) == screenshot_pipeline.PENDING_PER_THREAD + 1
@@ -0,0 +1,191 @@
+import os
+import sys
+import threading
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+from golem import actions
+from golem import execution
+from golem.core import settings_manager
+from golem.report import screenshot_pipeline
+from golem.report import screenshot_store
+from golem.report import test_report
+from golem.test_runner import test_logger
+
+
+class TestIsReference:
+
+    @pytest.mark.parametrize('screenshot,expected', [
+        ('a' * 64 + '.png', True),
+        ('0123456789abcdef' * 4 + '.jpg', True),
+        ('click_button_1a2b3.png', False),
+        ('a' * 64 + '.gif', False),
+        (None, False),
+    ])
+    def test_is_reference(self, screenshot, expected):
+        assert screenshot_store.is_reference(screenshot) == expected
+
+
+class TestAdd:
+
+    def test_add_identical_screenshots(self, dir_function):
+        execdir = dir_function.path
+        reference, is_new = screenshot_store.add(execdir, b'png content', 'png')
+        assert is_new
+        assert screenshot_store.is_reference(reference)
+        assert os.path.isdir(screenshot_store.store_dir(execdir))
+        second_reference, is_new = screenshot_store.add(execdir, b'png content', 'png')
+        assert second_reference == reference
+        assert not is_new
+
+    def test_add_different_screenshots(self, dir_function):
+        execdir = dir_function.path
+        reference_one, _ = screenshot_store.add(execdir, b'one', 'png')
+        reference_two, is_new = screenshot_store.add(execdir, b'two', 'png')
+        assert reference_one != reference_two
+        assert is_new
+
+    def test_add_same_screenshot_different_options(self, dir_function):
+        execdir = dir_function.path
+        reference_one, _ = screenshot_store.add(execdir, b'one', 'jpg', ('JPEG', 50, None, None, None))
+        reference_two, _ = screenshot_store.add(execdir, b'one', 'jpg', ('JPEG', 90, None, None, None))
+        assert reference_one != reference_two
+
+    def test_add_screenshot_saved_by_another_process(self, dir_function):
+        execdir = dir_function.path
+        reference = screenshot_store.reference(b'content', 'png')
+        os.makedirs(screenshot_store.store_dir(execdir))
+        open(screenshot_store.store_path(execdir, reference), 'w').close()
+        assert screenshot_store.add(execdir, b'content', 'png') == (reference, False)
+
+    def test_perceptual_hash(self):
+        Image = pytest.importorskip('PIL.Image')
+
+        def png(color):
+            output = BytesIO()
+            image = Image.new('RGB', (64, 64), color)
+            image.paste((0, 0, 0), (0, 0, 32, 64))
+            image.save(output, format='PNG')
+            return output.getvalue()
+        white = screenshot_store.perceptual_hash(png((255, 255, 255)))
+        almost_white = screenshot_store.perceptual_hash(png((250, 250, 250)))
+        assert bin(white ^ almost_white).count('1') <= 5
+
+    def test_find_similar(self, dir_function, monkeypatch):
+        hashes = {b'one': 0b1000, b'similar': 0b1001, b'different': 0b0111}
+        monkeypatch.setattr(screenshot_store, 'perceptual_hash', lambda png: hashes[png])
+        execdir = dir_function.path
+        references = {}
+        for png in hashes:
+            references[png], _ = screenshot_store.add(execdir, png, 'png')
+        assert screenshot_store.find_similar(execdir, references[b'one'], b'one',
+                                             threshold=1) is None
+        assert screenshot_store.find_similar(execdir, references[b'similar'], b'similar',
+                                             threshold=1) == references[b'one']
+        assert screenshot_store.find_similar(execdir, references[b'different'], b'different',
+                                             threshold=1) is None
+        # the similar screenshot references the first one from now on
+        assert screenshot_store.add(execdir, b'similar', 'png') == (references[b'one'], False)
+
+    def test_values_of_previous_executions_are_discarded(self, dir_function):
+        first_execdir = os.path.join(dir_function.path, 'first')
+        second_execdir = os.path.join(dir_function.path, 'second')
+        screenshot_store.add(first_execdir, b'one', 'png')
+        screenshot_store.add(second_execdir, b'one', 'png')
+        assert list(screenshot_store._stored) == [second_execdir]
+
+
+class TestCaptureScreenshot:
+
+    @pytest.fixture(autouse=True)
+    def _execution(self, dir_function):
+        execution.settings = settings_manager.assign_settings_default_values({})
+        execution.logger = test_logger.get_logger()
+        execution.execution_reportdir = dir_function.path
+        execution.test_reportdir = os.path.join(dir_function.path, 'test_file', 'test')
+        os.makedirs(execution.test_reportdir)
+        execution.browser = SimpleNamespace(get_screenshot_as_png=lambda: b'png content')
+        yield
+        screenshot_pipeline.shutdown()
+        execution.browser = None
+        execution.execution_reportdir = None
+        execution.test_reportdir = None
+
+    def test_capture_screenshot_without_dedup(self, dir_function):
+        screenshot = actions._capture_screenshot('step')
+        screenshot_pipeline.flush()
+        assert not screenshot_store.is_reference(screenshot)
+        assert os.listdir(execution.test_reportdir) == [screenshot]
+        assert not os.path.exists(screenshot_store.store_dir(dir_function.path))
+
+    def test_capture_screenshot_with_dedup(self, dir_function):
+        execution.settings['screenshot_dedup'] = 'exact'
+        first = actions._capture_screenshot('step')
+        second = actions._capture_screenshot('step')
+        screenshot_pipeline.flush()
+        assert first == second
+        assert screenshot_store.is_reference(first)
+        assert os.listdir(screenshot_store.store_dir(dir_function.path)) == [first]
+        assert os.listdir(execution.test_reportdir) == []
+
+
+    @pytest.mark.parametrize('dedup', [None, 'exact'])
+    def test_capture_screenshot_not_saved(self, dir_function, monkeypatch, dedup):
+        def fail(content, path):
+            raise OSError('no space left on device')
+        monkeypatch.setattr(screenshot_pipeline, 'write_file', fail)
+        execution.settings['screenshot_dedup'] = dedup
+        execution.steps = [{'message': 'step', 'screenshot': None, 'error': None}]
+        screenshot = actions._capture_screenshot('step')
+        execution.steps[-1]['screenshot'] = screenshot
+        screenshot_pipeline.flush()
+        assert execution.steps[-1]['screenshot'] is None
+        # a stored screenshot is saved again the next time it is taken
+        assert screenshot not in screenshot_store._stored.get(dir_function.path, set())
+
+
+    def test_capture_screenshot_perceptual_dedup(self, dir_function, monkeypatch):
+        # Pillow is only used by perceptual_hash
+        monkeypatch.setitem(sys.modules, 'PIL', SimpleNamespace(Image=None))
+        threads = []
+
+        def perceptual_hash(png):
+            threads.append(threading.current_thread())
+            return {b'one': 0b1000, b'two': 0b1001}[png]
+        monkeypatch.setattr(screenshot_store, 'perceptual_hash', perceptual_hash)
+        pngs = iter([b'one', b'two'])
+        execution.browser = SimpleNamespace(get_screenshot_as_png=lambda: next(pngs))
+        execution.settings['screenshot_dedup'] = 'perceptual'
+        execution.settings['screenshot_dedup_threshold'] = 1
+        execution.steps = []
+        for message in ['one', 'two']:
+            screenshot = actions._capture_screenshot(message)
+            execution.steps.append({'message': message, 'screenshot': screenshot, 'error': None})
+        assert execution.steps[0]['screenshot'] != execution.steps[1]['screenshot']
+        screenshot_pipeline.flush()
+        # the screenshots are compared in the background
+        assert len(threads) == 2 and threading.current_thread() not in threads
+        assert execution.steps[1]['screenshot'] == execution.steps[0]['screenshot']
+        store_dir = screenshot_store.store_dir(dir_function.path)
+        assert os.listdir(store_dir) == [execution.steps[0]['screenshot']]
+
+
+class TestScreenshotPath:
+
+    def test_screenshot_path_reference(self, project_session):
+        _, project = project_session.activate()
+        reference = 'a' * 64 + '.png'
+        path = test_report.screenshot_path(project, 'suite', '2020', 'test_file', 'test',
+                                           '', reference)
+        execdir = test_report.execution_report.execution_report_path(project, 'suite', '2020')
+        assert path == os.path.join(execdir, 'screenshots', reference)
+
+    def test_screenshot_path_filename(self, project_session):
+        _, project = project_session.activate()
+        path = test_report.screenshot_path(project, 'suite', '2020', 'test_file', 'test',
+                                           '', 'step_1a2b3.png')
+        expected = os.path.join(test_report.test_function_report_dir(
+            project, 'suite', '2020', 'test_file', 'test'), 'step_1a2b3.png')
+        assert path == expected
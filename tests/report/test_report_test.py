@@ -189,10 +189,9 @@ class TestGenerateReport:
             'browser_capabilities': '',
         }
         generate_report(test_name, result, test_data, report_dir)
-        path = os.path.join(report_dir, 'report.json')
+        path = os.path.join(report_dir, 'report.jsonl')
         with open(path) as report_file:
-            actual = json.load(report_file)
-            actual = actual[0]
+            actual = json.loads(report_file.readline())
             assert len(actual.items()) == 12
             assert actual['test_file'] == test_name
             assert actual['test'] == 'test_function'
@@ -210,3 +209,54 @@ class TestGenerateReport:
             test_data_b = "{'name': 'env01', 'url': '1.1.1.1'}"
             assert actual['test_data']['env'] in [test_data_a, test_data_b]
             assert actual['test_data']['var2'] == "'value2'"
+
+
+class TestReadTestFileReport:
+
+    def test_read_test_file_report(self, dir_function):
+        test_report.append_test_file_report_records(dir_function.path, [
+            {'test': 'test_one', 'result': ResultsEnum.PENDING},
+            {'test': 'test_two', 'result': ResultsEnum.PENDING}
+        ])
+        test_report.append_test_file_report_records(dir_function.path, [
+            {'test': 'test_two', 'result': ResultsEnum.SUCCESS},
+            {'test': 'setup', 'result': ResultsEnum.CODE_ERROR}
+        ])
+        actual = test_report.read_test_file_report(dir_function.path)
+        assert actual == [
+            {'test': 'test_one', 'result': ResultsEnum.PENDING},
+            {'test': 'test_two', 'result': ResultsEnum.SUCCESS},
+            {'test': 'setup', 'result': ResultsEnum.CODE_ERROR}
+        ]
+
+    def test_read_test_file_report_pending_after_result(self, dir_function):
+        test_report.append_test_file_report_records(dir_function.path, [
+            {'test': 'test_one', 'result': ResultsEnum.SUCCESS}
+        ])
+        test_report.append_test_file_report_records(dir_function.path, [
+            {'test': 'test_one', 'result': ResultsEnum.PENDING},
+            {'test': 'test_two', 'result': ResultsEnum.PENDING}
+        ])
+        actual = test_report.read_test_file_report(dir_function.path)
+        assert actual == [
+            {'test': 'test_one', 'result': ResultsEnum.SUCCESS},
+            {'test': 'test_two', 'result': ResultsEnum.PENDING}
+        ]
+
+    def test_read_test_file_report_incomplete_line(self, dir_function):
+        test_report.append_test_file_report_records(dir_function.path, [
+            {'test': 'test_one', 'result': ResultsEnum.PENDING}
+        ])
+        with open(os.path.join(dir_function.path, 'report.jsonl'), 'a') as f:
+            f.write('{"test": "test_one", "res')
+        actual = test_report.read_test_file_report(dir_function.path)
+        assert actual == [{'test': 'test_one', 'result': ResultsEnum.PENDING}]
+
+    def test_read_test_file_report_legacy_format(self, dir_function):
+        report = [{'test': 'test_one', 'result': ResultsEnum.SUCCESS}]
+        with open(os.path.join(dir_function.path, 'report.json'), 'w') as f:
+            json.dump(report, f)
+        assert test_report.read_test_file_report(dir_function.path) == report
+
+    def test_read_test_file_report_does_not_exist(self, dir_function):
+        assert test_report.read_test_file_report(dir_function.path) is None
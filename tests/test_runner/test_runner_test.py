@@ -1,5 +1,3 @@
-import json
-import os
 import sys
 from types import SimpleNamespace
 
@@ -27,9 +25,7 @@ def _mock_report_directory(project, execution_name, timestamp):
 
 def _read_report_json(execdir, test_name, set_name=''):
     path = test_report.test_file_report_dir(test_name, execdir=execdir, set_name=set_name)
-    path = os.path.join(path, 'report.json')
-    with open(path) as f:
-        return json.load(f)
+    return test_report.read_test_file_report(path)
 
 
 @pytest.fixture(scope="function")
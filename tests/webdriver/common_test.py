@@ -0,0 +1,204 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from golem import execution
+from golem.core import settings_manager
+from golem.core.exceptions import ElementNotFound, ElementNotDisplayed
+from golem.test_runner import test_logger
+from golem.webdriver import common
+
+
+class _FakeElement:
+
+    def __init__(self, displayed_after=0):
+        self.displayed_at = time.time() + displayed_after
+
+    def is_displayed(self):
+        return time.time() >= self.displayed_at
+
+
+class _FakeDriver:
+    """The element is present `present_after` seconds after the
+    driver is created
+    """
+
+    def __init__(self, present_after=0, displayed_after=0):
+        self.element = _FakeElement(displayed_after)
+        self.present_at = time.time() + present_after
+        self.implicit_wait = 0
+        self.script_timeout = 30
+        self.find_calls = 0
+
+    def find_element_by_css_selector(self, selector):
+        self.find_calls += 1
+        if self.implicit_wait:
+            time.sleep(min(max(self.present_at - time.time(), 0), self.implicit_wait))
+        if time.time() < self.present_at:
+            raise Exception('no such element')
+        return self.element
+
+    def implicitly_wait(self, seconds):
+        self.implicit_wait = seconds
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_async_script(self, script, root, selector_type, selector_value, timeout):
+        wait_time = max(self.present_at - time.time(), 0)
+        time.sleep(min(wait_time, timeout / 1000))
+        return wait_time <= timeout / 1000
+
+
+class TestFindWebelement:
+
+    @pytest.fixture(autouse=True)
+    def _execution(self):
+        execution.settings = settings_manager.assign_settings_default_values({})
+        execution.logger = test_logger.get_logger()
+        execution.steps = [{'message': 'step', 'screenshot': None, 'error': None}]
+
+    @pytest.mark.parametrize('strategy', common.ELEMENT_LOOKUP_STRATEGIES)
+    def test_element_found_when_present(self, strategy):
+        execution.settings['element_lookup_strategy'] = strategy
+        driver = _FakeDriver(present_after=0.2)
+        start_time = time.time()
+        webelement = common._find_webelement(driver, 'css', 'div', 'div', timeout=5)
+        assert webelement is driver.element
+        assert time.time() - start_time < 0.5
+        assert driver.implicit_wait == 0
+        assert 0.2 <= execution.steps[-1]['lookup_time'] < 0.5
+
+    def test_element_already_present(self):
+        driver = _FakeDriver()
+        assert common._find_webelement(driver, 'css', 'div', 'div', timeout=5) is driver.element
+        assert driver.find_calls == 1
+
+    @pytest.mark.parametrize('strategy', common.ELEMENT_LOOKUP_STRATEGIES)
+    def test_element_not_found(self, strategy):
+        execution.settings['element_lookup_strategy'] = strategy
+        driver = _FakeDriver(present_after=10)
+        with pytest.raises(ElementNotFound):
+            common._find_webelement(driver, 'css', 'div', 'div', timeout=0.3)
+        assert 0.25 <= execution.steps[-1]['lookup_time'] < 1
+
+    def test_implicit_wait_is_restored(self):
+        execution.settings['element_lookup_strategy'] = 'implicit_wait'
+        driver = _FakeDriver(present_after=0.2)
+        common._set_implicit_wait(driver, 1)
+        common._find_webelement(driver, 'css', 'div', 'div', timeout=5)
+        assert driver.implicit_wait == 1
+
+    def test_script_timeout_is_restored(self):
+        execution.settings['element_lookup_strategy'] = 'mutation_observer'
+        driver = _FakeDriver(present_after=0.2)
+        common._find_webelement(driver, 'css', 'div', 'div', timeout=60)
+        assert driver.script_timeout == 30
+        driver = _FakeDriver(present_after=10)
+        with pytest.raises(ElementNotFound):
+            common._find_webelement(driver, 'css', 'div', 'div', timeout=0.3)
+        assert driver.script_timeout == 30
+
+    def test_invalid_lookup_strategy(self):
+        execution.settings['element_lookup_strategy'] = 'invalid'
+        driver = _FakeDriver()
+        with pytest.raises(ValueError, match='Invalid element_lookup_strategy setting: invalid'):
+            common._find_webelement(driver, 'css', 'div', 'div', timeout=5)
+
+    def test_wait_displayed(self):
+        driver = _FakeDriver(displayed_after=0.2)
+        webelement = common._find_webelement(driver, 'css', 'div', 'div', timeout=5,
+                                             wait_displayed=True)
+        assert webelement is driver.element
+
+    def test_wait_displayed_timeout(self):
+        driver = _FakeDriver(displayed_after=10)
+        with pytest.raises(ElementNotDisplayed):
+            common._find_webelement(driver, 'css', 'div', 'div', timeout=0.3,
+                                    wait_displayed=True)
+
+
+class _FakeBatchDriver:
+    """Elements are present when their selector value is in `present`"""
+
+    def __init__(self, present, hidden=()):
+        self.present = present
+        self.hidden = hidden
+        self.scripts = 0
+
+    def execute_script(self, script, root, selectors):
+        self.scripts += 1
+        results = []
+        for selector_type, selector_value in selectors:
+            if selector_value in self.present:
+                element = _FakeBatchElement(self, selector_value)
+                results.append([element, selector_value not in self.hidden, True])
+            else:
+                results.append([None, False, False])
+        return results
+
+    def find_element_by_css_selector(self, selector):
+        if selector in self.present:
+            return _FakeBatchElement(self, selector)
+        raise Exception('no such element')
+
+    def find_element_by_id(self, selector):
+        return self.find_element_by_css_selector(selector)
+
+
+class _FakeBatchElement:
+
+    def __init__(self, parent, selector):
+        self.parent = parent
+        self.selector = selector
+
+    def is_displayed(self):
+        return self.selector not in self.parent.hidden
+
+
+class TestFindMany:
+
+    @pytest.fixture(autouse=True)
+    def _execution(self):
+        execution.settings = settings_manager.assign_settings_default_values({})
+        execution.logger = test_logger.get_logger()
+        execution.steps = []
+
+    def test_find_many(self):
+        driver = _FakeBatchDriver(present=['#one', 'two'])
+        one, two = common._find_many(driver, ['#one', ('id', 'two', 'Two')])
+        assert driver.scripts == 1
+        assert one.selector == '#one'
+        assert (one.selector_type, one.selector_value, one.name) == ('css', '#one', '#one')
+        assert (two.selector_type, two.selector_value, two.name) == ('id', 'two', 'Two')
+        assert two.state == {'displayed': True, 'enabled': True}
+
+    def test_find_many_dict(self):
+        driver = _FakeBatchDriver(present=['#one', '#two'])
+        result = common._find_many(driver, {'a': '#one', 'b': '#two'})
+        assert list(result) == ['a', 'b']
+        assert result['b'].selector == '#two'
+
+    def test_find_many_element_not_present(self):
+        driver = _FakeBatchDriver(present=['#one'])
+        with pytest.raises(ElementNotFound):
+            common._find_many(driver, ['#one', '#two'], timeout=0)
+
+    def test_find_many_waits_for_hidden_element(self):
+        driver = _FakeBatchDriver(present=['#one'], hidden=['#one'])
+        with pytest.raises(ElementNotDisplayed):
+            common._find_many(driver, ['#one'], timeout=0, wait_displayed=True)
+
+    def test_resolve_page(self):
+        driver = _FakeBatchDriver(present=['#user', '#pass'])
+        page = SimpleNamespace(user_input=('css', '#user', 'User'),
+                               pass_input=('css', '#pass'),
+                               not_an_element=('a', 'b'),
+                               title='Login')
+        login = common._resolve_page(driver, page)
+        assert driver.scripts == 1
+        assert login.user_input.name == 'User'
+        assert login.pass_input.selector == '#pass'
+        assert not hasattr(login, 'not_an_element')
+        assert not hasattr(login, 'title')